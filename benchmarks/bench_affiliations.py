@@ -0,0 +1,125 @@
+"""Microbenchmark of per-affiliation classification throughput.
+
+Compares AffiliationClassifier, whose keyword regexes are compiled once,
+with the previous approach of rebuilding the keyword sets on each call and
+running one substring scan per keyword; and AffiliationAnalyzer's
+precompiled company-name extraction with the previous per-call
+``re.compile`` loops.
+
+Usage:
+    python -m benchmarks.bench_affiliations [--size 200] [--repeat 5]
+"""
+
+import argparse
+import re
+import time
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.make_fixtures import load_fixture
+from pharma_papers.affiliations import AffiliationAnalyzer, AffiliationClassifier
+from pharma_papers.parser import iter_pubmed_xml
+
+
+def substring_scan(affiliation: str) -> bool:
+    """Reference implementation: fresh keyword sets and one scan per keyword."""
+    affiliation_lower = affiliation.lower()
+    academic_keywords = {
+        "university",
+        "college",
+        "institute",
+        "school",
+        "hospital",
+        "medical center",
+        "clinic",
+        "foundation",
+        "academy",
+    }
+    company_keywords = {
+        "pharma",
+        "pharmaceutical",
+        "biotech",
+        "therapeutics",
+        "inc.",
+        "llc",
+        "ltd",
+        "gmbh",
+        "biosciences",
+        "laboratories",
+    }
+    has_company = any(kw in affiliation_lower for kw in company_keywords)
+    has_academic = any(kw in affiliation_lower for kw in academic_keywords)
+    return has_company and not has_academic
+
+
+def compile_per_call(analyzer: AffiliationAnalyzer, affiliation: str) -> str:
+    """Reference implementation: loop the sets, compiling a regex per attempt."""
+    affiliation_lower = affiliation.lower()
+    for company in analyzer.known_companies:
+        if company in affiliation_lower:
+            pattern = re.compile(re.escape(company), re.IGNORECASE)
+            match = pattern.search(affiliation)
+            if match:
+                return match.group(0)
+            return company
+
+    for suffix in analyzer.company_suffixes:
+        pattern = re.compile(
+            r"([A-Z][A-Za-z0-9\-\s]+)\s+" + re.escape(suffix), re.IGNORECASE
+        )
+        match = pattern.search(affiliation)
+        if match:
+            return f"{match.group(1)} {suffix}"
+
+    return ""
+
+
+def sample_affiliations(size: int) -> List[str]:
+    """Collect every affiliation string from a stored efetch sample."""
+    return [
+        info["Affiliation"]
+        for record in iter_pubmed_xml(load_fixture(size))
+        for author in record["MedlineCitation"]["Article"]["AuthorList"]
+        for info in author["AffiliationInfo"]
+    ]
+
+
+def best_time(
+    func: Callable[[str], object], affiliations: List[str], repeat: int
+) -> float:
+    """Return the best wall time of classifying every affiliation once."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for affiliation in affiliations:
+            func(affiliation)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print per-affiliation throughput."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200, help="articles in the sample")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions")
+    args = parser.parse_args(argv)
+
+    affiliations = sample_affiliations(args.size)
+    classifier = AffiliationClassifier()
+    analyzer = AffiliationAnalyzer(classifier)
+    cases: Dict[str, Callable[[str], object]] = {
+        "substring scans": substring_scan,
+        "classifier.is_company": classifier.is_company,
+        "classifier.classify": lambda a: classifier.classify(a).is_company,
+        "per-call re.compile": lambda a: compile_per_call(analyzer, a),
+        "_identify_company": analyzer._identify_company,
+    }
+
+    print(f"{len(affiliations)} affiliations")
+    print(f"{'case':<24} {'seconds':>8} {'affiliations/s':>15}")
+    for name, func in cases.items():
+        seconds = best_time(func, affiliations, args.repeat)
+        print(f"{name:<24} {seconds:>8.4f} {len(affiliations) / seconds:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Memory benchmark of Article records against the earlier article dicts.
+
+Parses a stored efetch sample, then holds ``--copies`` copies of every
+company-affiliated article in each representation: slotted Article
+records with tuples and interned company names, and the previous plain
+dicts with lists and a separate string per company mention. Reports the
+traced memory of each.
+
+Usage:
+    python -m benchmarks.bench_models [--size 200] [--copies 50]
+"""
+
+import argparse
+import dataclasses
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from benchmarks.make_fixtures import load_fixture
+from pharma_papers.models import Article
+from pharma_papers.parser import PubMedParser
+
+
+def as_legacy_dict(article: Article) -> Dict[str, Any]:
+    """Rebuild the dict record the parser used to return."""
+    return {
+        "pmid": article.pmid,
+        "title": article.title,
+        "publication_date": article.publication_date,
+        "authors": list(article.authors),
+        "non_academic_authors": list(article.non_academic_authors),
+        # Without interning, each mention was its own string object
+        "company_affiliations": [
+            (company + " ")[:-1] for company in article.company_affiliations
+        ],
+        "corresponding_email": article.corresponding_email,
+    }
+
+
+def as_article(article: Article) -> Article:
+    """Rebuild an Article with its own tuples, as the parser creates them."""
+    return dataclasses.replace(
+        article,
+        authors=tuple([*article.authors]),
+        non_academic_authors=tuple([*article.non_academic_authors]),
+        company_affiliations=tuple([*article.company_affiliations]),
+    )
+
+
+def traced_size(build: Callable[[], List[Any]]) -> int:
+    """Return the bytes still allocated by ``build``'s result."""
+    tracemalloc.start()
+    result = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print the memory of each representation."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200, help="articles in the sample")
+    parser.add_argument("--copies", type=int, default=50, help="copies held in memory")
+    args = parser.parse_args(argv)
+
+    articles = PubMedParser().parse_xml(load_fixture(args.size))
+    cases = {
+        "dict records": lambda: [
+            as_legacy_dict(a) for _ in range(args.copies) for a in articles
+        ],
+        "Article records": lambda: [
+            as_article(a) for _ in range(args.copies) for a in articles
+        ],
+    }
+
+    count = len(articles) * args.copies
+    print(f"{count} articles")
+    print(f"{'case':<18} {'MB':>7} {'bytes/article':>14}")
+    for name, build in cases.items():
+        size = traced_size(build)
+        print(f"{name:<18} {size / 1e6:>7.2f} {size / count:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
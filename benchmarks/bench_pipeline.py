@@ -0,0 +1,285 @@
+"""Benchmark each stage of the fetch pipeline against a stored baseline.
+
+Replays stored efetch samples of several batch sizes through the stages a
+fetched batch goes through: Entrez.read, PubMedParser.parse_articles,
+AffiliationAnalyzer (company filter and company-name extraction) and
+OutputHandler.output_results. Reports the best wall time of each stage,
+end-to-end throughput and the peak RSS of a fresh process per size, and
+exits non-zero when throughput drops or memory grows past ``--tolerance``
+relative to the baseline. Baselines are machine-specific: ``--save-baseline``
+stores the results with the host they were measured on and the tolerance to
+judge them by, and on any other host the comparison is only reported, never
+failed. Samples missing from ``benchmarks/data`` are generated
+deterministically by make_fixtures.
+
+Usage:
+    python -m benchmarks.bench_pipeline [--sizes 20 200 1000] [--repeat 5]
+        [--tolerance 0.25] [--save-baseline]
+"""
+
+import argparse
+import io
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from Bio import Entrez
+
+from benchmarks.make_fixtures import load_fixture
+from pharma_papers.affiliations import AffiliationAnalyzer
+from pharma_papers.models import Article
+from pharma_papers.output import OutputHandler
+from pharma_papers.parser import PubMedParser
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline_pipeline.json")
+DEFAULT_SIZES = (20, 200, 1000)
+DEFAULT_TOLERANCE = 0.25
+
+# Stages faster than this in the baseline are too noisy to flag on their own
+MIN_STAGE_SECONDS = 0.01
+
+STAGES = ("Entrez.read", "parse_articles", "affiliations", "output_results")
+
+# Per-size results: stage seconds, end-to-end articles/s and peak RSS in MB
+Results = Dict[str, Dict[str, Any]]
+
+
+def host_info() -> Dict[str, Any]:
+    """Describe the machine and interpreter the timings depend on."""
+    cpu = platform.processor()
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            cpu = next(
+                (
+                    line.split(":", 1)[1].strip()
+                    for line in f
+                    if line.startswith("model name")
+                ),
+                cpu,
+            )
+    except OSError:
+        pass
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "cpu": cpu,
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def host_differences(saved: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """Return a message per host property that differs from the baseline's."""
+    return [
+        f"{key}: baseline {saved.get(key)!r}, now {value!r}"
+        for key, value in current.items()
+        if saved.get(key) != value
+    ]
+
+
+def best_time(func: Callable[[], Any], repeat: int) -> Tuple[float, Any]:
+    """Return the best wall time of ``func`` and the result of its last run."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def affiliations_of(records: Dict[str, Any]) -> List[List[str]]:
+    """Return the raw affiliation strings of each record's authors."""
+    return [
+        [
+            str(info["Affiliation"])
+            for author in record["MedlineCitation"]["Article"].get("AuthorList", [])
+            for info in author.get("AffiliationInfo", [])
+        ]
+        for record in records["PubmedArticle"]
+    ]
+
+
+def peak_rss_mb() -> float:
+    """Return this process's peak resident set size in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def run_size(size: int, repeat: int) -> Dict[str, Any]:
+    """
+    Time every pipeline stage on one stored sample.
+
+    Each stage is timed on the previous stage's output. Parsers are built
+    afresh per repetition, so their affiliation caches start cold.
+
+    Args:
+        size: Articles in the sample
+        repeat: Timed repetitions per stage
+
+    Returns:
+        Stage seconds, end-to-end articles/s and peak RSS in MB
+    """
+    raw = load_fixture(size)
+    analyzer = AffiliationAnalyzer()
+    handler = OutputHandler()
+    seconds: Dict[str, float] = {}
+
+    seconds["Entrez.read"], records = best_time(
+        lambda: Entrez.read(io.BytesIO(raw)), repeat
+    )
+    seconds["parse_articles"], articles = best_time(
+        lambda: PubMedParser().parse_articles(records), repeat
+    )
+    affiliations = affiliations_of(records)
+
+    def classify() -> List[Article]:
+        for strings in affiliations:
+            analyzer.extract_company_affiliations(strings)
+        return [a for a in articles if analyzer.is_company_affiliated(a)]
+
+    seconds["affiliations"], company_articles = best_time(classify, repeat)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "papers.csv")
+        seconds["output_results"], _ = best_time(
+            lambda: handler.output_results(company_articles, path), repeat
+        )
+
+    return {
+        "seconds": seconds,
+        "articles_per_s": size / sum(seconds.values()),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def run(sizes: List[int], repeat: int) -> Results:
+    """Run each size in a fresh process, so its peak RSS is its own."""
+    results: Results = {}
+    context = multiprocessing.get_context("spawn")
+    for size in sizes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[str(size)] = executor.submit(run_size, size, repeat).result()
+    return results
+
+
+def regressions(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """
+    Compare results with a baseline.
+
+    Args:
+        results: Fresh results
+        baseline: Stored results
+        tolerance: Allowed fractional loss of throughput or growth of memory
+
+    Returns:
+        One message per stage or metric that regressed
+    """
+    problems = []
+    for size, result in results.items():
+        base = baseline.get(size)
+        if base is None:
+            continue
+        for stage in STAGES:
+            now, then = result["seconds"][stage], base["seconds"][stage]
+            if then >= MIN_STAGE_SECONDS and now > then * (1 + tolerance):
+                problems.append(
+                    f"{size} articles: {stage} took {now * 1e3:.1f} ms, "
+                    f"baseline {then * 1e3:.1f} ms"
+                )
+        if result["articles_per_s"] < base["articles_per_s"] * (1 - tolerance):
+            problems.append(
+                f"{size} articles: {result['articles_per_s']:.0f} articles/s, "
+                f"baseline {base['articles_per_s']:.0f}"
+            )
+        if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + tolerance):
+            problems.append(
+                f"{size} articles: peak RSS {result['peak_rss_mb']:.0f} MB, "
+                f"baseline {base['peak_rss_mb']:.0f} MB"
+            )
+    return problems
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark, print a report and compare it with the baseline."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+        help="articles per sample",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        help=f"allowed fractional regression (default: the baseline's, "
+        f"else {DEFAULT_TOLERANCE})",
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline file")
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="store these results as the new baseline",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.repeat)
+    header = "".join(f"{stage:>16}" for stage in STAGES)
+    print(f"{'articles':>8}{header}{'articles/s':>12}{'peak MB':>9}")
+    for size, result in results.items():
+        stages = "".join(
+            f"{result['seconds'][stage] * 1e3:>13.1f} ms" for stage in STAGES
+        )
+        print(
+            f"{size:>8}{stages}{result['articles_per_s']:>12.0f}"
+            f"{result['peak_rss_mb']:>9.0f}"
+        )
+
+    host = host_info()
+    tolerance = args.tolerance
+    if args.save_baseline:
+        baseline = {
+            "host": host,
+            "tolerance": DEFAULT_TOLERANCE if tolerance is None else tolerance,
+            "results": results,
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if tolerance is None:
+        tolerance = baseline.get("tolerance", DEFAULT_TOLERANCE)
+    problems = regressions(results, baseline["results"], tolerance)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    if not problems:
+        print(f"Within {tolerance:.0%} of the baseline")
+    differences = host_differences(baseline.get("host", {}), host)
+    if differences:
+        # Timings from another machine say nothing about this change
+        print("Baseline was recorded on another host, so nothing fails:")
+        for difference in differences:
+            print(f"  {difference}")
+        print("Record one for this host with --save-baseline")
+        return 0
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+"""Cold-start benchmark of the get-papers-list command.
+
+Imports ``pharma_papers.cli`` in fresh interpreters under
+``python -X importtime`` and reports the cumulative import time of the
+CLI module along with its slowest dependencies. Exits non-zero when the
+import exceeds ``--budget`` milliseconds or pulls in one of the heavy
+modules that should only load once a run actually starts.
+
+Usage:
+    python -m benchmarks.bench_startup [--budget 50] [--repeat 5] [--top 10]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+CLI_MODULE = "pharma_papers.cli"
+DEFAULT_BUDGET_MS = 50.0
+
+# Top-level packages that -h and usage errors must not pay for
+HEAVY_MODULES = ("Bio", "pandas", "pyarrow", "requests", "pharma_papers.pubmed")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(module: Optional[str] = CLI_MODULE) -> Dict[str, int]:
+    """
+    Import a module in a fresh interpreter and collect its import times.
+
+    Args:
+        module: Dotted module name to import, or None for bare interpreter startup
+
+    Returns:
+        Mapping of every module imported to its cumulative time in microseconds
+    """
+    code = f"import {module}" if module else "pass"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def heavy_imports(profile: Dict[str, int]) -> List[str]:
+    """Return the heavy modules present in an import profile."""
+    return sorted(
+        name
+        for name in profile
+        if any(name == mod or name.startswith(mod + ".") for mod in HEAVY_MODULES)
+    )
+
+
+def cold_start_ms(repeat: int = 5, module: str = CLI_MODULE) -> float:
+    """Return the fastest of ``repeat`` cold imports of a module, in milliseconds."""
+    return min(import_profile(module)[module] for _ in range(repeat)) / 1000
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the benchmark, print the report and return the exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--budget", type=float, default=DEFAULT_BUDGET_MS, help="milliseconds allowed"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="cold imports to time")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed")
+    args = parser.parse_args(argv)
+
+    # Leave out what the interpreter loads before the CLI is imported
+    startup = import_profile(None)
+    profile = {
+        name: micros for name, micros in import_profile().items() if name not in startup
+    }
+    elapsed = cold_start_ms(args.repeat)
+    heavy = heavy_imports(profile)
+
+    print(f"{CLI_MODULE}: {elapsed:.1f} ms (budget {args.budget:.0f} ms)")
+    print(f"{'module':<40} {'ms':>7}")
+    for name, micros in sorted(profile.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<40} {micros / 1000:>7.1f}")
+    if heavy:
+        print(f"heavy modules imported at startup: {', '.join(heavy)}")
+
+    return 1 if heavy or elapsed > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
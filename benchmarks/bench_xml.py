@@ -0,0 +1,67 @@
+"""Benchmark the streaming XML parser against Entrez.read.
+
+Both paths turn the same stored efetch sample into PubMedParser articles;
+the report shows the best wall time over several repeats and the peak
+traced memory of a single run.
+
+Usage:
+    python -m benchmarks.bench_xml [--size 200] [--repeat 5]
+"""
+
+import argparse
+import io
+import time
+import tracemalloc
+from typing import Callable, List, Optional, Tuple
+
+from Bio import Entrez
+
+from benchmarks.make_fixtures import load_fixture
+from pharma_papers.parser import PubMedParser, iter_pubmed_xml
+
+
+def measure(func: Callable[[], object], repeat: int) -> Tuple[float, int]:
+    """Return the best wall time and the peak traced memory of ``func``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Run the benchmark and print a comparison table."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=200, help="articles in the sample")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repetitions")
+    args = parser.parse_args(argv)
+
+    raw = load_fixture(args.size)
+    pubmed_parser = PubMedParser()
+    cases = {
+        "Entrez.read": lambda: Entrez.read(io.BytesIO(raw)),
+        "iter_pubmed_xml": lambda: list(iter_pubmed_xml(raw)),
+        "Entrez.read + parse_articles": lambda: pubmed_parser.parse_articles(
+            Entrez.read(io.BytesIO(raw))
+        ),
+        "parse_xml": lambda: pubmed_parser.parse_xml(raw),
+    }
+
+    print(f"{args.size} articles, {len(raw) / 1e6:.1f} MB of XML")
+    print(f"{'case':<30} {'seconds':>8} {'articles/s':>11} {'peak MB':>8}")
+    for name, func in cases.items():
+        seconds, peak = measure(func, args.repeat)
+        print(
+            f"{name:<30} {seconds:>8.4f} {args.size / seconds:>11.0f}"
+            f" {peak / 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Generate the synthetic efetch XML samples used by the benchmarks.
+
+The samples mimic real PubMed records (abstracts, MeSH headings, reference
+lists, several authors with academic and company affiliations) so parsers
+pay for the fields they skip as well as the ones they read. Output is
+deterministic for a given size.
+
+Usage:
+    python -m benchmarks.make_fixtures 200 1000
+"""
+
+import argparse
+import gzip
+import os
+import random
+from typing import List, Optional
+from xml.sax.saxutils import escape
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+PROLOG = (
+    '<?xml version="1.0" ?>\n'
+    '<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2025//EN"'
+    ' "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">\n'
+)
+
+COMPANY_AFFILIATIONS = [
+    "Pfizer Inc., New York, NY, USA.",
+    "Merck & Co., Inc., Rahway, NJ, USA.",
+    "Novartis Pharmaceuticals, Basel, Switzerland.",
+    "Genentech Inc., South San Francisco, CA, USA.",
+    "Acme Therapeutics, Cambridge, MA, USA.",
+    "Bayer AG, Leverkusen, Germany.",
+]
+ACADEMIC_AFFILIATIONS = [
+    "Department of Oncology, University of Example, Example City, USA.",
+    "Institute of Immunology, Example Medical Center, Boston, MA, USA.",
+    "School of Medicine, Example College, London, UK.",
+    "Department of Pharmacology, Example Hospital, Paris, France.",
+]
+WORDS = (
+    "tumour response kinase inhibitor patients cohort trial randomized safety "
+    "efficacy dose expression pathway receptor clinical outcome survival"
+).split()
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct"]
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    """Return a pseudo-random sentence."""
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def article(rng: random.Random, pmid: int) -> str:
+    """Render one synthetic PubmedArticle."""
+    authors = []
+    for i in range(rng.randint(3, 12)):
+        pool = COMPANY_AFFILIATIONS if rng.random() < 0.3 else ACADEMIC_AFFILIATIONS
+        email = f" author{i}@example.com" if i == 0 else ""
+        authors.append(
+            f'<Author ValidYN="Y"><LastName>Author{i}</LastName>'
+            f"<ForeName>Name{i}</ForeName><Initials>N</Initials>"
+            f"<AffiliationInfo><Affiliation>{escape(rng.choice(pool))}{email}"
+            "</Affiliation></AffiliationInfo></Author>"
+        )
+    abstract = "".join(
+        f'<AbstractText Label="{label}">{sentence(rng, 40)}</AbstractText>'
+        for label in ("BACKGROUND", "METHODS", "RESULTS", "CONCLUSIONS")
+    )
+    mesh = "".join(
+        f'<MeshHeading><DescriptorName UI="D{rng.randint(1, 99999):06d}"'
+        f' MajorTopicYN="N">{rng.choice(WORDS).title()}</DescriptorName></MeshHeading>'
+        for _ in range(rng.randint(5, 15))
+    )
+    references = "".join(
+        f"<Reference><Citation>{sentence(rng, 15)}</Citation></Reference>"
+        for _ in range(rng.randint(10, 40))
+    )
+    return (
+        '<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM">'
+        f'<PMID Version="1">{pmid}</PMID><Article PubModel="Print"><Journal>'
+        '<JournalIssue CitedMedium="Internet"><Volume>12</Volume><PubDate>'
+        f"<Year>{rng.randint(2015, 2025)}</Year><Month>{rng.choice(MONTHS)}</Month>"
+        f"<Day>{rng.randint(1, 28)}</Day></PubDate></JournalIssue>"
+        "<Title>Journal of Examples</Title></Journal>"
+        f"<ArticleTitle>{sentence(rng, 12)}</ArticleTitle>"
+        f"<Abstract>{abstract}</Abstract>"
+        f'<AuthorList CompleteYN="Y">{"".join(authors)}</AuthorList>'
+        f"<Language>eng</Language></Article><MeshHeadingList>{mesh}</MeshHeadingList>"
+        "</MedlineCitation><PubmedData><ArticleIdList>"
+        f'<ArticleId IdType="pubmed">{pmid}</ArticleId></ArticleIdList>'
+        f"<ReferenceList>{references}</ReferenceList></PubmedData></PubmedArticle>\n"
+    )
+
+
+def efetch_xml(size: int, seed: int = 0) -> bytes:
+    """Render a deterministic efetch response with ``size`` articles."""
+    rng = random.Random(seed)
+    body = "".join(article(rng, 30000000 + i) for i in range(size))
+    return (PROLOG + f"<PubmedArticleSet>\n{body}</PubmedArticleSet>\n").encode()
+
+
+def fixture_path(size: int) -> str:
+    """Return the stored sample path for a given number of articles."""
+    return os.path.join(DATA_DIR, f"efetch_{size}.xml.gz")
+
+
+def load_fixture(size: int) -> bytes:
+    """Read a stored sample, generating it first if it is missing."""
+    path = fixture_path(size)
+    if not os.path.exists(path):
+        write_fixture(size)
+    with gzip.open(path, "rb") as f:
+        return f.read()
+
+
+def write_fixture(size: int) -> str:
+    """Generate and store a sample; returns its path."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = fixture_path(size)
+    # mtime=0 keeps the gzip bytes reproducible
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(efetch_xml(size))
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Write the requested sample sizes."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("sizes", nargs="*", type=int, default=[200])
+    for size in parser.parse_args(argv).sizes:
+        print(write_fixture(size))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,17 +2,116 @@
 
 import logging
 import re
-from typing import Dict, List, Set
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Union
+
+from pharma_papers.models import Article
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Academic indicators (negative)
+ACADEMIC_KEYWORDS = (
+    "university",
+    "college",
+    "institute",
+    "school",
+    "hospital",
+    "medical center",
+    "clinic",
+    "foundation",
+    "academy",
+)
+
+# Company indicators (positive)
+COMPANY_KEYWORDS = (
+    "pharma",
+    "pharmaceutical",
+    "biotech",
+    "therapeutics",
+    "inc.",
+    "llc",
+    "ltd",
+    "gmbh",
+    "biosciences",
+    "laboratories",
+)
+
+
+class Classification(NamedTuple):
+    """Outcome of classifying one affiliation string."""
+
+    is_company: bool
+    academic: Tuple[str, ...]
+    company: Tuple[str, ...]
+
+
+class AffiliationClassifier:
+    """Academic/company keyword matcher, compiled once and reused."""
+
+    def __init__(
+        self,
+        academic_keywords: Tuple[str, ...] = ACADEMIC_KEYWORDS,
+        company_keywords: Tuple[str, ...] = COMPANY_KEYWORDS,
+    ) -> None:
+        """
+        Compile the keyword regexes.
+
+        Args:
+            academic_keywords: Lowercase markers of an academic affiliation
+            company_keywords: Lowercase markers of a company affiliation
+        """
+        self.academic_keywords = tuple(academic_keywords)
+        self.company_keywords = tuple(company_keywords)
+        # One longest-first alternation per kind. Keywords of one kind only
+        # overlap as prefix pairs (pharma/pharmaceutical), which cannot change
+        # the decision, but keywords of different kinds do (pharma/academy in
+        # "Pharmacademy"), so each kind is scanned on its own.
+        self._academic = re.compile(_longest_first(academic_keywords))
+        self._company = re.compile(_longest_first(company_keywords))
+
+    def classify(self, affiliation: str) -> Classification:
+        """
+        Classify an affiliation.
+
+        Args:
+            affiliation: Affiliation string
+
+        Returns:
+            Whether it is a company affiliation (a company marker and no
+            academic marker), plus the markers of each kind that matched
+        """
+        affiliation_lower = affiliation.lower()
+        academic = tuple(self._academic.findall(affiliation_lower))
+        company = tuple(self._company.findall(affiliation_lower))
+        return Classification(bool(company) and not academic, academic, company)
+
+    def is_company(self, affiliation: str) -> bool:
+        """
+        Return True if the affiliation is from a company, not academia.
+
+        Equivalent to ``classify(affiliation).is_company`` but skips
+        collecting markers: an academic marker vetoes, so it is searched
+        for first and usually settles the answer on its own.
+        """
+        affiliation_lower = affiliation.lower()
+        return (
+            self._academic.search(affiliation_lower) is None
+            and self._company.search(affiliation_lower) is not None
+        )
+
 
 class AffiliationAnalyzer:
     """Analyzer for identifying company affiliations in PubMed articles."""
 
-    def __init__(self) -> None:
-        """Initialize the affiliation analyzer."""
+    def __init__(self, classifier: Optional[AffiliationClassifier] = None) -> None:
+        """
+        Initialize the affiliation analyzer.
+
+        Args:
+            classifier: Affiliation classifier to share (built if not given)
+        """
+        self.classifier = classifier or AffiliationClassifier()
+
         # List of known pharmaceutical and biotech companies
         self.known_companies: Set[str] = {
             "pfizer",
@@ -74,18 +173,48 @@ class AffiliationAnalyzer:
             "n.v.",
         }
 
-    def is_company_affiliated(self, article: Dict) -> bool:
+        # Compile both lookups once. Alternatives are ordered longest first
+        # so that e.g. "inc." beats "inc" deterministically, rather than in
+        # set iteration order, and a suffix must end its word, so "co" and
+        # "ag" never match the start of "Consulting" or "Agency".
+        self._company_pattern = re.compile(
+            _longest_first(self.known_companies), re.IGNORECASE
+        )
+        self._suffix_pattern = re.compile(
+            r"([A-Z][A-Za-z0-9\-\s]+)\s+(?P<suffix>"
+            + _longest_first(self.company_suffixes)
+            + r")(?![a-z0-9])",
+            re.IGNORECASE,
+        )
+        # Known companies as whole words, so "Rochester" is not Roche
+        self._company_word_pattern = re.compile(
+            rf"\b(?:{_longest_first(self.known_companies)})\b", re.IGNORECASE
+        )
+
+    def is_company_affiliated(self, article: Union[Article, Dict]) -> bool:
         """
         Determine if an article has authors affiliated with companies.
 
         Args:
-            article: Article dictionary with author and affiliation information
+            article: Article (or article dictionary) with author information
 
         Returns:
             True if at least one author is affiliated with a company
         """
         return len(article.get("non_academic_authors", [])) > 0
 
+    def classify_affiliation(self, affiliation: str) -> Classification:
+        """
+        Classify a single affiliation string as academic or company.
+
+        Args:
+            affiliation: Affiliation string
+
+        Returns:
+            Classification with the academic and company markers found
+        """
+        return self.classifier.classify(affiliation)
+
     def extract_company_affiliations(self, affiliations: List[str]) -> List[str]:
         """
         Extract company names from a list of affiliation strings.
@@ -105,6 +234,23 @@ class AffiliationAnalyzer:
 
         return companies
 
+    def canonical_company(self, name: str) -> str:
+        """
+        Return the key a company name is grouped under.
+
+        Names of a known company's subsidiaries and sites, such as "Pfizer
+        Japan" or "Pfizer R&D UK", share that company's key; other names
+        are their own key.
+
+        Args:
+            name: Company name, as extracted from an affiliation
+
+        Returns:
+            The known company named, or else the name, in lowercase
+        """
+        match = self._company_word_pattern.search(name)
+        return (match.group(0) if match else name).strip().lower()
+
     def _identify_company(self, affiliation: str) -> str:
         """
         Identify a company name from an affiliation string.
@@ -115,24 +261,21 @@ class AffiliationAnalyzer:
         Returns:
             Identified company name or empty string if not found
         """
-        # Check for known companies
-        affiliation_lower = affiliation.lower()
-        for company in self.known_companies:
-            if company in affiliation_lower:
-                # Try to extract the full company name with proper capitalization
-                pattern = re.compile(re.escape(company), re.IGNORECASE)
-                match = pattern.search(affiliation)
-                if match:
-                    return match.group(0)
-                return company
+        # Check for known companies, keeping the affiliation's capitalization
+        match = self._company_pattern.search(affiliation)
+        if match:
+            return match.group(0)
 
         # Look for company suffixes
-        for suffix in self.company_suffixes:
-            pattern = re.compile(
-                r"([A-Z][A-Za-z0-9\-\s]+)\s+" + re.escape(suffix), re.IGNORECASE
-            )
-            match = pattern.search(affiliation)
-            if match:
-                return f"{match.group(1)} {suffix}"
+        match = self._suffix_pattern.search(affiliation)
+        if match:
+            return f"{match.group(1)} {match.group('suffix').lower()}"
 
         return ""
+
+
+def _longest_first(terms: Iterable[str]) -> str:
+    """Build a regex alternation of literal terms, longest (then alphabetical) first."""
+    return "|".join(
+        re.escape(term) for term in sorted(terms, key=lambda t: (-len(t), t))
+    )
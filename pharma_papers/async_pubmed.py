@@ -0,0 +1,273 @@
+"""Module for querying PubMed from asyncio code."""
+
+import asyncio
+import io
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Tuple, Union
+
+from Bio import Entrez
+
+from pharma_papers.optional import import_optional
+from pharma_papers.pubmed import (
+    ACCEPT_ENCODING,
+    ESEARCH_MAX_IDS,
+    FetchError,
+    SearchResult,
+    _EUtilsClient,
+    _join_responses,
+)
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Connections kept open by default; NCBI allows at most 10 requests a second
+DEFAULT_MAX_CONNECTIONS = 10
+
+
+class AsyncPubMedClient(_EUtilsClient):
+    """PubMed client for asyncio, on an httpx pool of keep-alive connections.
+
+    Offers the ``search``/``fetch_details`` surface of PubMedClient as
+    coroutines, plus async iterators over the fetched batches. Any number
+    of searches and fetches can run concurrently on one event loop; they
+    all draw on the client's rate limiter, which may also be shared with
+    sync clients. Use the client as an async context manager, or call
+    :meth:`aclose`, to release its connections.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        **kwargs: Any,
+    ) -> None:
+        """
+        Initialize the client and its connection pool.
+
+        Takes the arguments of :class:`_EUtilsClient`, plus:
+
+        Args:
+            max_connections: Connections kept open for all the searches and
+                fetches on the loop; raised to ``max_workers`` if lower, so
+                one fetch's batches never wait on each other for a connection
+
+        Raises:
+            ImportError: httpx is not installed
+        """
+        super().__init__(*args, **kwargs)
+        self._httpx = import_optional("httpx", "AsyncPubMedClient", "async")
+        connections = max(max_connections, self.max_workers)
+        self.session = self._httpx.AsyncClient(
+            headers={"Accept-Encoding": ACCEPT_ENCODING},
+            timeout=self.timeout,
+            limits=self._httpx.Limits(
+                max_connections=connections,
+                max_keepalive_connections=connections,
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncPubMedClient":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self.session.aclose()
+
+    async def search(
+        self,
+        query: str,
+        max_results: int = 10000,
+        mindate: Optional[str] = None,
+        maxdate: Optional[str] = None,
+        datetype: str = "edat",
+    ) -> SearchResult:
+        """
+        Run esearch and keep the result set on the history server.
+
+        Args:
+            query: PubMed query string
+            max_results: Maximum number of records to fetch later
+            mindate: Earliest date (``YYYY/MM/DD``) to include, if any
+            maxdate: Latest date (``YYYY/MM/DD``) to include, if any
+            datetype: Date field the range applies to, e.g. ``edat`` or ``mdat``
+
+        Returns:
+            Handle carrying WebEnv, QueryKey, Count and the returned PMIDs
+        """
+        cache_key, date_params = self._search_params(query, mindate, maxdate, datetype)
+        # The search cache queries SQLite and Entrez.read parses the XML, so
+        # both run on a worker thread, off the loop, as in _fetch_batch
+        cached = await asyncio.to_thread(self._cached_search, cache_key, max_results)
+        if cached is not None:
+            return cached
+
+        try:
+            raw = await self._request(
+                "esearch.fcgi",
+                {
+                    "term": query,
+                    "retmax": min(max_results, ESEARCH_MAX_IDS),
+                    "sort": "relevance",
+                    "usehistory": "y",  # Enable session caching
+                    **date_params,
+                },
+            )
+        except Exception as e:
+            logger.error(f"Search failed: {e}")
+            raise
+        record = await asyncio.to_thread(Entrez.read, io.BytesIO(raw))
+        return await asyncio.to_thread(
+            self._search_result, record, cache_key, max_results
+        )
+
+    async def fetch_details(
+        self, pmids: Union[SearchResult, List[str]]
+    ) -> Dict[str, Any]:
+        """
+        Fetch and merge the article details of every batch.
+
+        Raises:
+            FetchError: A batch still failed after retries; its ``partial``
+                holds the records of the batches fetched before it
+        """
+        all_records: Dict[str, Any] = {"PubmedArticle": []}
+        try:
+            async for records in self.iter_details(pmids):
+                all_records["PubmedArticle"].extend(records.get("PubmedArticle", []))
+        except self._httpx.HTTPError as e:
+            fetched = len(all_records["PubmedArticle"])
+            raise FetchError(
+                f"Fetch stopped after {fetched} articles: {e}", all_records
+            ) from e
+        return all_records
+
+    async def iter_details(
+        self, pmids: Union[SearchResult, List[str]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Fetch article details lazily, one efetch batch at a time.
+
+        Batches are parsed on a worker thread, so the event loop keeps
+        serving other queries meanwhile.
+
+        Args:
+            pmids: Search handle or PubMed IDs to fetch
+
+        Yields:
+            The Entrez.read records of each batch, as soon as it arrives
+        """
+        async for raw in self.iter_raw_details(pmids):
+            yield await asyncio.to_thread(Entrez.read, io.BytesIO(raw))
+
+    async def iter_raw_details(
+        self,
+        pmids: Union[SearchResult, List[str]],
+        start: int = 0,
+        ends: Optional[List[int]] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Fetch the efetch XML of each batch lazily, without parsing it.
+
+        Up to ``max_workers`` batches are requested concurrently and
+        yielded in PMID order, as in PubMedClient.iter_raw_details.
+
+        Args:
+            pmids: Search handle or PubMed IDs to fetch
+            start: Offset of the first record to fetch, e.g. to resume a run
+            ends: If given, receives the offset each yielded batch ends at,
+                appended just before the batch is yielded
+
+        Yields:
+            A PubmedArticleSet document per batch, as soon as it arrives
+        """
+        pending: Deque[Tuple["asyncio.Task[bytes]", int]] = deque()
+
+        async def result() -> bytes:
+            task, end = pending.popleft()
+            raw = await task
+            if ends is not None:
+                ends.append(end)
+            return raw
+
+        try:
+            for params, batch, end in self._batches(pmids, start):
+                task = asyncio.create_task(self._fetch_batch(params, batch))
+                pending.append((task, end))
+                if len(pending) >= self.max_workers:
+                    yield await result()
+            while pending:
+                yield await result()
+        finally:
+            for task, _ in pending:
+                task.cancel()
+
+    async def _fetch_batch(
+        self, params: Dict[str, Any], pmids: Optional[List[str]]
+    ) -> bytes:
+        """
+        Fetch the efetch XML for one batch, using the cache if any.
+
+        The cache lookup and the merge query SQLite and split and rejoin
+        the batch's XML, so they run on a worker thread, off the loop.
+        """
+        try:
+            request, cached = await asyncio.to_thread(
+                self._cached_articles, params, pmids
+            )
+            raw = await self._request("efetch.fcgi", request) if request else b""
+            return await asyncio.to_thread(self._merge_cached, raw, pmids, cached)
+        except Exception as e:
+            logger.error(f"Fetch failed: {e}")
+            raise
+
+    async def _request(self, endpoint: str, params: Dict[str, Any]) -> bytes:
+        """Call an E-utility under the rate limit, with retries; return the body."""
+        query = self._params(endpoint, params)
+        for attempt in itertools.count(1):
+            # Every attempt takes a token, so retries stay within NCBI's cap
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            started = time.monotonic()
+            try:
+                # NCBI asks for POST once the request carries a long list of IDs
+                if "id" in params:
+                    response = await self.session.post(
+                        self.base_url + endpoint, data=query
+                    )
+                else:
+                    response = await self.session.get(
+                        self.base_url + endpoint, params=query
+                    )
+                response.raise_for_status()
+                body: bytes = response.content
+                self._record(
+                    endpoint,
+                    query,
+                    response.num_bytes_downloaded,
+                    body,
+                    time.monotonic() - started,
+                    attempt,
+                )
+                return body
+            except self._httpx.HTTPStatusError as e:
+                response = e.response
+                delay = self._backoff(
+                    endpoint, attempt, e, response.status_code, response.headers
+                )
+            except self._httpx.TransportError as e:
+                delay = self._backoff(endpoint, attempt, e)
+            await asyncio.sleep(delay)
+            # A failed batch that outgrew the shrunken size is sent in pieces
+            pieces = self._replan(endpoint, params)
+            if pieces:
+                return _join_responses(
+                    [await self._request(endpoint, piece) for piece in pieces]
+                )
+        raise AssertionError("unreachable")
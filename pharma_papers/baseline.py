@@ -0,0 +1,99 @@
+"""Module for ingesting PubMed baseline and update files offline."""
+
+import glob
+import logging
+import os
+from typing import Iterable, Iterator, List, Set
+
+from pharma_papers.models import Article
+from pharma_papers.parallel import ParsePool
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+BASELINE_PATTERN = "pubmed*.xml.gz"
+
+
+def find_baseline_files(paths: Iterable[str]) -> List[str]:
+    """
+    Expand files and directories into the PubMed XML files to ingest.
+
+    Directories contribute their ``pubmed*.xml.gz`` files. NCBI numbers
+    baseline and update files in release order, so they are returned
+    newest first: a record revised by an update file is then met before
+    the stale copy in an older file.
+
+    Args:
+        paths: Files and/or directories
+
+    Returns:
+        File paths sorted from newest to oldest by file name
+    """
+    files = set()
+    for path in paths:
+        if os.path.isdir(path):
+            files.update(glob.glob(os.path.join(path, BASELINE_PATTERN)))
+        else:
+            files.add(path)
+    return sorted(files, key=lambda name: (os.path.basename(name), name), reverse=True)
+
+
+class PMIDSet:
+    """Compact set of numeric PMIDs, one bit per possible PMID."""
+
+    def __init__(self) -> None:
+        # A full baseline holds ~40M PMIDs; as a bitmap that is ~5 MB
+        self._bits = bytearray()
+        self._other: Set[str] = set()
+
+    def __contains__(self, pmid: str) -> bool:
+        if not pmid.isdigit():
+            return pmid in self._other
+        index = int(pmid)
+        byte = index >> 3
+        return byte < len(self._bits) and bool(self._bits[byte] & (1 << (index & 7)))
+
+    def update(self, pmids: Iterable[str]) -> None:
+        """Add PMIDs to the set."""
+        for pmid in pmids:
+            if not pmid.isdigit():
+                self._other.add(pmid)
+                continue
+            index = int(pmid)
+            byte = index >> 3
+            if byte >= len(self._bits):
+                self._bits.extend(bytes(max(byte + 1 - len(self._bits), 1 << 20)))
+            self._bits[byte] |= 1 << (index & 7)
+
+
+def iter_baseline_articles(
+    parse_pool: ParsePool, paths: Iterable[str]
+) -> Iterator[List[Article]]:
+    """
+    Stream the company-affiliated articles out of local PubMed XML files.
+
+    Files are parsed newest first, in parallel when the pool has workers.
+    Only the newest version of each PMID is considered, and PMIDs that a
+    newer update file deletes are dropped.
+
+    Args:
+        parse_pool: Pool parsing one file per task
+        paths: Files and/or directories of ``pubmed*.xml.gz`` files
+
+    Yields:
+        The company-affiliated articles of each file
+    """
+    files = find_baseline_files(paths)
+    logger.info(f"Ingesting {len(files)} PubMed XML files")
+
+    # PMIDs already superseded: seen in a newer file, or deleted by one
+    seen = PMIDSet()
+    for parsed in parse_pool.imap_files(files):
+        articles = [article for article in parsed.articles if article.pmid not in seen]
+        seen.update(parsed.pmids)
+        seen.update(parsed.deleted)
+        logger.info(
+            f"{os.path.basename(parsed.path)}: {len(parsed.pmids)} articles, "
+            f"{len(articles)} company-affiliated, {len(parsed.deleted)} deleted"
+        )
+        yield articles
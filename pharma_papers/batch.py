@@ -0,0 +1,160 @@
+"""Module for running many PubMed queries with one fetch per article."""
+
+import logging
+import os
+import re
+from typing import Dict, List, Optional
+
+from pharma_papers.cache import normalize_query
+from pharma_papers.models import Article
+from pharma_papers.output import OutputHandler
+from pharma_papers.parallel import ParsePool
+from pharma_papers.pubmed import PubMedClient
+from pharma_papers.store import ArticleStore
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def read_queries(path: str) -> List[str]:
+    """
+    Read one query per line, skipping blank lines, ``#`` comments and repeats.
+
+    Args:
+        path: Text file of PubMed queries
+
+    Returns:
+        Normalized queries in file order
+    """
+    queries: List[str] = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            query = normalize_query(line)
+            if query and not query.startswith("#") and query not in queries:
+                queries.append(query)
+    return queries
+
+
+def query_filename(index: int, query: str, output_format: str) -> str:
+    """
+    Name the per-query output file of a batch run.
+
+    Args:
+        index: 1-based position of the query in the batch
+        query: PubMed query string
+        output_format: Output format, used as the file extension
+
+    Returns:
+        File name such as ``003_cancer_Title.csv``
+    """
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", query).strip("_")[:60] or "query"
+    return f"{index:03d}_{slug}.{output_format}"
+
+
+class BatchRunner:
+    """Run a list of queries, fetching and parsing each matching PMID once."""
+
+    def __init__(
+        self,
+        client: PubMedClient,
+        parse_pool: ParsePool,
+        output_handler: OutputHandler,
+        store: Optional[ArticleStore] = None,
+    ) -> None:
+        """
+        Initialize the batch runner.
+
+        Args:
+            client: Client used for every esearch and efetch
+            parse_pool: Pool turning efetch XML into company-affiliated articles
+            output_handler: Handler writing the results
+            store: Local article store also receiving the results, if any
+        """
+        self.client = client
+        self.parse_pool = parse_pool
+        self.output_handler = output_handler
+        self.store = store
+
+    def search_all(self, queries: List[str], max_results: int) -> Dict[str, List[str]]:
+        """
+        Run every esearch.
+
+        esearch lists at most 10,000 IDs per query; hits beyond that are
+        not fetched in batch mode.
+
+        Args:
+            queries: PubMed query strings
+            max_results: Maximum number of records per query
+
+        Returns:
+            The PMIDs of each query, in relevance order
+        """
+        results: Dict[str, List[str]] = {}
+        for query in queries:
+            result = self.client.search(query, max_results=max_results)
+            if len(result) > len(result.pmids):
+                logger.warning(
+                    f"Only the first {len(result.pmids)} of {len(result)} "
+                    f"records of {query!r} are fetched in batch mode"
+                )
+            results[query] = result.pmids[: len(result)]
+        return results
+
+    def run(
+        self,
+        queries: List[str],
+        max_results: int = 10000,
+        output_file: Optional[str] = None,
+        output_dir: Optional[str] = None,
+        output_format: str = "csv",
+    ) -> int:
+        """
+        Search, fetch, filter and write the results of every query.
+
+        Without ``output_dir`` the articles stream into one output tagged
+        with the queries each matched. With it, each query gets its own
+        file, written once all batches are in.
+
+        Args:
+            queries: PubMed query strings
+            max_results: Maximum number of records per query
+            output_file: Tagged output file (default: stdout)
+            output_dir: Directory for one output file per query instead
+            output_format: One of OUTPUT_FORMATS
+
+        Returns:
+            Number of articles written, counting each file separately
+        """
+        results = self.search_all(queries, max_results)
+        # Union the result sets: the queries each PMID matched, first seen first
+        tags: Dict[str, List[str]] = {}
+        for query, pmids in results.items():
+            for pmid in pmids:
+                tags.setdefault(pmid, []).append(query)
+        logger.info(
+            f"{len(queries)} queries matched "
+            f"{sum(map(len, results.values()))} records, {len(tags)} distinct"
+        )
+
+        batches = self.parse_pool.imap(self.client.iter_raw_details(list(tags)))
+        if self.store is not None:
+            batches = self.store.store_batches(batches, tags=tags)
+
+        if output_dir is None:
+            return self.output_handler.stream_results(
+                batches, output_file, output_format=output_format, tags=tags
+            )
+
+        found: Dict[str, Article] = {
+            article.pmid: article for articles in batches for article in articles
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        written = 0
+        for index, (query, pmids) in enumerate(results.items(), 1):
+            path = os.path.join(output_dir, query_filename(index, query, output_format))
+            written += self.output_handler.stream_results(
+                [[found[pmid] for pmid in pmids if pmid in found]],
+                path,
+                output_format=output_format,
+            )
+        return written
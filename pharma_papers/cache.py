@@ -0,0 +1,370 @@
+"""Module for caching PubMed data on disk between runs."""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # 30 days
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MiB of compressed XML
+# NCBI drops idle history sessions after a few hours, so cached WebEnvs go stale
+DEFAULT_SEARCH_MAX_AGE = 3600
+DEFAULT_SEARCH_MAX_ENTRIES = 1000
+DEFAULT_LRU_SIZE = 50000
+
+
+def default_cache_dir() -> str:
+    """Return the per-user cache directory, honouring XDG_CACHE_HOME."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "pharma_papers")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a query for use as a lookup key.
+
+    Only whitespace is collapsed: PubMed treats lowercase ``and``/``or``
+    as search terms, so case is significant.
+    """
+    return re.sub(r"\s+", " ", query).strip()
+
+
+class LRUCache:
+    """Bounded in-memory least-recently-used cache with hit statistics."""
+
+    def __init__(self, maxsize: int = DEFAULT_LRU_SIZE) -> None:
+        """
+        Args:
+            maxsize: Number of entries kept; the least recently used go first
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return a cached value (marking it recently used), or ``default``."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def items(self) -> List[Tuple[Hashable, Any]]:
+        """Return the entries, least recently used first."""
+        return list(self._data.items())
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def save(self, path: str, version: str) -> None:
+        """
+        Persist the entries, oldest first, to a JSON file.
+
+        Keys must be strings and values JSON-serializable.
+
+        Args:
+            path: File to write
+            version: Identifies what produced the values, see :meth:`load`
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": version, "entries": self.items()}, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str, version: str) -> None:
+        """
+        Add the entries saved by :meth:`save`, if the file exists.
+
+        Args:
+            path: File to read
+            version: Must match the version the file was saved with;
+                otherwise the values came from other rules and are ignored
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f)
+        if saved.get("version") != version:
+            logger.info(f"Ignoring cache {path} saved by other rules")
+            return
+        for key, value in saved.get("entries", []):
+            self.put(key, value)
+
+
+class _SQLiteCache:
+    """Shared plumbing for the SQLite-backed caches."""
+
+    schema = ""
+
+    def __init__(self, path: str, clock: Callable[[], float]) -> None:
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        # Batches are fetched on worker threads, so share one guarded connection
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(self.schema)
+        self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database."""
+        with self._lock:
+            self._conn.close()
+
+
+class ArticleCache(_SQLiteCache):
+    """SQLite-backed cache of raw PubmedArticle XML keyed by PMID."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS articles (
+            pmid TEXT PRIMARY KEY,
+            xml BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS articles_accessed ON articles (accessed_at);
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_age: float = DEFAULT_MAX_AGE,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Open (creating if needed) the cache database.
+
+        Args:
+            path: SQLite file (defaults to ``articles.sqlite3`` in the cache dir)
+            max_age: Seconds after which a cached article is refetched
+            max_bytes: Cap on the total compressed size; least recently used
+                articles are evicted beyond it
+            clock: Wall clock, injectable for tests
+        """
+        super().__init__(
+            path or os.path.join(default_cache_dir(), "articles.sqlite3"), clock
+        )
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, pmids: Iterable[str]) -> Dict[str, bytes]:
+        """
+        Look up fresh cached articles.
+
+        Args:
+            pmids: PubMed IDs to look up
+
+        Returns:
+            Mapping of PMID to raw PubmedArticle XML for every fresh hit
+        """
+        pmids = list(pmids)
+        now = self._clock()
+        found: Dict[str, bytes] = {}
+
+        with self._lock:
+            for i in range(0, len(pmids), 500):
+                chunk = pmids[i : i + 500]
+                rows = self._conn.execute(
+                    "SELECT pmid, xml FROM articles WHERE fetched_at >= ?"
+                    f" AND pmid IN ({','.join('?' * len(chunk))})",
+                    [now - self.max_age, *chunk],
+                )
+                found.update((pmid, zlib.decompress(xml)) for pmid, xml in rows)
+            self._conn.executemany(
+                "UPDATE articles SET accessed_at = ? WHERE pmid = ?",
+                [(now, pmid) for pmid in found],
+            )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(pmids) - len(found)
+
+        return found
+
+    def put_many(self, articles: Dict[str, bytes]) -> None:
+        """
+        Store freshly fetched articles and enforce the size cap.
+
+        Args:
+            articles: Mapping of PMID to raw PubmedArticle XML
+        """
+        now = self._clock()
+        rows = []
+        for pmid, xml in articles.items():
+            blob = zlib.compress(xml)
+            rows.append((pmid, blob, len(blob), now, now))
+
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO articles VALUES (?, ?, ?, ?, ?)", rows
+            )
+            self._evict()
+            self._conn.commit()
+
+    def purge(self) -> None:
+        """Remove every cached article."""
+        with self._lock:
+            self._conn.execute("DELETE FROM articles")
+            self._conn.commit()
+            self._conn.execute("VACUUM")
+        logger.info(f"Purged article cache {self.path}")
+
+    def _evict(self) -> None:
+        """Drop expired articles, then least recently used ones over the cap."""
+        self._conn.execute(
+            "DELETE FROM articles WHERE fetched_at < ?",
+            (self._clock() - self.max_age,),
+        )
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM articles"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+
+        excess = total - self.max_bytes
+        victims = []
+        for pmid, size in self._conn.execute(
+            "SELECT pmid, size FROM articles ORDER BY accessed_at, pmid"
+        ):
+            victims.append((pmid,))
+            excess -= size
+            if excess <= 0:
+                break
+        self._conn.executemany("DELETE FROM articles WHERE pmid = ?", victims)
+        logger.debug(f"Evicted {len(victims)} articles from the cache")
+
+
+class SearchCache(_SQLiteCache):
+    """SQLite-backed memo of esearch results keyed by normalized query."""
+
+    schema = """
+        CREATE TABLE IF NOT EXISTS searches (
+            query TEXT NOT NULL,
+            max_results INTEGER NOT NULL,
+            result TEXT NOT NULL,
+            searched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            PRIMARY KEY (query, max_results)
+        );
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_age: float = DEFAULT_SEARCH_MAX_AGE,
+        max_entries: int = DEFAULT_SEARCH_MAX_ENTRIES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        """
+        Open (creating if needed) the search cache database.
+
+        Args:
+            path: SQLite file (defaults to ``searches.sqlite3`` in the cache dir)
+            max_age: Seconds a stored search stays fresh
+            max_entries: Number of searches kept; least recently used go first
+            clock: Wall clock, injectable for tests
+        """
+        super().__init__(
+            path or os.path.join(default_cache_dir(), "searches.sqlite3"), clock
+        )
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str, max_results: int) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh stored search.
+
+        Args:
+            query: PubMed query string
+            max_results: The max_results the search was run with
+
+        Returns:
+            The stored esearch result fields, or None on a miss
+        """
+        key = (normalize_query(query), max_results)
+        now = self._clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result FROM searches"
+                " WHERE query = ? AND max_results = ? AND searched_at >= ?",
+                (*key, now - self.max_age),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE searches SET accessed_at = ?"
+                " WHERE query = ? AND max_results = ?",
+                (now, *key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        result: Dict[str, Any] = json.loads(row[0])
+        return result
+
+    def put(self, query: str, max_results: int, result: Dict[str, Any]) -> None:
+        """
+        Store a search result and enforce the age and size bounds.
+
+        Args:
+            query: PubMed query string
+            max_results: The max_results the search was run with
+            result: JSON-serializable esearch result fields
+        """
+        now = self._clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO searches VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(query), max_results, json.dumps(result), now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM searches WHERE searched_at < ?", (now - self.max_age,)
+            )
+            self._conn.execute(
+                "DELETE FROM searches WHERE rowid NOT IN ("
+                " SELECT rowid FROM searches ORDER BY accessed_at DESC LIMIT ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def purge(self) -> None:
+        """Remove every stored search."""
+        with self._lock:
+            self._conn.execute("DELETE FROM searches")
+            self._conn.commit()
+        logger.info(f"Purged search cache {self.path}")
@@ -0,0 +1,199 @@
+"""Module for journaling fetch progress so an interrupted run can resume."""
+
+import json
+import logging
+import os
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, TextIO
+
+from pharma_papers.pubmed import SearchResult
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_path(output_file: str) -> str:
+    """Return where the checkpoint journal of an output file is kept."""
+    return f"{output_file}.checkpoint"
+
+
+class Checkpoint:
+    """Journal of a single-query run, appended to as each batch is written.
+
+    The first line records the run: its query, output file and format, and
+    the search handle, so a resumed run need not search again. Each later
+    line records a batch whose rows are flushed to the output: the offset
+    in the result set where the next batch starts, the rows written so far
+    and the output file's size. Lines are fsync'd as they are written, so
+    the journal never claims more than the output holds, and a resumed run
+    truncates any rows of a batch that was cut short.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        query: str,
+        output_file: str,
+        output_format: str,
+        search_result: SearchResult,
+    ) -> None:
+        """
+        Start a journal for a new run; nothing is written until begin().
+
+        Args:
+            path: Journal file, see :func:`checkpoint_path`
+            query: PubMed query string
+            output_file: File the run writes to
+            output_format: Format of the output file
+            search_result: Search handle of the run
+        """
+        self.path = path
+        self.query = query
+        self.output_file = output_file
+        self.output_format = output_format
+        self.search_result = search_result
+        # Progress as of the last batch written
+        self.done = 0
+        self.rows = 0
+        self.size = 0
+        self.resumed = False
+        # End offset of each fetched batch, filled by PubMedClient.iter_raw_details
+        self.ends: List[int] = []
+        self._batches = 0
+        self._rows_before = 0
+        self._file: Optional[TextIO] = None
+
+    @classmethod
+    def load(cls, path: str) -> Optional["Checkpoint"]:
+        """
+        Read the journal an interrupted run left behind.
+
+        A line cut short by a crash is ignored, as is everything after it.
+
+        Args:
+            path: Journal file
+
+        Returns:
+            The checkpoint at the last batch fully written, or None if there
+            is no journal
+        """
+        if not os.path.exists(path):
+            return None
+        entries: List[Dict[str, Any]] = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+        if not entries:
+            return None
+
+        run, *progress = entries
+        checkpoint = cls(
+            path,
+            run["query"],
+            run["output_file"],
+            run["format"],
+            SearchResult(**run["search"]),
+        )
+        checkpoint.resumed = True
+        if progress:
+            last = progress[-1]
+            checkpoint.done = last["done"]
+            checkpoint.rows = last["rows"]
+            checkpoint.size = last["size"]
+        return checkpoint
+
+    def matches(self, query: str, output_file: str, output_format: str) -> bool:
+        """Return whether the journal belongs to a run with these arguments."""
+        return (self.query, self.output_format) == (query, output_format) and (
+            os.path.abspath(self.output_file) == os.path.abspath(output_file)
+        )
+
+    def resume_from(self) -> SearchResult:
+        """
+        Return the search handle to fetch the remaining batches from.
+
+        History server handles expire after a few idle hours, so when the
+        journal holds every PMID of the run they are fetched by ID instead.
+        """
+        result = self.search_result
+        if len(result.pmids) >= len(result):
+            return SearchResult(result.count, result.max_results, pmids=result.pmids)
+        return result
+
+    def begin(self) -> None:
+        """
+        Rewrite the journal at its current progress and open it for appending.
+
+        When resuming, any rows past the last journaled batch are truncated from
+        the output file, so no row is written twice.
+
+        Raises:
+            ValueError: The output file is shorter than the journal records
+        """
+        if self.resumed:
+            size = (
+                os.path.getsize(self.output_file)
+                if os.path.exists(self.output_file)
+                else 0
+            )
+            if size < self.size:
+                raise ValueError(
+                    f"{self.output_file} is missing rows recorded in {self.path}"
+                )
+            if size > self.size:
+                os.truncate(self.output_file, self.size)
+        self._rows_before = self.rows
+
+        run = {
+            "query": self.query,
+            "output_file": self.output_file,
+            "format": self.output_format,
+            "search": asdict(self.search_result),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(run) + "\n")
+            if self.done:
+                f.write(self._progress_line())
+        os.replace(tmp_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def batch_written(self, rows: int, size: int) -> None:
+        """
+        Record that the next fetched batch is flushed to the output.
+
+        Matches the ``on_batch`` callback of OutputHandler.stream_results.
+
+        Args:
+            rows: Rows written by this run of the stream so far
+            size: Size of the output file
+        """
+        assert self._file is not None
+        self.done = self.ends[self._batches]
+        self._batches += 1
+        self.rows = self._rows_before + rows
+        self.size = size
+        self._file.write(self._progress_line())
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        """Close the journal, keeping it for a later resume."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def finish(self) -> None:
+        """Close and delete the journal once the run is complete."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        logger.debug(f"Removed checkpoint {self.path}")
+
+    def _progress_line(self) -> str:
+        progress = {"done": self.done, "rows": self.rows, "size": self.size}
+        return json.dumps(progress) + "\n"
@@ -2,14 +2,19 @@
 
 import argparse
 import logging
+import os
 import re
 import sys
-from typing import List, Optional
+from datetime import date
+from typing import TYPE_CHECKING, List, Optional, Set
 
-from pharma_papers.affiliations import AffiliationAnalyzer
-from pharma_papers.output import OutputHandler
-from pharma_papers.parser import PubMedParser
-from pharma_papers.pubmed import PubMedClient
+from pharma_papers.cache import DEFAULT_SEARCH_MAX_AGE, default_cache_dir
+from pharma_papers.state import default_state_path
+
+# requests, Biopython and the parsing modules are imported in main() once the
+# arguments are valid, so -h and usage errors return without loading them
+if TYPE_CHECKING:
+    from pharma_papers.models import Article
 
 # Configure logging
 logging.basicConfig(
@@ -33,10 +38,31 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Fetch research papers from PubMed with pharmaceutical company affiliations"
     )
-    parser.add_argument("query", help="PubMed search query")
+    parser.add_argument(
+        "query", nargs="?", default=None, help="PubMed search query"
+    )
+    parser.add_argument(
+        "--queries-file",
+        help="Run every query in this file (one per line) instead, fetching "
+        "each matching article once; output gets a Queries column",
+        default=None,
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="With --queries-file, write one output file per query here "
+        "instead of a single -f file",
+        default=None,
+    )
     parser.add_argument(
         "-f", "--file", help="Output file path (default: print to stdout)", default=None
     )
+    parser.add_argument(
+        "--format",
+        help="Output format; jsonl writes one JSON object per line, while "
+        "parquet, arrow and feather need -f and pyarrow (default: csv)",
+        choices=["csv", "jsonl", "parquet", "arrow", "feather"],
+        default="csv",
+    )
     parser.add_argument(
         "-d", "--debug", help="Print debug information", action="store_true"
     )
@@ -53,10 +79,294 @@ def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
         type=int,
         default=10000,
     )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        help="Number of efetch batches to download in parallel (default: 1)",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--batch-size",
+        help="Fixed number of articles per efetch request (default: adapt to "
+        "response times, starting at 200)",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--retries",
+        help="Retries of a throttled or failed E-utilities request, with "
+        "exponential backoff (default: 4)",
+        type=int,
+        default=4,
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of processes parsing fetched batches (default: 1, parse "
+        "in-process)",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--no-cache",
+        help="Bypass the on-disk caches and always query PubMed",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--purge-cache",
+        help="Empty the on-disk caches before running",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--search-max-age",
+        help="Seconds a cached search result stays fresh "
+        f"(default: {DEFAULT_SEARCH_MAX_AGE})",
+        type=float,
+        default=DEFAULT_SEARCH_MAX_AGE,
+    )
+    parser.add_argument(
+        "--affiliation-cache",
+        help="JSON file persisting affiliation classifications between runs",
+        default=None,
+    )
+    parser.add_argument(
+        "-i",
+        "--incremental",
+        help="Only search since the query's last successful run and append "
+        "articles not emitted before",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--state-file",
+        help=f"Incremental run state (default: {default_state_path()})",
+        default=None,
+    )
+    parser.add_argument(
+        "--date-type",
+        help="Date field for the incremental window: edat (Entrez date) or "
+        "mdat (modification date)",
+        choices=["edat", "mdat"],
+        default="edat",
+    )
+    parser.add_argument(
+        "--resume",
+        help="Continue an interrupted run writing to -f from its checkpoint, "
+        "without re-fetching batches already written",
+        action="store_true",
+    )
+    parser.add_argument(
+        "--store",
+        help="Also upsert results into a local SQLite article store (default "
+        f"location: {os.path.join(default_cache_dir(), 'papers.sqlite3')})",
+        nargs="?",
+        const="",
+        default=None,
+    )
+
+    return parser.parse_args(args)
+
+
+def parse_ingest_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the arguments of the offline baseline ingestion command.
+
+    Args:
+        args: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Find pharmaceutical company affiliated papers in local "
+        "PubMed baseline/update files (pubmed*.xml.gz), without querying PubMed"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Baseline/update files or directories of them"
+    )
+    parser.add_argument(
+        "-f", "--file", help="Output file path (default: print to stdout)", default=None
+    )
+    parser.add_argument(
+        "--format",
+        help="Output format; parquet, arrow and feather need -f and pyarrow "
+        "(default: csv)",
+        choices=["csv", "jsonl", "parquet", "arrow", "feather"],
+        default="csv",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="Number of files parsed in parallel (default: 1)",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "--store",
+        help="Also upsert results into a local SQLite article store (default "
+        f"location: {os.path.join(default_cache_dir(), 'papers.sqlite3')})",
+        nargs="?",
+        const="",
+        default=None,
+    )
+    parser.add_argument(
+        "-d", "--debug", help="Print debug information", action="store_true"
+    )
+
+    return parser.parse_args(args)
+
+
+def ingest_main(args: Optional[List[str]] = None) -> int:
+    """
+    Entry point for offline ingestion of PubMed baseline and update files.
+
+    Args:
+        args: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    parsed_args = None
+    try:
+        parsed_args = parse_ingest_args(args)
+        columnar = parsed_args.format in ("parquet", "arrow", "feather")
+        if columnar and not parsed_args.file:
+            logger.error(f"--format {parsed_args.format} needs an output file (-f)")
+            return 1
+        if parsed_args.debug:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        from pharma_papers.affiliations import (
+            AffiliationAnalyzer,
+            AffiliationClassifier,
+        )
+        from pharma_papers.baseline import iter_baseline_articles
+        from pharma_papers.output import OutputHandler
+        from pharma_papers.parallel import ParsePool
+        from pharma_papers.parser import PubMedParser
+        from pharma_papers.store import ArticleStore
+
+        classifier = AffiliationClassifier()
+        parse_pool = ParsePool(
+            PubMedParser(classifier),
+            AffiliationAnalyzer(classifier),
+            parsed_args.workers,
+        )
+        output_handler = OutputHandler(debug=parsed_args.debug)
+        batches = iter_baseline_articles(parse_pool, parsed_args.paths)
+        if parsed_args.store is not None:
+            batches = ArticleStore(parsed_args.store or None).store_batches(batches)
+        if not output_handler.stream_results(
+            batches,
+            parsed_args.file,
+            output_format=parsed_args.format,
+        ):
+            logger.warning("No articles with pharmaceutical company affiliations found")
+        return 0
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        if parsed_args and parsed_args.debug:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+def parse_store_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Parse the arguments of the local article store search command.
+
+    Args:
+        args: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Parsed arguments
+    """
+    parser = argparse.ArgumentParser(
+        description="Search the articles stored by earlier --store runs, "
+        "without querying PubMed"
+    )
+    parser.add_argument(
+        "--store",
+        help="Article store (default: "
+        f"{os.path.join(default_cache_dir(), 'papers.sqlite3')})",
+        default=None,
+    )
+    parser.add_argument(
+        "--company",
+        help="Company name, any case; a known company such as pfizer also "
+        "matches its subsidiaries' names",
+        default=None,
+    )
+    parser.add_argument(
+        "--since", help="Earliest publication date, e.g. 2022 or 2022-06-01"
+    )
+    parser.add_argument(
+        "--before", help="Exclude publication dates from this one on, e.g. 2023"
+    )
+    parser.add_argument(
+        "--query", help="Only articles found by this PubMed query", default=None
+    )
+    parser.add_argument("--limit", help="Maximum number of articles", type=int)
+    parser.add_argument(
+        "-f", "--file", help="Output file path (default: print to stdout)", default=None
+    )
+    parser.add_argument(
+        "--format",
+        help="Output format; parquet, arrow and feather need -f and pyarrow "
+        "(default: csv)",
+        choices=["csv", "jsonl", "parquet", "arrow", "feather"],
+        default="csv",
+    )
+    parser.add_argument(
+        "-d", "--debug", help="Print debug information", action="store_true"
+    )
 
     return parser.parse_args(args)
 
 
+def store_main(args: Optional[List[str]] = None) -> int:
+    """
+    Entry point for searching the local article store.
+
+    Args:
+        args: Command-line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Exit code (0 for success, non-zero for failure)
+    """
+    parsed_args = None
+    try:
+        parsed_args = parse_store_args(args)
+        columnar = parsed_args.format in ("parquet", "arrow", "feather")
+        if columnar and not parsed_args.file:
+            logger.error(f"--format {parsed_args.format} needs an output file (-f)")
+            return 1
+        if parsed_args.debug:
+            logging.getLogger().setLevel(logging.DEBUG)
+
+        from pharma_papers.output import OutputHandler
+        from pharma_papers.store import ArticleStore
+
+        articles = ArticleStore(parsed_args.store).search(
+            company=parsed_args.company,
+            since=parsed_args.since,
+            before=parsed_args.before,
+            query=parsed_args.query,
+            limit=parsed_args.limit,
+        )
+        if not OutputHandler(debug=parsed_args.debug).stream_results(
+            [articles], parsed_args.file, output_format=parsed_args.format
+        ):
+            logger.warning("No stored articles match")
+        return 0
+    except Exception as e:
+        logger.error(f"Error: {e}")
+        if parsed_args and parsed_args.debug:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
 def main(args: Optional[List[str]] = None) -> int:
     """
     Main entry point for the command-line interface.
@@ -68,7 +378,7 @@ def main(args: Optional[List[str]] = None) -> int:
         Exit code (0 for success, non-zero for failure)
     """
     try:
-        if not sys.argv[1:]:  # Show help if no args
+        if not (sys.argv[1:] if args is None else args):  # Show help if no args
             parse_args(["-h"])
             return 0
 
@@ -78,49 +388,234 @@ def main(args: Optional[List[str]] = None) -> int:
         if not re.match(r"[^@]+@[^@]+\.[^@]+", parsed_args.email):
             logger.error("Invalid email format")
             return 1
+        if (parsed_args.query is None) == (parsed_args.queries_file is None):
+            logger.error("Give either a query or --queries-file")
+            return 1
+        if parsed_args.queries_file and parsed_args.incremental:
+            logger.error("--queries-file cannot be used with -i")
+            return 1
+        if parsed_args.output_dir and not parsed_args.queries_file:
+            logger.error("--output-dir needs --queries-file")
+            return 1
+        if parsed_args.output_dir and parsed_args.file:
+            logger.error("Give either -f or --output-dir, not both")
+            return 1
+        columnar = parsed_args.format in ("parquet", "arrow", "feather")
+        if columnar and not (parsed_args.file or parsed_args.output_dir):
+            logger.error(f"--format {parsed_args.format} needs an output file (-f)")
+            return 1
+        if columnar and parsed_args.incremental:
+            logger.error(f"--format {parsed_args.format} cannot be used with -i")
+            return 1
+        if parsed_args.resume and (
+            not parsed_args.file
+            or columnar
+            or parsed_args.incremental
+            or parsed_args.queries_file
+        ):
+            logger.error(
+                "--resume needs -f with CSV or JSON Lines output, "
+                "and cannot be used with -i or --queries-file"
+            )
+            return 1
+        # A single-query run writing CSV or JSON Lines to a file is journaled
+        checkpointed = bool(
+            parsed_args.file
+            and not columnar
+            and not parsed_args.incremental
+            and not parsed_args.queries_file
+        )
 
         # Configure logging level
         if parsed_args.debug:
             logging.getLogger().setLevel(logging.DEBUG)
             logger.debug("Debug mode enabled")
 
+        from pharma_papers.affiliations import (
+            AffiliationAnalyzer,
+            AffiliationClassifier,
+        )
+        from pharma_papers.cache import ArticleCache, LRUCache, SearchCache
+        from pharma_papers.output import OutputHandler
+        from pharma_papers.parallel import ParsePool
+        from pharma_papers.parser import PubMedParser
+        from pharma_papers.pubmed import PubMedClient
+        from pharma_papers.ratelimit import RetryPolicy
+        from pharma_papers.state import IncrementalState
+        from pharma_papers.store import ArticleStore
+
         # Initialize components
+        if parsed_args.purge_cache:
+            ArticleCache().purge()
+            SearchCache().purge()
+        article_cache = search_cache = None
+        if not parsed_args.no_cache:
+            article_cache = ArticleCache()
+            search_cache = SearchCache(max_age=parsed_args.search_max_age)
         pubmed_client = PubMedClient(
-            email=parsed_args.email, api_key=parsed_args.api_key
+            email=parsed_args.email,
+            api_key=parsed_args.api_key,
+            max_workers=parsed_args.concurrency,
+            cache=article_cache,
+            search_cache=search_cache,
+            retry=RetryPolicy(max_attempts=parsed_args.retries + 1),
+            batch_size=parsed_args.batch_size,
         )
-        parser = PubMedParser()
-        affiliation_analyzer = AffiliationAnalyzer()
+        classifier = AffiliationClassifier()
+        affiliation_cache = LRUCache()
+        parser = PubMedParser(classifier, affiliation_cache)
+        if parsed_args.affiliation_cache:
+            affiliation_cache.load(parsed_args.affiliation_cache, parser.rules_version)
+        affiliation_analyzer = AffiliationAnalyzer(classifier)
+        parse_pool = ParsePool(parser, affiliation_analyzer, parsed_args.workers)
         output_handler = OutputHandler(debug=parsed_args.debug)
+        store = None
+        if parsed_args.store is not None:
+            store = ArticleStore(parsed_args.store or None)
 
-        # Search PubMed
-        pmids = pubmed_client.search(
-            parsed_args.query, max_results=parsed_args.max_results
-        )
+        if parsed_args.queries_file:
+            from pharma_papers.batch import BatchRunner, read_queries
 
-        if not pmids:
-            logger.warning("No results found for query")
-            return 0
+            runner = BatchRunner(pubmed_client, parse_pool, output_handler, store)
+            if not runner.run(
+                read_queries(parsed_args.queries_file),
+                max_results=parsed_args.max_results,
+                output_file=parsed_args.file,
+                output_dir=parsed_args.output_dir,
+                output_format=parsed_args.format,
+            ):
+                logger.warning(
+                    "No articles with pharmaceutical company affiliations found"
+                )
+        else:
+            # In incremental mode, only look at what changed since the last run
+            state = None
+            run_date = date.today().strftime("%Y/%m/%d")
+            mindate = maxdate = None
+            emitted: Set[str] = set()
+            if parsed_args.incremental:
+                state = IncrementalState(parsed_args.state_file)
+                emitted = state.emitted(parsed_args.query)
+                mindate = state.last_run(parsed_args.query)
+                if mindate:
+                    maxdate = run_date
+                    logger.info(
+                        f"Incremental run: {parsed_args.date_type} "
+                        f"{mindate} to {run_date}"
+                    )
 
-        # Fetch article details
-        records = pubmed_client.fetch_details(pmids)
+            checkpoint = None
+            if checkpointed:
+                from pharma_papers.checkpoint import Checkpoint, checkpoint_path
 
-        # Parse articles
-        articles = parser.parse_articles(records)
+                journal = checkpoint_path(parsed_args.file)
+                if parsed_args.resume:
+                    checkpoint = Checkpoint.load(journal)
+                    if checkpoint is None:
+                        logger.warning(f"No checkpoint at {journal}, starting over")
+                    elif not checkpoint.matches(
+                        parsed_args.query, parsed_args.file, parsed_args.format
+                    ):
+                        logger.error(f"{journal} belongs to a different run")
+                        return 1
 
-        # Filter for articles with company affiliations
-        company_articles = [
-            article
-            for article in articles
-            if affiliation_analyzer.is_company_affiliated(article)
-        ]
+            # Search PubMed, unless resuming a run that already did
+            if checkpoint is not None:
+                search_result = checkpoint.search_result
+                logger.info(
+                    f"Resuming at record {checkpoint.done} of "
+                    f"{len(search_result)}, {checkpoint.rows} articles written"
+                )
+            else:
+                search_result = pubmed_client.search(
+                    parsed_args.query,
+                    max_results=parsed_args.max_results,
+                    mindate=mindate,
+                    maxdate=maxdate,
+                    datetype=parsed_args.date_type,
+                )
 
-        if not company_articles:
-            logger.warning("No articles with pharmaceutical company affiliations found")
-            return 0
+            new_pmids: Set[str] = set()
 
-        # Output results
-        output_handler.output_results(company_articles, parsed_args.file)
+            def unseen(articles: List["Article"]) -> List["Article"]:
+                """Keep the articles not emitted before."""
+                articles = [
+                    article for article in articles if article.pmid not in emitted
+                ]
+                new_pmids.update(article.pmid for article in articles)
+                return articles
 
+            if not len(search_result):
+                logger.warning("No results found for query")
+            else:
+                # Fetch, parse and filter one efetch batch at a time so memory
+                # stays flat and results reach the output as each batch arrives
+                if checkpointed and checkpoint is None:
+                    checkpoint = Checkpoint(
+                        journal,
+                        parsed_args.query,
+                        parsed_args.file,
+                        parsed_args.format,
+                        search_result,
+                    )
+                if checkpoint is not None:
+                    checkpoint.begin()
+                    # A fresh run pages the history server like any other;
+                    # only a resumed one, whose WebEnv may have expired,
+                    # falls back to fetching by ID
+                    source = search_result
+                    if checkpoint.resumed:
+                        source = checkpoint.resume_from()
+                    raw = pubmed_client.iter_raw_details(
+                        source, checkpoint.done, checkpoint.ends
+                    )
+                else:
+                    raw = pubmed_client.iter_raw_details(search_result)
+                parsed = parse_pool.imap(raw)
+                if store is not None:
+                    parsed = store.store_batches(parsed, parsed_args.query)
+                batches = (unseen(articles) for articles in parsed)
+
+                # Output results
+                resumed = checkpoint is not None and checkpoint.resumed
+                try:
+                    written = output_handler.stream_results(
+                        batches,
+                        parsed_args.file,
+                        append=parsed_args.incremental or resumed,
+                        output_format=parsed_args.format,
+                        on_batch=checkpoint.batch_written if checkpoint else None,
+                    )
+                finally:
+                    if checkpoint is not None:
+                        checkpoint.close()
+                if checkpoint is not None:
+                    # Count the articles written before an interruption too
+                    written = checkpoint.rows
+                    checkpoint.finish()
+                if not written:
+                    logger.warning(
+                        "No articles with pharmaceutical company affiliations found"
+                    )
+
+            if state:
+                state.record(parsed_args.query, run_date, new_pmids)
+                state.save()
+
+        if parsed_args.affiliation_cache:
+            affiliation_cache.save(parsed_args.affiliation_cache, parser.rules_version)
+
+        logger.debug(f"E-utilities traffic: {pubmed_client.stats}")
+        logger.debug(
+            f"Affiliation cache: {affiliation_cache.hit_rate:.1%} hit rate "
+            f"over {affiliation_cache.hits + affiliation_cache.misses} lookups"
+        )
+        if article_cache and search_cache:
+            logger.debug(
+                f"Article cache: {article_cache.hits} hits, "
+                f"{article_cache.misses} misses; "
+                f"search cache: {search_cache.hits} hits, {search_cache.misses} misses"
+            )
         return 0
     except Exception as e:
         logger.error(f"Error: {e}")
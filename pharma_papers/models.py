@@ -0,0 +1,38 @@
+"""Data structures shared by the parser, analyzer and output handler."""
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Optional, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """A parsed PubMed article with its company-affiliation details.
+
+    Slotted and tuple-backed, so tens of thousands of records stay small.
+    Mapping-style ``article["pmid"]`` and ``article.get("pmid")`` keep
+    working for code written against the earlier dictionary records.
+    """
+
+    pmid: str
+    title: str
+    publication_date: str
+    authors: Tuple[str, ...] = ()
+    non_academic_authors: Tuple[str, ...] = ()
+    company_affiliations: Tuple[str, ...] = ()
+    corresponding_email: Optional[str] = None
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in ARTICLE_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return a field by name, or ``default`` if there is no such field."""
+        return getattr(self, key) if key in ARTICLE_FIELDS else default
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the fields as a plain dictionary."""
+        return asdict(self)
+
+
+ARTICLE_FIELDS = frozenset(field.name for field in fields(Article))
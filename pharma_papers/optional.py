@@ -0,0 +1,28 @@
+"""Module for importing optional dependencies on first use."""
+
+import importlib
+from typing import Any
+
+
+def import_optional(module: str, feature: str, extra: str) -> Any:
+    """
+    Import an optional dependency, naming the extra that provides it.
+
+    Args:
+        module: Module to import, e.g. ``pyarrow``
+        feature: What needs it, for the error message
+        extra: Package extra that installs it
+
+    Returns:
+        The imported module
+
+    Raises:
+        ImportError: The module is not installed
+    """
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ImportError(
+            f"{feature} requires {module}; install it with "
+            f"`pip install pharma-papers-rithik01[{extra}]`"
+        ) from e
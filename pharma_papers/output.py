@@ -1,16 +1,56 @@
 """Module for handling output of PubMed search results."""
 
 import csv
+import functools
+import importlib
+import json
 import logging
+import os
 import sys
-from typing import Dict, List, Optional, TextIO
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TextIO,
+    Tuple,
+    Union,
+)
 
-import pandas as pd
-from pandas import DataFrame
+from pharma_papers.models import Article
+from pharma_papers.optional import import_optional
+
+if TYPE_CHECKING:
+    from pandas import DataFrame
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+CSV_COLUMNS = [
+    "PubmedID",
+    "Title",
+    "Publication Date",
+    "Non-academic Author(s)",
+    "Company Affiliation(s)",
+    "Corresponding Author Email",
+]
+
+# Extra column of a tagged (multi-query) output
+QUERIES_COLUMN = "Queries"
+
+ArticleLike = Union[Article, Dict[str, Any]]
+
+# Rows are buffered in memory and only hit the disk on flush or when this fills
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
+COLUMNAR_FORMATS = ("parquet", "arrow", "feather")
+OUTPUT_FORMATS = ("csv", "jsonl", *COLUMNAR_FORMATS)
+
 class OutputHandler:
     """Handler for outputting PubMed search results."""
     
@@ -27,51 +67,311 @@ class OutputHandler:
 
     def output_results(
         self, 
-        articles: List[Dict[str, str]], 
+        articles: List[ArticleLike], 
         output_file: Optional[str] = None
     ) -> None:
         """
         Output the results to CSV file or stdout.
         
         Args:
-            articles: List of article dictionaries
+            articles: List of articles (or article dictionaries)
             output_file: Optional path to output file
         """
         if not articles:
             logger.warning("No articles to output")
             return
 
-        # Prepare data for CSV
-        data: List[Dict[str, str]] = []
-        for article in articles:
-            try:
-                row = {
-                    "PubmedID": str(article.get("pmid", "")),
-                    "Title": str(article.get("title", "")).strip(),
-                    "Publication Date": str(article.get("publication_date", "")),
-                    "Non-academic Author(s)": "; ".join(
-                        [str(a) for a in article.get("non_academic_authors", [])]
-                    ),
-                    "Company Affiliation(s)": "; ".join(
-                        [str(c) for c in article.get("company_affiliations", [])]
-                    ),
-                    "Corresponding Author Email": str(article.get("corresponding_email", ""))
-                }
-                data.append(row)
-            except Exception as e:
-                logger.error(f"Error formatting article {article.get('pmid')}: {e}")
-                continue
-
-        # Output results
+        self.stream_results([articles], output_file)
+
+    def to_dataframe(self, articles: List[ArticleLike]) -> "DataFrame":
+        """
+        Build a pandas DataFrame with the CSV columns.
+
+        pandas is an optional dependency, installed with the ``dataframe``
+        extra, and is only imported here.
+
+        Args:
+            articles: List of articles (or article dictionaries)
+
+        Returns:
+            One row per well-formed article
+        """
+        pd = import_optional("pandas", "DataFrame export", "dataframe")
+        rows = [row for row in map(self._format_row, articles) if row is not None]
+        return pd.DataFrame(rows, columns=CSV_COLUMNS)
+
+    def stream_results(
+        self,
+        batches: Iterable[Sequence[ArticleLike]],
+        output_file: Optional[str] = None,
+        append: bool = False,
+        output_format: str = "csv",
+        tags: Optional[Mapping[str, Sequence[str]]] = None,
+        on_batch: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """
+        Write results incrementally, flushing after every batch.
+
+        CSV goes through csv.writer. JSON Lines writes one object per
+        article, keeping the author and company fields as arrays. The
+        columnar formats are described in :meth:`_stream_columnar`. The
+        output file is only created once the first row is ready, so an
+        empty stream leaves no file behind.
+
+        Args:
+            batches: Iterable of article lists, e.g. one list per efetch batch
+            output_file: Optional path to output file
+            append: Add rows to an existing output file instead of replacing it
+            output_format: One of OUTPUT_FORMATS
+            tags: Queries each PMID matched; when given, every format gains
+                a queries field listing them
+            on_batch: Called once every batch is flushed, even an empty one,
+                with the articles written so far and the size of the output
+                file; CSV and JSON Lines only
+
+        Returns:
+            Number of articles written
+        """
+        if output_format in COLUMNAR_FORMATS:
+            if on_batch is not None:
+                raise ValueError(f"{output_format} output cannot report progress")
+            return self._stream_columnar(
+                batches, output_file, append, output_format, tags
+            )
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+
+        format_row = functools.partial(
+            self._format_json if output_format == "jsonl" else self._format_row,
+            tags=tags,
+        )
+        header = CSV_COLUMNS if tags is None else [*CSV_COLUMNS, QUERIES_COLUMN]
+        stream: Optional[TextIO] = None
+        writer: Optional[Any] = None
+        written = 0
+
         try:
-            df: DataFrame = pd.DataFrame(data)
-            if output_file:
-                df.to_csv(output_file, index=False, encoding='utf-8')
-                logger.info(f"Successfully wrote {len(data)} articles to {output_file}")
-            else:
-                df.to_csv(sys.stdout, index=False)
-                logger.info(f"Displayed {len(data)} articles in stdout")
-                
+            for articles in batches:
+                rows: List[Any] = [
+                    row for row in map(format_row, articles) if row is not None
+                ]
+                if rows and stream is None:
+                    has_header = (
+                        append
+                        and output_file is not None
+                        and os.path.exists(output_file)
+                        and os.path.getsize(output_file) > 0
+                    )
+                    stream = (
+                        open(
+                            output_file,
+                            "a" if append else "w",
+                            buffering=OUTPUT_BUFFER_SIZE,
+                            newline="",
+                            encoding="utf-8",
+                        )
+                        if output_file
+                        else sys.stdout
+                    )
+                    if output_format == "csv":
+                        writer = csv.writer(stream, lineterminator="\n")
+                        if not has_header:
+                            writer.writerow(header)
+                if writer is not None:
+                    writer.writerows(rows)
+                elif stream is not None:
+                    stream.writelines(rows)
+                written += len(rows)
+                # Flush per batch so rows are on disk even if a later fetch fails
+                if rows and stream is not None:
+                    stream.flush()
+                    logger.debug(f"Flushed {written} articles so far")
+                if on_batch is not None:
+                    # Until the first row, a file being replaced still has old rows
+                    size = 0
+                    if (
+                        output_file
+                        and (stream is not None or append)
+                        and os.path.exists(output_file)
+                    ):
+                        size = os.path.getsize(output_file)
+                    on_batch(written, size)
+        finally:
+            if stream is not None and stream is not sys.stdout:
+                stream.close()
+
+        if written and output_file:
+            logger.info(f"Successfully wrote {written} articles to {output_file}")
+        elif written:
+            logger.info(f"Displayed {written} articles in stdout")
+        return written
+
+    def _stream_columnar(
+        self,
+        batches: Iterable[Sequence[ArticleLike]],
+        output_file: Optional[str],
+        append: bool,
+        output_format: str,
+        tags: Optional[Mapping[str, Sequence[str]]] = None
+    ) -> int:
+        """
+        Write results as Parquet or Arrow IPC with pyarrow.
+
+        Author and company columns are list-typed rather than joined text.
+        Each non-empty batch becomes one Parquet row group or one Arrow
+        record batch; the file is only readable once the footer is written
+        at the end of the stream.
+
+        Args:
+            batches: Iterable of article lists, e.g. one list per efetch batch
+            output_file: Path to output file
+            append: Must be False; these formats cannot be appended to
+            output_format: One of COLUMNAR_FORMATS
+            tags: Queries each PMID matched, added as a list-typed column
+
+        Returns:
+            Number of articles written
+        """
+        if output_format not in COLUMNAR_FORMATS:
+            raise ValueError(f"Unknown output format: {output_format}")
+        if not output_file:
+            raise ValueError(f"{output_format} output needs an output file")
+        if append:
+            raise ValueError(f"{output_format} files cannot be appended to")
+
+        pa = import_optional("pyarrow", f"{output_format} output", "arrow")
+        schema = _arrow_schema(pa, tagged=tags is not None)
+        format_record = functools.partial(self._format_record, tags=tags)
+        writer: Optional[Any] = None
+        written = 0
+
+        try:
+            for articles in batches:
+                records = [
+                    record
+                    for record in map(format_record, articles)
+                    if record is not None
+                ]
+                if not records:
+                    continue
+                columns = zip(schema.names, zip(*records))
+                table = pa.Table.from_pydict(
+                    {name: list(values) for name, values in columns}, schema=schema
+                )
+                if writer is None:
+                    writer = _open_columnar_writer(
+                        pa, schema, output_file, output_format
+                    )
+                writer.write_table(table)
+                written += len(records)
+                logger.debug(f"Wrote {written} articles so far")
+        finally:
+            if writer is not None:
+                writer.close()
+
+        if written:
+            logger.info(f"Successfully wrote {written} articles to {output_file}")
+        return written
+
+    def _format_record(
+        self,
+        article: ArticleLike,
+        tags: Optional[Mapping[str, Sequence[str]]] = None
+    ) -> Optional[Tuple[Any, ...]]:
+        """Convert an article into a typed columnar record, or None if malformed."""
+        try:
+            email = article.get("corresponding_email")
+            record = (
+                str(article.get("pmid", "")),
+                str(article.get("title", "")).strip(),
+                str(article.get("publication_date", "")),
+                [str(a) for a in article.get("non_academic_authors", [])],
+                [str(c) for c in article.get("company_affiliations", [])],
+                None if email is None else str(email),
+            )
+            if tags is None:
+                return record
+            return (*record, list(tags.get(record[0], ())))
+        except Exception as e:
+            logger.error(f"Error formatting article {article.get('pmid')}: {e}")
+            return None
+
+    def _format_json(
+        self,
+        article: ArticleLike,
+        tags: Optional[Mapping[str, Sequence[str]]] = None
+    ) -> Optional[str]:
+        """Convert an article into one JSON Lines record, or None if malformed."""
+        try:
+            email = article.get("corresponding_email")
+            record: Dict[str, Any] = {
+                "pmid": str(article.get("pmid", "")),
+                "title": str(article.get("title", "")).strip(),
+                "publication_date": str(article.get("publication_date", "")),
+                "authors": [str(a) for a in article.get("authors", [])],
+                "non_academic_authors": [
+                    str(a) for a in article.get("non_academic_authors", [])
+                ],
+                "company_affiliations": [
+                    str(c) for c in article.get("company_affiliations", [])
+                ],
+                "corresponding_email": None if email is None else str(email),
+            }
+            if tags is not None:
+                record["queries"] = list(tags.get(record["pmid"], ()))
+            return json.dumps(record, ensure_ascii=False) + "\n"
         except Exception as e:
-            logger.error(f"Failed to output results: {e}")
-            raise
\ No newline at end of file
+            logger.error(f"Error formatting article {article.get('pmid')}: {e}")
+            return None
+
+    def _format_row(
+        self,
+        article: ArticleLike,
+        tags: Optional[Mapping[str, Sequence[str]]] = None
+    ) -> Optional[Tuple[str, ...]]:
+        """Convert an article into a CSV_COLUMNS-ordered row, or None if malformed."""
+        try:
+            row = (
+                str(article.get("pmid", "")),
+                str(article.get("title", "")).strip(),
+                str(article.get("publication_date", "")),
+                "; ".join([str(a) for a in article.get("non_academic_authors", [])]),
+                "; ".join([str(c) for c in article.get("company_affiliations", [])]),
+                str(article.get("corresponding_email", ""))
+            )
+            if tags is None:
+                return row
+            return (*row, "; ".join(tags.get(row[0], ())))
+        except Exception as e:
+            logger.error(f"Error formatting article {article.get('pmid')}: {e}")
+            return None
+
+
+def _arrow_schema(pa: Any, tagged: bool = False) -> Any:
+    """Return the pyarrow schema of the columnar formats."""
+    fields = [
+        ("pmid", pa.string()),
+        ("title", pa.string()),
+        ("publication_date", pa.string()),
+        ("non_academic_authors", pa.list_(pa.string())),
+        ("company_affiliations", pa.list_(pa.string())),
+        ("corresponding_email", pa.string()),
+    ]
+    if tagged:
+        fields.append(("queries", pa.list_(pa.string())))
+    return pa.schema(fields)
+
+
+def _open_columnar_writer(
+    pa: Any, schema: Any, output_file: str, output_format: str
+) -> Any:
+    """Open a pyarrow writer with a ``write_table``/``close`` interface."""
+    if output_format == "parquet":
+        parquet = importlib.import_module("pyarrow.parquet")
+        return parquet.ParquetWriter(output_file, schema, compression="zstd")
+    # Feather v2 is the Arrow IPC file format; plain arrow files stay
+    # uncompressed so readers can memory-map them
+    compression = "lz4" if output_format == "feather" else None
+    return pa.ipc.new_file(
+        output_file, schema, options=pa.ipc.IpcWriteOptions(compression=compression)
+    )
@@ -0,0 +1,224 @@
+"""Module for parsing efetch batches and local XML files on worker processes."""
+
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+)
+
+from pharma_papers.affiliations import AffiliationAnalyzer
+from pharma_papers.cache import LRUCache
+from pharma_papers.models import Article
+from pharma_papers.parser import PubMedParser
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class ParsedFile(NamedTuple):
+    """What parsing one local PubMed XML file produced."""
+
+    path: str
+    articles: List[Article]
+    pmids: List[str]
+    deleted: List[str]
+
+
+def _company_articles(
+    parser: PubMedParser, analyzer: AffiliationAnalyzer, raw: bytes
+) -> List[Article]:
+    """Parse one efetch batch, keeping company-affiliated articles."""
+    return [
+        article
+        for article in parser.parse_xml(raw)
+        if analyzer.is_company_affiliated(article)
+    ]
+
+
+def _company_articles_in_file(
+    parser: PubMedParser, analyzer: AffiliationAnalyzer, path: str
+) -> ParsedFile:
+    """Parse one local XML file, keeping company-affiliated articles."""
+    pmids: List[str] = []
+    deleted: List[str] = []
+    articles = [
+        article
+        for article in parser.parse_file(path, pmids, deleted)
+        if analyzer.is_company_affiliated(article)
+    ]
+    return ParsedFile(path, articles, pmids, deleted)
+
+
+class _WorkerResult(NamedTuple):
+    """A worker's parse result plus what its affiliation memo learned."""
+
+    value: Any
+    added: List[Tuple[Hashable, Any]]
+    hits: int
+    misses: int
+
+
+class _WorkerCache(LRUCache):
+    """A worker's affiliation memo, collecting new entries for the parent."""
+
+    def __init__(self, seed: LRUCache) -> None:
+        super().__init__(seed.maxsize)
+        for key, value in seed.items():
+            super().put(key, value)
+        self.added: List[Tuple[Hashable, Any]] = []
+
+    def put(self, key: Hashable, value: Any) -> None:
+        super().put(key, value)
+        self.added.append((key, value))
+
+    def report(self, value: Any) -> _WorkerResult:
+        """Wrap a task's result with the memo activity since the last report."""
+        result = _WorkerResult(value, self.added, self.hits, self.misses)
+        self.added = []
+        self.hits = self.misses = 0
+        return result
+
+
+# Per-process copies of the caller's parser and analyzer, set by _init_worker
+_worker_parser: Optional[PubMedParser] = None
+_worker_analyzer: Optional[AffiliationAnalyzer] = None
+_worker_cache: Optional[_WorkerCache] = None
+
+
+def _init_worker(parser: PubMedParser, analyzer: AffiliationAnalyzer) -> None:
+    """Keep the caller's parser and analyzer for every batch of this worker."""
+    global _worker_parser, _worker_analyzer, _worker_cache
+    # Starts warm with the caller's memo entries, e.g. a loaded cache file
+    _worker_cache = _WorkerCache(parser.affiliation_cache)
+    parser.affiliation_cache = _worker_cache
+    _worker_parser = parser
+    _worker_analyzer = analyzer
+
+
+def _parse_in_worker(raw: bytes) -> _WorkerResult:
+    """Parse one efetch batch in a worker process."""
+    assert _worker_parser is not None and _worker_analyzer is not None
+    assert _worker_cache is not None
+    return _worker_cache.report(
+        _company_articles(_worker_parser, _worker_analyzer, raw)
+    )
+
+
+def _parse_file_in_worker(path: str) -> _WorkerResult:
+    """Parse one local XML file in a worker process."""
+    assert _worker_parser is not None and _worker_analyzer is not None
+    assert _worker_cache is not None
+    return _worker_cache.report(
+        _company_articles_in_file(_worker_parser, _worker_analyzer, path)
+    )
+
+
+class ParsePool:
+    """Parse efetch batches or files into company-affiliated articles, in order."""
+
+    def __init__(
+        self,
+        parser: PubMedParser,
+        analyzer: AffiliationAnalyzer,
+        workers: int = 1,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            parser: Parser used when parsing in-process
+            analyzer: Analyzer used when parsing in-process
+            workers: Number of parsing processes; 1 parses in the calling
+                process. Worker processes get copies of ``parser`` and
+                ``analyzer``, and what their affiliation memos learn is
+                merged back into ``parser.affiliation_cache``, hit counts
+                included.
+        """
+        self.parser = parser
+        self.analyzer = analyzer
+        self.workers = max(1, workers)
+
+    def imap(self, batches: Iterable[bytes]) -> Iterator[List[Article]]:
+        """
+        Parse raw efetch batches lazily.
+
+        Worker processes receive the raw XML bytes and send back Article
+        records, so nothing larger than the response crosses the process
+        boundary. Up to two batches per worker are queued while the
+        input keeps being consumed, e.g. while later batches download.
+
+        Args:
+            batches: Raw efetch XML documents
+
+        Yields:
+            The company-affiliated articles of each batch, in input order
+        """
+        return self._map(_company_articles, _parse_in_worker, batches)
+
+    def imap_files(self, paths: Iterable[str]) -> Iterator[ParsedFile]:
+        """
+        Parse local PubMed XML files lazily, one file per task.
+
+        Workers open and decompress the files themselves, so only file
+        names and the resulting records cross the process boundary.
+
+        Args:
+            paths: ``.xml`` or ``.xml.gz`` files, e.g. PubMed baseline files
+
+        Yields:
+            The parse result of each file, in input order
+        """
+        return self._map(_company_articles_in_file, _parse_file_in_worker, paths)
+
+    def _map(
+        self,
+        in_process: Callable[[PubMedParser, AffiliationAnalyzer, Any], Any],
+        in_worker: Callable[[Any], Any],
+        items: Iterable[Any],
+    ) -> Iterator[Any]:
+        """Apply a parse function to each item, in-process or on the workers."""
+        if self.workers == 1:
+            for item in items:
+                yield in_process(self.parser, self.analyzer, item)
+            return
+
+        pending: Deque[Future] = deque()
+        # Batches usually come from iter_raw_details, whose fetch threads are
+        # already running; forking a threaded process can deadlock a child
+        # on a lock some other thread held, so workers are spawned afresh
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.parser, self.analyzer),
+        ) as executor:
+            try:
+                for item in items:
+                    pending.append(executor.submit(in_worker, item))
+                    if len(pending) >= 2 * self.workers:
+                        yield self._merge(pending.popleft().result())
+                while pending:
+                    yield self._merge(pending.popleft().result())
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _merge(self, result: _WorkerResult) -> Any:
+        """Fold a worker's memo activity into the caller's affiliation cache."""
+        cache = self.parser.affiliation_cache
+        cache.hits += result.hits
+        cache.misses += result.misses
+        for key, value in result.added:
+            cache.put(key, value)
+        return result.value
@@ -1,19 +1,158 @@
 """Module for parsing PubMed API results."""
 
+import gzip
+import hashlib
+import io
+import itertools
+import json
 import logging
 import re
+import sys
+import xml.etree.ElementTree as ET
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from pharma_papers.affiliations import AffiliationClassifier
+from pharma_papers.cache import LRUCache
+from pharma_papers.models import Article
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Patterns for company names, tried in order
+COMPANY_NAME_PATTERNS = (
+    r'([A-Z][A-Za-z0-9\s&-]+)\s+(?:Pharma|Pharmaceuticals|Biotech|Therapeutics|Inc\.?|LLC|Ltd\.?|GmbH)',
+    r'([A-Z][A-Za-z0-9\s&-]+)(?:,\s+Inc\.?|,\s+LLC|,\s+Ltd\.?|,\s+GmbH)'
+)
+
+def iter_pubmed_xml(
+    source: Union[bytes, BinaryIO, io.BufferedIOBase],
+    deleted: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream compact article records out of efetch XML.
+
+    Unlike Entrez.read, which builds the full tree of every field, this
+    only picks out the PMID, title, publication date and authors with their
+    affiliations, and clears each PubmedArticle once read. The records keep
+    Entrez.read's key layout, so PubMedParser accepts them unchanged.
+
+    Args:
+        source: Raw efetch response or PubMed baseline/update file, as bytes
+            or a binary file object
+        deleted: If given, the PMIDs of DeleteCitation entries (found in
+            update files) are appended to it
+
+    Yields:
+        One minimal Entrez-shaped dictionary per PubmedArticle
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end":
+            continue
+        if elem.tag == "DeleteCitation":
+            if deleted is not None:
+                deleted.extend(pmid.text or "" for pmid in elem.iterfind("PMID"))
+            elem.clear()
+            continue
+        if elem.tag != "PubmedArticle":
+            continue
+
+        citation = elem.find("MedlineCitation")
+        if citation is not None:
+            article = citation.find("Article")
+            pub_date = {}
+            authors = []
+            title = ""
+            if article is not None:
+                title = _inner_text(article.find("ArticleTitle"))
+                date_elem = article.find("Journal/JournalIssue/PubDate")
+                if date_elem is not None:
+                    pub_date = {child.tag: child.text or "" for child in date_elem}
+                for author in article.iterfind("AuthorList/Author"):
+                    record: Dict[str, Any] = {
+                        child.tag: child.text or ""
+                        for child in author
+                        if child.tag in ("LastName", "ForeName", "Initials")
+                    }
+                    record["AffiliationInfo"] = [
+                        {"Affiliation": _inner_text(affiliation)}
+                        for affiliation in author.iterfind("AffiliationInfo/Affiliation")
+                    ]
+                    authors.append(record)
+
+            yield {
+                "MedlineCitation": {
+                    "PMID": citation.findtext("PMID", ""),
+                    "Article": {
+                        "ArticleTitle": title,
+                        "Journal": {"JournalIssue": {"PubDate": pub_date}},
+                        "AuthorList": authors,
+                    },
+                }
+            }
+
+        elem.clear()
+        root.clear()
+
+
+def _inner_text(elem: Optional[ET.Element]) -> str:
+    """Return an element's content, keeping inline markup like Entrez.read."""
+    if elem is None:
+        return ""
+    # Character data stays unescaped; only the inline tags are written back
+    parts = [elem.text or ""]
+    for child in elem:
+        attrs = "".join(f' {key}="{value}"' for key, value in child.attrib.items())
+        parts += [f"<{child.tag}{attrs}>", _inner_text(child), f"</{child.tag}>"]
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
 class PubMedParser:
     """Parser for PubMed API results."""
 
-    def parse_articles(self, records: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Parse PubMed records into article dictionaries."""
-        articles = []
+    def __init__(
+        self,
+        classifier: Optional[AffiliationClassifier] = None,
+        affiliation_cache: Optional[LRUCache] = None
+    ) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            classifier: Compiled affiliation classifier (shared if given)
+            affiliation_cache: Memo of per-affiliation results; the same
+                affiliation strings recur across thousands of articles
+        """
+        self.classifier = classifier or AffiliationClassifier()
+        self.affiliation_cache = (
+            affiliation_cache if affiliation_cache is not None else LRUCache()
+        )
+
+    @property
+    def rules_version(self) -> str:
+        """
+        Digest of the keywords and patterns behind the memoized results.
+
+        A saved affiliation cache is only reused under the same digest, so
+        classifications made by older heuristics are never served.
+        """
+        rules = [
+            sorted(self.classifier.academic_keywords),
+            sorted(self.classifier.company_keywords),
+            list(COMPANY_NAME_PATTERNS),
+        ]
+        return hashlib.sha256(json.dumps(rules).encode("utf-8")).hexdigest()[:16]
+
+    def parse_articles(self, records: Dict[str, Any]) -> List[Article]:
+        """Parse PubMed records into articles."""
+        articles: List[Article] = []
         
         if not records.get('PubmedArticle'):
             logger.warning("No PubmedArticle found in records")
@@ -31,7 +170,54 @@ class PubMedParser:
                 
         return articles
 
-    def _extract_article_info(self, article: Dict) -> Optional[Dict]:
+    def parse_xml(
+        self, source: Union[bytes, BinaryIO, io.BufferedIOBase]
+    ) -> List[Article]:
+        """Parse raw efetch XML with the lightweight streaming parser."""
+        return self.parse_articles({'PubmedArticle': list(iter_pubmed_xml(source))})
+
+    def parse_file(
+        self,
+        path: str,
+        pmids: Optional[List[str]] = None,
+        deleted: Optional[List[str]] = None,
+        chunk_size: int = 1000
+    ) -> List[Article]:
+        """
+        Parse a local PubMed XML file, such as a gzip'd baseline file.
+
+        The file is decompressed and parsed as a stream, ``chunk_size``
+        records at a time, so memory stays flat whatever its size.
+
+        Args:
+            path: ``.xml`` or ``.xml.gz`` file
+            pmids: If given, the PMID of every article in the file is
+                appended to it, company-affiliated or not
+            deleted: If given, PMIDs the file deletes are appended to it
+            chunk_size: Records parsed at a time
+
+        Returns:
+            The company-affiliated articles of the file
+        """
+        opener = gzip.open if path.endswith(".gz") else open
+        articles: List[Article] = []
+        with opener(path, 'rb') as stream:
+            records = iter_pubmed_xml(stream, deleted)
+            while True:
+                chunk = list(itertools.islice(records, chunk_size))
+                if not chunk:
+                    break
+                if pmids is not None:
+                    pmids.extend(r['MedlineCitation']['PMID'] for r in chunk)
+                articles.extend(self.parse_articles({'PubmedArticle': chunk}))
+        return articles
+
+    def iter_articles(self, batches: Iterable[Dict[str, Any]]) -> Iterator[Article]:
+        """Parse a stream of efetch record batches, yielding articles as they arrive."""
+        for records in batches:
+            yield from self.parse_articles(records)
+
+    def _extract_article_info(self, article: Dict) -> Optional[Article]:
         """Extract relevant information from a PubMed article."""
         try:
             medline_citation = article.get('MedlineCitation', {})
@@ -51,15 +237,15 @@ class PubMedParser:
             if not company_affiliations:
                 return None
                 
-            return {
-                'pmid': pmid,
-                'title': title,
-                'publication_date': pub_date,
-                'authors': authors,
-                'non_academic_authors': non_academic_authors,
-                'company_affiliations': company_affiliations,
-                'corresponding_email': corresponding_email
-            }
+            return Article(
+                pmid=pmid,
+                title=title,
+                publication_date=pub_date,
+                authors=tuple(authors),
+                non_academic_authors=tuple(non_academic_authors),
+                company_affiliations=tuple(company_affiliations),
+                corresponding_email=corresponding_email
+            )
         except Exception as e:
             logger.error(f"Error extracting article info: {e}")
             return None
@@ -120,12 +306,13 @@ class PubMedParser:
                             if email_match := re.search(r'[\w\.-]+@[\w\.-]+', affil_text):
                                 corresponding_email = email_match.group(0)
                 
-                # Check for company affiliation
-                is_non_academic = any(self._is_company_affiliation(affil) for affil in affiliations)
+                # Check for company affiliation, one memo lookup per affiliation
+                entries = [self._affiliation_entry(affil) for affil in affiliations]
+                is_non_academic = any(entry['company'] for entry in entries)
                 if is_non_academic:
                     non_academic_authors.append(author_name)
-                    for affil in affiliations:
-                        if company_name := self._extract_company_name(affil):
+                    for affil, entry in zip(affiliations, entries):
+                        if company_name := self._extract_company_name(affil, entry):
                             if company_name not in company_affiliations:
                                 company_affiliations.append(company_name)
             except Exception as e:
@@ -136,37 +323,39 @@ class PubMedParser:
 
     def _is_company_affiliation(self, affiliation: str) -> bool:
         """Check if affiliation is from a pharmaceutical/biotech company."""
-        affiliation_lower = affiliation.lower()
-        
-        # Academic indicators (negative)
-        academic_keywords = {
-            'university', 'college', 'institute', 'school', 'hospital',
-            'medical center', 'clinic', 'foundation', 'academy'
-        }
-        
-        # Company indicators (positive)
-        company_keywords = {
-            'pharma', 'pharmaceutical', 'biotech', 'therapeutics',
-            'inc.', 'llc', 'ltd', 'gmbh', 'biosciences', 'laboratories'
-        }
-        
-        has_company = any(kw in affiliation_lower for kw in company_keywords)
-        has_academic = any(kw in affiliation_lower for kw in academic_keywords)
-        
-        return has_company and not has_academic
+        company: bool = self._affiliation_entry(affiliation)['company']
+        return company
 
-    def _extract_company_name(self, affiliation: str) -> Optional[str]:
+    def _extract_company_name(
+        self, affiliation: str, entry: Optional[Dict[str, Any]] = None
+    ) -> Optional[str]:
+        """Extract company name from affiliation string (memoized).
+
+        Pass the memo entry if it was already looked up, so the lookup is
+        not counted twice in the cache statistics.
+        """
+        if entry is None:
+            entry = self._affiliation_entry(affiliation)
+        if 'name' not in entry:
+            entry['name'] = self._match_company_name(affiliation)
+        name: Optional[str] = entry['name']
+        return name
+
+    def _affiliation_entry(self, affiliation: str) -> Dict[str, Any]:
+        """Return the memo entry of an affiliation, classifying it on a miss."""
+        entry: Optional[Dict[str, Any]] = self.affiliation_cache.get(affiliation)
+        if entry is None:
+            entry = {'company': self.classifier.is_company(affiliation)}
+            self.affiliation_cache.put(affiliation, entry)
+        return entry
+
+    def _match_company_name(self, affiliation: str) -> Optional[str]:
         """Extract company name from affiliation string."""
         try:
-            # Pattern for company names
-            patterns = [
-                r'([A-Z][A-Za-z0-9\s&-]+)\s+(?:Pharma|Pharmaceuticals|Biotech|Therapeutics|Inc\.?|LLC|Ltd\.?|GmbH)',
-                r'([A-Z][A-Za-z0-9\s&-]+)(?:,\s+Inc\.?|,\s+LLC|,\s+Ltd\.?|,\s+GmbH)'
-            ]
-            
-            for pattern in patterns:
+            for pattern in COMPANY_NAME_PATTERNS:
                 if match := re.search(pattern, affiliation, re.IGNORECASE):
-                    return match.group(1).strip()
+                    # Interned, so every article naming a company shares one string
+                    return sys.intern(match.group(1).strip())
                     
             return None
         except Exception as e:
@@ -1,67 +1,630 @@
 """Module for interacting with the PubMed API."""
 
+import io
+import itertools
 import logging
+import threading
 import time
-from typing import Dict, List, Optional, Any
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
 
+import requests
 from Bio import Entrez
 
+from pharma_papers.cache import ArticleCache, SearchCache
+from pharma_papers.ratelimit import RateLimiter, RetryPolicy
+from pharma_papers.sizing import BatchSizer
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-class PubMedClient:
-    """Client for interacting with the PubMed API."""
+EUTILS_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"
+
+# Ask for compressed responses; efetch XML shrinks several times over
+ACCEPT_ENCODING = "gzip, deflate"
+
+# esearch never returns more than this many IDs in one response
+ESEARCH_MAX_IDS = 10000
+
+# Prolog used when reassembling cached articles into an efetch document
+PUBMED_PROLOG = (
+    b'<?xml version="1.0" ?>\n'
+    b'<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2025//EN"'
+    b' "https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">\n'
+)
+
+
+class FetchError(RuntimeError):
+    """A fetch that failed for good, carrying the records fetched before it."""
+
+    def __init__(self, message: str, partial: Dict[str, Any]) -> None:
+        super().__init__(message)
+        self.partial = partial
+
+
+@dataclass
+class SearchResult:
+    """Handle to an esearch result set kept on the NCBI history server."""
+
+    count: int
+    max_results: int
+    webenv: Optional[str] = None
+    query_key: Optional[str] = None
+    pmids: List[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Number of records to fetch: the hit count, capped at max_results."""
+        return min(self.count, self.max_results)
+
 
-    def __init__(self, email: str, api_key: Optional[str] = None) -> None:
+@dataclass(frozen=True)
+class RequestStats:
+    """Transfer counters of one E-utilities request, e.g. one efetch batch."""
+
+    endpoint: str
+    records: int  # Records asked for by an efetch, 0 for other requests
+    wire_bytes: int  # Bytes received, compressed as sent
+    body_bytes: int  # Bytes of the decoded response
+    seconds: float  # Latency of the attempt that succeeded
+    attempts: int
+
+
+class TransferStats:
+    """Thread-safe running totals of a client's requests, plus the latest ones."""
+
+    def __init__(self, history: int = 1000) -> None:
+        """
+        Start with empty counters.
+
+        Args:
+            history: Number of recent requests kept in ``recent``
+        """
+        self.requests = 0
+        self.records = 0
+        self.wire_bytes = 0
+        self.body_bytes = 0
+        self.seconds = 0.0
+        self.retries = 0
+        self.recent: Deque[RequestStats] = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def record(self, stats: RequestStats) -> None:
+        """Add a completed request to the counters."""
+        with self._lock:
+            self.requests += 1
+            self.records += stats.records
+            self.wire_bytes += stats.wire_bytes
+            self.body_bytes += stats.body_bytes
+            self.seconds += stats.seconds
+            self.retries += stats.attempts - 1
+            self.recent.append(stats)
+
+    @property
+    def compression_ratio(self) -> float:
+        """Decoded bytes per byte on the wire (1.0 before any request)."""
+        return self.body_bytes / self.wire_bytes if self.wire_bytes else 1.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests, {self.records} records, "
+            f"{self.body_bytes / 1e6:.1f} MB ({self.wire_bytes / 1e6:.1f} MB on "
+            f"the wire), {self.seconds:.1f}s, {self.retries} retries"
+        )
+
+
+class _EUtilsClient:
+    """Settings and request planning shared by the sync and async clients."""
+
+    def __init__(
+        self,
+        email: str,
+        api_key: Optional[str] = None,
+        max_workers: int = 1,
+        base_url: str = EUTILS_URL,
+        rate_limiter: Optional[RateLimiter] = None,
+        cache: Optional[ArticleCache] = None,
+        search_cache: Optional[SearchCache] = None,
+        retry: Optional[RetryPolicy] = None,
+        timeout: float = 60.0,
+        batch_size: Optional[int] = None,
+    ) -> None:
         """
         Initialize with rate limiting (3 requests/sec max without API key)
+
+        Args:
+            email: Contact address sent with every request, as NCBI requires
+            api_key: NCBI API key, raising the limit to 10 requests/sec
+            max_workers: Number of efetch batches kept in flight at once
+            base_url: E-utilities endpoint, overridable for testing
+            rate_limiter: Limiter shared by all requests (defaults to NCBI's ceiling)
+            cache: Article cache consulted before efetch, if any
+            search_cache: esearch memo consulted before searching, if any
+            retry: Backoff for throttled or failed requests (defaults to
+                RetryPolicy())
+            timeout: Seconds to wait for a response before retrying
+            batch_size: Fixed number of records per efetch; by default the
+                size adapts to observed response times and sizes
         """
         self.email = email
         self.api_key = api_key
-        Entrez.email = email
-        if api_key:
-            Entrez.api_key = api_key
-            self.delay = 0.1  # 10 requests/sec with API key
-        else:
-            self.delay = 0.34  # 3 requests/sec without key
-
-    def search(self, query: str, max_results: int = 10000) -> List[str]:
+        self.max_workers = max(1, max_workers)
+        self.base_url = base_url
+        self.rate_limiter = rate_limiter or RateLimiter(rate=10 if api_key else 3)
+        self.cache = cache
+        self.search_cache = search_cache
+        self.retry = retry or RetryPolicy()
+        self.timeout = timeout
+        self.stats = TransferStats()
+        self.sizer = (
+            BatchSizer(batch_size, batch_size, batch_size)
+            if batch_size
+            else BatchSizer()
+        )
+
+    def _search_params(
+        self,
+        query: str,
+        mindate: Optional[str],
+        maxdate: Optional[str],
+        datetype: str,
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return the search cache key of a search and its date range params."""
+        date_params = {}
+        if mindate or maxdate:
+            # esearch only applies a date range when both ends are given
+            date_params = {
+                "datetype": datetype,
+                "mindate": mindate or "1800/01/01",
+                "maxdate": maxdate or "3000/12/31",
+            }
+        return " ".join([query, *date_params.values()]), date_params
+
+    def _cached_search(
+        self, cache_key: str, max_results: int
+    ) -> Optional[SearchResult]:
+        """Return a memoized search result, if the search cache has one."""
+        if self.search_cache:
+            cached = self.search_cache.get(cache_key, max_results)
+            if cached is not None:
+                logger.debug(f"Search cache hit for {cache_key!r}")
+                return SearchResult(**cached)
+        return None
+
+    def _search_result(
+        self, record: Dict[str, Any], cache_key: str, max_results: int
+    ) -> SearchResult:
+        """Build a SearchResult from an esearch record and memoize it."""
+        result = SearchResult(
+            count=int(record.get("Count", 0)),
+            max_results=max_results,
+            webenv=record.get("WebEnv"),
+            query_key=record.get("QueryKey"),
+            pmids=[str(pmid) for pmid in record.get("IdList", [])],
+        )
+        if self.search_cache:
+            self.search_cache.put(cache_key, max_results, asdict(result))
+        return result
+
+    def _batches(
+        self, pmids: Union[SearchResult, List[str]], first: int = 0
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[List[str]], int]]:
+        """Yield each batch's efetch parameters, PMIDs if known, and end offset."""
+        # Each batch is sized when it is requested, from the responses so far
+        if isinstance(pmids, SearchResult) and pmids.webenv:
+            total = len(pmids)
+            start = first
+            while start < total:
+                size = min(self.sizer.next_size(), total - start)
+                known = pmids.pmids[start:start + size]
+                yield {
+                    "WebEnv": pmids.webenv,
+                    "query_key": pmids.query_key,
+                    "retstart": start,
+                    "retmax": size,
+                }, known if len(known) == size else None, start + size
+                start += size
+            return
+
+        ids = pmids.pmids if isinstance(pmids, SearchResult) else pmids
+        i = first
+        while i < len(ids):
+            batch = ids[i:i + self.sizer.next_size()]
+            yield {"id": ",".join(batch)}, batch, i + len(batch)
+            i += len(batch)
+
+    def _replan(self, endpoint: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Split a failed efetch request that no longer fits the batch size.
+
+        A timeout or server error shrinks the sizer; resending the same
+        oversized request would likely fail the same way, so its records
+        are divided into batches of the new size, as ``_batches`` would.
+
+        Returns:
+            The smaller requests to send instead, or an empty list if the
+            request should simply be retried
+        """
+        if endpoint != "efetch.fcgi":
+            return []
+        size = self.sizer.next_size()
+        if "retmax" in params:
+            start, count = int(params["retstart"]), int(params["retmax"])
+            if count <= size:
+                return []
+            return [
+                {**params, "retstart": i, "retmax": min(size, start + count - i)}
+                for i in range(start, start + count, size)
+            ]
+        ids = params["id"].split(",")
+        if len(ids) <= size:
+            return []
+        return [
+            {**params, "id": ",".join(ids[i:i + size])}
+            for i in range(0, len(ids), size)
+        ]
+
+    def _cached_articles(
+        self, params: Dict[str, Any], pmids: Optional[List[str]]
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, bytes]]:
+        """
+        Look a batch up in the article cache.
+
+        Returns:
+            The efetch parameters still to request (None if the cache has
+            every article) and the cached articles
+        """
+        cached = self.cache.get_many(pmids) if self.cache and pmids else {}
+        if not cached:
+            return params, cached
+        # Only ask the network for what the cache could not supply
+        missing = [pmid for pmid in pmids or [] if pmid not in cached]
+        return ({"id": ",".join(missing)} if missing else None), cached
+
+    def _merge_cached(
+        self, raw: bytes, pmids: Optional[List[str]], cached: Dict[str, bytes]
+    ) -> bytes:
+        """Cache the fetched articles and reassemble the batch in PMID order."""
+        if self.cache is None:
+            return raw
+        fetched = _split_articles(raw) if raw else {}
+        self.cache.put_many(fetched)
+        if not cached:
+            return raw
+
+        articles = {**cached, **fetched}
+        return _join_articles(
+            articles[pmid] for pmid in pmids or [] if pmid in articles
+        )
+
+    def _params(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Add the parameters every E-utilities request carries."""
+        params = {"db": "pubmed", **params, "tool": "pharma_papers", "email": self.email}
+        if endpoint == "efetch.fcgi":
+            params["retmode"] = "xml"
+        if self.api_key:
+            params["api_key"] = self.api_key
+        return params
+
+    def _record(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        wire_bytes: int,
+        body: bytes,
+        seconds: float,
+        attempts: int,
+    ) -> None:
+        """Count a completed request and log its size and latency."""
+        records = 0
+        if endpoint == "efetch.fcgi":
+            if "retmax" in params:
+                records = int(params["retmax"])
+            elif "id" in params:
+                records = params["id"].count(",") + 1
+        stats = RequestStats(
+            endpoint, records, wire_bytes, len(body), seconds, attempts
+        )
+        self.stats.record(stats)
+        if records:
+            self.sizer.observe(records, len(body), seconds)
+        logger.debug(
+            f"{endpoint}: {records} records, {len(body) / 1e3:.0f} kB "
+            f"({wire_bytes / 1e3:.0f} kB on the wire) in {seconds:.2f}s"
+        )
+
+    def _backoff(
+        self,
+        endpoint: str,
+        attempt: int,
+        error: Exception,
+        status: Optional[int] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ) -> float:
+        """
+        Decide how to retry a failed request.
+
+        Throttling (429), transient server errors, timeouts and dropped
+        connections (no status) are retried with jittered exponential
+        backoff, at least as long as any Retry-After header asks. A 429
+        pauses the shared rate limiter instead, so concurrent batches back
+        off together. Other efetch failures shrink the batch size, and the
+        caller re-plans the failed batch with :meth:`_replan`.
+
+        Returns:
+            Seconds the caller should sleep before its next attempt
+
+        Raises:
+            Exception: ``error``, if it is not retried
+        """
+        if status is not None and status not in self.retry.retry_statuses:
+            raise error
+        if endpoint == "efetch.fcgi" and status != 429:
+            # A slow or failing batch may simply be too big
+            self.sizer.failed()
+        if attempt >= self.retry.max_attempts:
+            raise error
+        delay = self.retry.delay(attempt, _retry_after(headers or {}))
+        logger.warning(
+            f"{endpoint} failed ({error}); retry {attempt} of "
+            f"{self.retry.max_attempts - 1} in {delay:.1f}s"
+        )
+        if status == 429:
+            # Throttled: hold back every request of this client, not just this one
+            self.rate_limiter.pause(delay)
+            return 0.0
+        return delay
+
+
+class PubMedClient(_EUtilsClient):
+    """Client for interacting with the PubMed API."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """
+        Initialize the client and its pooled keep-alive HTTP session.
+
+        Takes the arguments of :class:`_EUtilsClient`.
+        """
+        super().__init__(*args, **kwargs)
+        self.session = requests.Session()
+        self.session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+
+    def search(
+        self,
+        query: str,
+        max_results: int = 10000,
+        mindate: Optional[str] = None,
+        maxdate: Optional[str] = None,
+        datetype: str = "edat",
+    ) -> SearchResult:
+        """
+        Run esearch and keep the result set on the history server.
+
+        Args:
+            query: PubMed query string
+            max_results: Maximum number of records to fetch later; may exceed
+                esearch's own 10,000 ID limit since fetching pages the history
+            mindate: Earliest date (``YYYY/MM/DD``) to include, if any
+            maxdate: Latest date (``YYYY/MM/DD``) to include, if any
+            datetype: Date field the range applies to, e.g. ``edat`` or ``mdat``
+
+        Returns:
+            Handle carrying WebEnv, QueryKey, Count and the returned PMIDs
+        """
+        cache_key, date_params = self._search_params(query, mindate, maxdate, datetype)
+        cached = self._cached_search(cache_key, max_results)
+        if cached is not None:
+            return cached
+
         try:
-            handle = Entrez.esearch(
-                db="pubmed",
-                term=query,
-                retmax=max_results,
-                sort="relevance",
-                usehistory="y"  # Enable session caching
-            )
-            record = Entrez.read(handle)
-            handle.close()
-            time.sleep(self.delay)
-            return record.get("IdList", [])
+            record = self._read("esearch.fcgi", {
+                "term": query,
+                "retmax": min(max_results, ESEARCH_MAX_IDS),
+                "sort": "relevance",
+                "usehistory": "y",  # Enable session caching
+                **date_params
+            })
         except Exception as e:
             logger.error(f"Search failed: {e}")
             raise
+        return self._search_result(record, cache_key, max_results)
 
-    def fetch_details(self, pmids: List[str]) -> Dict[str, Any]:
+    def fetch_details(self, pmids: Union[SearchResult, List[str]]) -> Dict[str, Any]:
+        """
+        Fetch and merge the article details of every batch.
+
+        Raises:
+            FetchError: A batch still failed after retries; its ``partial``
+                holds the records of the batches fetched before it
+        """
+        all_records: Dict[str, Any] = {"PubmedArticle": []}
         try:
-            # Process in batches of 200 (NCBI's recommended max)
-            batch_size = 200
-            all_records = {"PubmedArticle": []}
-            
-            for i in range(0, len(pmids), batch_size):
-                batch = pmids[i:i + batch_size]
-                handle = Entrez.efetch(
-                    db="pubmed",
-                    id=",".join(batch),
-                    retmode="xml"
-                )
-                records = Entrez.read(handle)
-                handle.close()
-                if "PubmedArticle" in records:
-                    all_records["PubmedArticle"].extend(records["PubmedArticle"])
-                time.sleep(self.delay)
-                
-            return all_records
+            for records in self.iter_details(pmids):
+                all_records["PubmedArticle"].extend(records.get("PubmedArticle", []))
+        except requests.RequestException as e:
+            fetched = len(all_records["PubmedArticle"])
+            raise FetchError(
+                f"Fetch stopped after {fetched} articles: {e}", all_records
+            ) from e
+        return all_records
+
+    def iter_details(
+        self, pmids: Union[SearchResult, List[str]]
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch article details lazily, one efetch batch at a time.
+
+        Args:
+            pmids: Search handle or PubMed IDs to fetch
+
+        Yields:
+            The Entrez.read records of each batch, as soon as it arrives
+        """
+        for raw in self.iter_raw_details(pmids):
+            yield Entrez.read(io.BytesIO(raw))
+
+    def iter_raw_details(
+        self,
+        pmids: Union[SearchResult, List[str]],
+        start: int = 0,
+        ends: Optional[List[int]] = None,
+    ) -> Iterator[bytes]:
+        """
+        Fetch the efetch XML of each batch lazily, without parsing it.
+
+        A SearchResult is paged straight from the history server with
+        retstart/retmax; a plain list of PMIDs is sent in batches of IDs.
+        Up to ``max_workers`` batches are requested concurrently; the rate
+        limiter keeps the combined request rate under NCBI's ceiling and
+        batches are still yielded in PMID order.
+
+        Args:
+            pmids: Search handle or PubMed IDs to fetch
+            start: Offset of the first record to fetch, e.g. to resume a run
+            ends: If given, receives the offset each yielded batch ends at,
+                appended just before the batch is yielded
+
+        Yields:
+            A PubmedArticleSet document per batch, as soon as it arrives
+        """
+        pending: Deque[Tuple["Future[bytes]", int]] = deque()
+
+        def result() -> bytes:
+            future, end = pending.popleft()
+            raw = future.result()
+            if ends is not None:
+                ends.append(end)
+            return raw
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                for params, batch, end in self._batches(pmids, start):
+                    future = executor.submit(self._fetch_batch, params, batch)
+                    pending.append((future, end))
+                    if len(pending) >= self.max_workers:
+                        yield result()
+                while pending:
+                    yield result()
+            finally:
+                for future, _ in pending:
+                    future.cancel()
+
+    def _fetch_batch(
+        self, params: Dict[str, Any], pmids: Optional[List[str]]
+    ) -> bytes:
+        """Fetch the efetch XML for one batch, using the cache if any."""
+        try:
+            request, cached = self._cached_articles(params, pmids)
+            raw = self._request("efetch.fcgi", request) if request else b""
+            return self._merge_cached(raw, pmids, cached)
         except Exception as e:
             logger.error(f"Fetch failed: {e}")
-            raise
\ No newline at end of file
+            raise
+
+    def _read(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Call an E-utility and parse its XML response with Entrez.read."""
+        raw = self._request(endpoint, params)
+        record: Dict[str, Any] = Entrez.read(io.BytesIO(raw))
+        return record
+
+    def _request(self, endpoint: str, params: Dict[str, Any]) -> bytes:
+        """Call an E-utility under the rate limit, with retries; return the body."""
+        query = self._params(endpoint, params)
+        for attempt in itertools.count(1):
+            # Every attempt takes a token, so retries stay within NCBI's cap
+            self.rate_limiter.acquire()
+            started = time.monotonic()
+            try:
+                # NCBI asks for POST once the request carries a long list of IDs
+                if "id" in query:
+                    response = self.session.post(
+                        self.base_url + endpoint, data=query, timeout=self.timeout
+                    )
+                else:
+                    response = self.session.get(
+                        self.base_url + endpoint, params=query, timeout=self.timeout
+                    )
+                response.raise_for_status()
+                body = response.content
+                # urllib3 counts the bytes read off the socket, before decoding
+                self._record(
+                    endpoint,
+                    query,
+                    response.raw.tell(),
+                    body,
+                    time.monotonic() - started,
+                    attempt,
+                )
+                return body
+            except requests.HTTPError as e:
+                if e.response is None:
+                    raise
+                delay = self._backoff(
+                    endpoint, attempt, e, e.response.status_code, e.response.headers
+                )
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = self._backoff(endpoint, attempt, e)
+            self.retry.sleep(delay)
+            # A failed batch that outgrew the shrunken size is sent in pieces
+            pieces = self._replan(endpoint, params)
+            if pieces:
+                return _join_responses(
+                    self._request(endpoint, piece) for piece in pieces
+                )
+        raise AssertionError("unreachable")
+
+
+def _retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Return the seconds a Retry-After header asks for, if it has one."""
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _split_articles(raw: bytes) -> Dict[str, bytes]:
+    """Split an efetch response into the XML of each PubmedArticle, keyed by PMID."""
+    articles = {}
+    for element in ET.fromstring(raw).findall("PubmedArticle"):
+        pmid = element.findtext("MedlineCitation/PMID")
+        if pmid:
+            element.tail = None
+            articles[pmid] = ET.tostring(element, encoding="unicode").encode("utf-8")
+    return articles
+
+
+def _join_articles(articles: Iterable[bytes]) -> bytes:
+    """Reassemble raw PubmedArticle XML into an efetch document for Entrez.read."""
+    return b"".join([PUBMED_PROLOG, b"<PubmedArticleSet>", *articles, b"</PubmedArticleSet>"])
+
+
+def _join_responses(bodies: Iterable[bytes]) -> bytes:
+    """Merge efetch responses into one document, keeping every record in order."""
+    records = []
+    for body in bodies:
+        for element in ET.fromstring(body):
+            element.tail = None
+            records.append(ET.tostring(element, encoding="unicode").encode("utf-8"))
+    return _join_articles(records)
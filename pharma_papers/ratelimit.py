@@ -0,0 +1,143 @@
+"""Module for rate limiting requests to the NCBI E-utilities."""
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by every request of a client."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second, i.e. the sustained requests/sec ceiling
+            capacity: Maximum burst size; the default of one token spaces requests
+                evenly so no one-second window ever exceeds ``rate`` requests
+            clock: Monotonic clock, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = capacity
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, blocking until it is available.
+
+        A caller that finds the bucket empty reserves the next token by
+        driving the balance negative, so waiting happens outside the lock
+        and concurrent callers queue up in arrival order.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve()
+        if wait > 0:
+            logger.debug(f"Rate limit reached, waiting {wait:.3f}s")
+            self._sleep(wait)
+        return wait
+
+    def reserve(self) -> float:
+        """
+        Take one token without blocking.
+
+        For callers that wait on their own, e.g. with ``asyncio.sleep``, so
+        coroutines and threads can share one request budget.
+
+        Returns:
+            Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            self._refill()
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    def pause(self, seconds: float) -> None:
+        """
+        Hold back every caller for at least ``seconds``.
+
+        Used when NCBI answers HTTP 429: the whole client backs off, not
+        just the request that was refused.
+
+        Args:
+            seconds: Time before the next token becomes available
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 1 - seconds * self.rate)
+        logger.debug(f"Rate limiter paused for {seconds:.3f}s")
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last update, up to capacity."""
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+
+class RetryPolicy:
+    """Jittered exponential backoff for transient E-utilities failures."""
+
+    # Throttling and transient server errors; anything else is not retried
+    retry_statuses = frozenset({429, 500, 502, 503, 504})
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: Callable[[], float] = random.random,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        """
+        Initialize the retry policy.
+
+        Args:
+            max_attempts: Attempts per request, including the first
+            base_delay: Backoff before the first retry, doubled on each one
+            max_delay: Cap on the backoff, before jitter
+            jitter: Source of uniform [0, 1) jitter, injectable for tests
+            sleep: Sleep function, injectable for tests
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._jitter = jitter
+        self.sleep = sleep
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Return how long to wait before retrying.
+
+        Args:
+            attempt: Number of the attempt that just failed, from 1
+            retry_after: Seconds the server asked for in Retry-After, if any
+
+        Returns:
+            Between half and all of the capped exponential backoff, and never
+            less than ``retry_after``
+        """
+        backoff = min(self.max_delay, self.base_delay * 2.0 ** (attempt - 1))
+        backoff *= 0.5 + self._jitter() / 2
+        return max(backoff, retry_after or 0.0)
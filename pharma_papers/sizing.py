@@ -0,0 +1,116 @@
+"""Module for choosing efetch batch sizes from how NCBI answers."""
+
+import logging
+import threading
+from typing import Optional
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# NCBI's recommended batch size, used until responses have been measured
+DEFAULT_BATCH_SIZE = 200
+
+# efetch returns at most 10,000 records per request
+EFETCH_MAX_RECORDS = 10000
+
+
+class BatchSizer:
+    """Thread-safe efetch batch size, adapted to observed latency and size.
+
+    Under NCBI's fixed request-rate ceiling, articles per second grow with
+    the batch size until responses get slow or large enough to time out.
+    The sizer keeps a smoothed per-record cost of the responses it sees
+    and sizes batches to stay within ``target_seconds`` and ``max_bytes``.
+    It at most doubles the size per batch, and halves it whenever a batch
+    times out or fails with a server error. With ``min_size == max_size``
+    the size is fixed.
+    """
+
+    def __init__(
+        self,
+        initial: int = DEFAULT_BATCH_SIZE,
+        min_size: int = 20,
+        max_size: int = 1000,
+        target_seconds: float = 5.0,
+        max_bytes: int = 32_000_000,
+        smoothing: float = 0.3,
+    ) -> None:
+        """
+        Initialize the sizer.
+
+        Args:
+            initial: Size of the first batches
+            min_size: Smallest size ever chosen
+            max_size: Largest size ever chosen, at most 10,000
+            target_seconds: Response time to aim for
+            max_bytes: Largest decoded response to aim for
+            smoothing: Weight of the newest response in the per-record
+                averages, from 0 (ignore it) to 1 (use only it)
+        """
+        if not 1 <= min_size <= max_size:
+            raise ValueError("need 1 <= min_size <= max_size")
+        self.min_size = min_size
+        self.max_size = min(max_size, EFETCH_MAX_RECORDS)
+        self.target_seconds = target_seconds
+        self.max_bytes = max_bytes
+        self.smoothing = smoothing
+        self.size = self._clamp(initial)
+        # Smoothed seconds and bytes per record, None until measured
+        self._seconds_per_record: Optional[float] = None
+        self._bytes_per_record: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def fixed(self) -> bool:
+        """Whether the size never changes."""
+        return self.min_size == self.max_size
+
+    def next_size(self) -> int:
+        """Return the size of the next batch."""
+        with self._lock:
+            return self.size
+
+    def observe(self, records: int, body_bytes: int, seconds: float) -> None:
+        """
+        Learn from a successful efetch.
+
+        Args:
+            records: Records the request asked for
+            body_bytes: Size of the decoded response
+            seconds: Response time
+        """
+        if records <= 0 or self.fixed:
+            return
+        with self._lock:
+            self._seconds_per_record = self._average(
+                self._seconds_per_record, seconds / records
+            )
+            self._bytes_per_record = self._average(
+                self._bytes_per_record, body_bytes / records
+            )
+            fit = min(
+                self.target_seconds / max(self._seconds_per_record, 1e-9),
+                self.max_bytes / max(self._bytes_per_record, 1.0),
+            )
+            self._resize(min(fit, 2 * self.size), "measured")
+
+    def failed(self) -> None:
+        """Shrink after a batch timed out or failed with a server error."""
+        if self.fixed:
+            return
+        with self._lock:
+            self._resize(self.size / 2, "failure")
+
+    def _average(self, average: Optional[float], value: float) -> float:
+        if average is None:
+            return value
+        return average + self.smoothing * (value - average)
+
+    def _clamp(self, size: float) -> int:
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    def _resize(self, size: float, reason: str) -> None:
+        new_size = self._clamp(size)
+        if new_size != self.size:
+            logger.debug(f"efetch batch size {self.size} -> {new_size} ({reason})")
+            self.size = new_size
@@ -0,0 +1,71 @@
+"""Module for remembering what earlier incremental runs already emitted."""
+
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional, Set
+
+from pharma_papers.cache import default_cache_dir, normalize_query
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def default_state_path() -> str:
+    """Return the default location of the incremental run state file."""
+    return os.path.join(default_cache_dir(), "incremental.json")
+
+
+class IncrementalState:
+    """Per-query record of the last successful run date and emitted PMIDs."""
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        """
+        Load the state file, starting empty if it does not exist yet.
+
+        Args:
+            path: JSON state file (defaults to ``incremental.json`` in the cache dir)
+        """
+        self.path = path or default_state_path()
+        self.queries: Dict[str, Dict] = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.queries = json.load(f).get("queries", {})
+
+    def last_run(self, query: str) -> Optional[str]:
+        """
+        Return the date of the last successful run of a query.
+
+        Args:
+            query: PubMed query string
+
+        Returns:
+            Date as ``YYYY/MM/DD``, or None if the query never ran
+        """
+        return self.queries.get(normalize_query(query), {}).get("last_run")
+
+    def emitted(self, query: str) -> Set[str]:
+        """Return the PMIDs already written for a query."""
+        return set(self.queries.get(normalize_query(query), {}).get("pmids", []))
+
+    def record(self, query: str, run_date: str, pmids: Iterable[str]) -> None:
+        """
+        Record a successful run and the PMIDs it wrote.
+
+        Args:
+            query: PubMed query string
+            run_date: Date of this run as ``YYYY/MM/DD``
+            pmids: PMIDs written by this run, added to earlier ones
+        """
+        entry = self.queries.setdefault(normalize_query(query), {})
+        entry["last_run"] = run_date
+        entry["pmids"] = sorted(set(entry.get("pmids", [])) | set(pmids))
+
+    def save(self) -> None:
+        """Write the state file atomically."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"queries": self.queries}, f)
+        os.replace(tmp_path, self.path)
+        logger.debug(f"Saved incremental state to {self.path}")
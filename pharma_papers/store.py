@@ -0,0 +1,266 @@
+"""Module for keeping parsed articles in a local, queryable SQLite store."""
+
+import logging
+import os
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from pharma_papers.affiliations import AffiliationAnalyzer
+from pharma_papers.cache import _SQLiteCache, default_cache_dir, normalize_query
+from pharma_papers.models import Article
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def default_store_path() -> str:
+    """Return the default location of the article store."""
+    return os.path.join(default_cache_dir(), "papers.sqlite3")
+
+
+class ArticleStore(_SQLiteCache):
+    """SQLite store of company-affiliated articles, their authors and companies.
+
+    Articles are upserted by PMID, so the store accumulates the results of
+    every run and can answer follow-up questions without PubMed. Raw
+    affiliation strings are not part of an Article record; each author is
+    stored with whether any of their affiliations is non-academic. Each
+    company name is stored with its canonical key (see
+    AffiliationAnalyzer.canonical_company), so a search for a known company
+    finds the papers of its subsidiaries and sites too.
+    """
+
+    schema = """
+        PRAGMA journal_mode = WAL;
+        PRAGMA synchronous = NORMAL;
+        CREATE TABLE IF NOT EXISTS articles (
+            pmid TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            publication_date TEXT NOT NULL,
+            corresponding_email TEXT,
+            updated_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS articles_date ON articles (publication_date);
+        CREATE TABLE IF NOT EXISTS authors (
+            pmid TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            name TEXT NOT NULL,
+            non_academic INTEGER NOT NULL,
+            PRIMARY KEY (pmid, position)
+        );
+        CREATE TABLE IF NOT EXISTS companies (
+            pmid TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            company TEXT NOT NULL COLLATE NOCASE,
+            canonical TEXT NOT NULL,
+            PRIMARY KEY (pmid, position)
+        );
+        CREATE INDEX IF NOT EXISTS companies_name ON companies (company, pmid);
+        CREATE INDEX IF NOT EXISTS companies_canonical ON companies (canonical, pmid);
+        CREATE TABLE IF NOT EXISTS query_results (
+            query TEXT NOT NULL,
+            pmid TEXT NOT NULL,
+            PRIMARY KEY (query, pmid)
+        );
+        CREATE INDEX IF NOT EXISTS query_results_pmid ON query_results (pmid);
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+        analyzer: Optional[AffiliationAnalyzer] = None,
+    ) -> None:
+        """
+        Open (creating if needed) the store.
+
+        Args:
+            path: SQLite file (defaults to ``papers.sqlite3`` in the cache dir)
+            clock: Wall clock, injectable for tests
+            analyzer: Analyzer whose known companies group company names
+        """
+        super().__init__(path or default_store_path(), clock)
+        self.analyzer = analyzer or AffiliationAnalyzer()
+
+    def upsert_many(
+        self,
+        articles: Iterable[Article],
+        query: Optional[str] = None,
+        tags: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> int:
+        """
+        Insert or replace articles in one transaction.
+
+        Args:
+            articles: Parsed articles
+            query: Query every article was found by, if any
+            tags: Queries each PMID was found by, as in a multi-query run
+
+        Returns:
+            Number of articles stored
+        """
+        articles = list(articles)
+        if not articles:
+            return 0
+        now = self._clock()
+        pmids = [(article.pmid,) for article in articles]
+        found_by: List[Tuple[str, str]] = []
+        for article in articles:
+            queries = list((tags or {}).get(article.pmid, ()))
+            if query:
+                queries.append(query)
+            found_by.extend((normalize_query(q), article.pmid) for q in queries)
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO articles VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (pmid) DO UPDATE SET title = excluded.title,"
+                " publication_date = excluded.publication_date,"
+                " corresponding_email = excluded.corresponding_email,"
+                " updated_at = excluded.updated_at",
+                [
+                    (a.pmid, a.title, a.publication_date, a.corresponding_email, now)
+                    for a in articles
+                ],
+            )
+            self._conn.executemany("DELETE FROM authors WHERE pmid = ?", pmids)
+            self._conn.executemany("DELETE FROM companies WHERE pmid = ?", pmids)
+            self._conn.executemany(
+                "INSERT INTO authors VALUES (?, ?, ?, ?)",
+                [
+                    (a.pmid, i, name, name in a.non_academic_authors)
+                    for a in articles
+                    for i, name in enumerate(a.authors)
+                ],
+            )
+            self._conn.executemany(
+                "INSERT INTO companies VALUES (?, ?, ?, ?)",
+                [
+                    (a.pmid, i, company, self.analyzer.canonical_company(company))
+                    for a in articles
+                    for i, company in enumerate(a.company_affiliations)
+                ],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO query_results VALUES (?, ?)", found_by
+            )
+        logger.debug(f"Stored {len(articles)} articles in {self.path}")
+        return len(articles)
+
+    def store_batches(
+        self,
+        batches: Iterable[List[Article]],
+        query: Optional[str] = None,
+        tags: Optional[Mapping[str, Sequence[str]]] = None,
+    ) -> Iterator[List[Article]]:
+        """
+        Store each batch of articles as it streams past on its way to the output.
+
+        Args:
+            batches: Article lists, e.g. one per efetch batch
+            query: Query every article was found by, if any
+            tags: Queries each PMID was found by, as in a multi-query run
+
+        Yields:
+            Each batch, unchanged, once it is committed
+        """
+        for articles in batches:
+            self.upsert_many(articles, query, tags)
+            yield articles
+
+    def search(
+        self,
+        company: Optional[str] = None,
+        since: Optional[str] = None,
+        before: Optional[str] = None,
+        query: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Article]:
+        """
+        Look up stored articles.
+
+        Args:
+            company: Company name, matched case-insensitively; a known
+                company, e.g. ``pfizer``, also matches names such as
+                "Pfizer Japan"
+            since: Earliest publication date, e.g. ``2022`` or ``2022-06-01``
+            before: Publication dates from this one on are excluded, e.g. ``2023``
+            query: Only articles found by this query
+            limit: Maximum number of articles
+
+        Returns:
+            Matching articles, newest publication first
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if company:
+            clauses.append(
+                "pmid IN (SELECT pmid FROM companies"
+                " WHERE canonical = ? OR company = ?)"
+            )
+            params.extend([company.strip().lower(), company])
+        if since:
+            clauses.append("publication_date >= ?")
+            params.append(since)
+        if before:
+            clauses.append("publication_date < ?")
+            params.append(before)
+        if query:
+            clauses.append("pmid IN (SELECT pmid FROM query_results WHERE query = ?)")
+            params.append(normalize_query(query))
+
+        sql = "SELECT pmid, title, publication_date, corresponding_email FROM articles"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY publication_date DESC, pmid"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            people = self._children(
+                "SELECT pmid, name, non_academic FROM authors", [r[0] for r in rows]
+            )
+            companies = self._children(
+                "SELECT pmid, company FROM companies", [r[0] for r in rows]
+            )
+
+        return [
+            Article(
+                pmid=pmid,
+                title=title,
+                publication_date=publication_date,
+                authors=tuple(name for name, _ in people.get(pmid, ())),
+                non_academic_authors=tuple(
+                    name for name, non_academic in people.get(pmid, ()) if non_academic
+                ),
+                company_affiliations=tuple(c for (c,) in companies.get(pmid, ())),
+                corresponding_email=email,
+            )
+            for pmid, title, publication_date, email in rows
+        ]
+
+    def _children(self, select: str, pmids: List[str]) -> Dict[str, List[tuple]]:
+        """Load per-article rows in position order, grouped by PMID."""
+        grouped: Dict[str, List[tuple]] = {}
+        for i in range(0, len(pmids), 500):
+            chunk = pmids[i : i + 500]
+            for pmid, *values in self._conn.execute(
+                f"{select} WHERE pmid IN ({','.join('?' * len(chunk))})"
+                " ORDER BY pmid, position",
+                chunk,
+            ):
+                grouped.setdefault(pmid, []).append(tuple(values))
+        return grouped
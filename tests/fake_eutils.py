@@ -0,0 +1,184 @@
+"""A local fake of the NCBI E-utilities used by the client tests."""
+
+import gzip
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+ESEARCH_TEMPLATE = """<?xml version="1.0" encoding="UTF-8" ?>
+<!DOCTYPE eSearchResult PUBLIC "-//NLM//DTD esearch 20060628//EN" \
+"https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/esearch.dtd">
+<eSearchResult><Count>{count}</Count><RetMax>{retmax}</RetMax>\
+<RetStart>0</RetStart><QueryKey>1</QueryKey><WebEnv>{webenv}</WebEnv>\
+<IdList>{ids}</IdList><TranslationSet/><QueryTranslation>{term}</QueryTranslation>\
+</eSearchResult>
+"""
+
+EFETCH_TEMPLATE = """<?xml version="1.0" ?>
+<!DOCTYPE PubmedArticleSet PUBLIC "-//NLM//DTD PubMedArticle, 1st January 2025//EN" \
+"https://dtd.nlm.nih.gov/ncbi/pubmed/out/pubmed_250101.dtd">
+<PubmedArticleSet>{articles}</PubmedArticleSet>
+"""
+
+ARTICLE_TEMPLATE = """<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM">\
+<PMID Version="1">{pmid}</PMID><Article PubModel="Print"><Journal>\
+<JournalIssue CitedMedium="Internet"><PubDate><Year>2023</Year></PubDate></JournalIssue>\
+<Title>Fake Journal</Title></Journal><ArticleTitle>Article {pmid}</ArticleTitle>\
+<AuthorList CompleteYN="Y"><Author ValidYN="Y"><LastName>Smith</LastName>\
+<ForeName>John</ForeName><Initials>J</Initials><AffiliationInfo>\
+<Affiliation>Pfizer Inc., New York, NY, USA.</Affiliation></AffiliationInfo>\
+</Author></AuthorList></Article></MedlineCitation></PubmedArticle>"""
+
+
+def article_xml(pmid: str) -> str:
+    """Render one minimal company-affiliated PubmedArticle."""
+    return ARTICLE_TEMPLATE.format(pmid=pmid)
+
+
+class FakeEUtils:
+    """Serve esearch/efetch over HTTP on localhost from an in-memory PMID list."""
+
+    def __init__(
+        self,
+        pmids: List[str],
+        latency: Callable[[Dict[str, str]], float] = lambda params: 0.0,
+        max_ids: int = 10000,
+        searches: Optional[Dict[str, List[str]]] = None,
+    ) -> None:
+        """
+        Args:
+            pmids: Result set returned by esearch, in relevance order
+            latency: Seconds to stall before answering, given the request params
+            max_ids: Cap on the IDs a single esearch response lists
+            searches: Result sets of specific terms, searched by ID only
+        """
+        self.pmids = pmids
+        self.searches = searches or {}
+        self.latency = latency
+        self.max_ids = max_ids
+        self.requests: List[Dict[str, str]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._failures: Deque[Tuple[str, Optional[int], Optional[str]]] = deque()
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    def fail_next(
+        self,
+        status: int,
+        count: int = 1,
+        retry_after: Optional[str] = None,
+        endpoint: str = "efetch.fcgi",
+        after: int = 0,
+    ) -> None:
+        """
+        Answer the next requests to an endpoint with an HTTP error.
+
+        Args:
+            status: HTTP status to send
+            count: Number of requests to fail
+            retry_after: Retry-After header value to send, if any
+            endpoint: Endpoint whose requests fail, e.g. ``esearch.fcgi``
+            after: Requests to the endpoint to answer normally first
+        """
+        with self._lock:
+            self._failures.extend([(endpoint, None, None)] * after)
+            self._failures.extend([(endpoint, status, retry_after)] * count)
+
+    @property
+    def base_url(self) -> str:
+        """URL to pass as ``PubMedClient(base_url=...)``."""
+        assert self._server is not None
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def __enter__(self) -> "FakeEUtils":
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                fake._handle(self, parse_qs(urlparse(self.path).query))
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                fake._handle(self, parse_qs(self.rfile.read(length).decode()))
+
+            def log_message(self, *args: object) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        ).start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        assert self._server is not None
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handle(self, handler: BaseHTTPRequestHandler, query: Dict) -> None:
+        params = {key: values[0] for key, values in query.items()}
+        endpoint = urlparse(handler.path).path.rsplit("/", 1)[-1]
+        with self._lock:
+            self.requests.append(
+                {"endpoint": endpoint, "time": time.monotonic(), **params}
+            )
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            failure = next((f for f in self._failures if f[0] == endpoint), None)
+            if failure is not None:
+                self._failures.remove(failure)
+        try:
+            time.sleep(self.latency(params))
+            if failure is not None and failure[1] is not None:
+                _, status, retry_after = failure
+                handler.send_response(status)
+                if retry_after is not None:
+                    handler.send_header("Retry-After", retry_after)
+                handler.send_header("Content-Length", "0")
+                handler.end_headers()
+                return
+            if endpoint == "esearch.fcgi":
+                body = self._esearch(params)
+            elif endpoint == "efetch.fcgi":
+                body = self._efetch(params)
+            else:
+                handler.send_error(404)
+                return
+            data = body.encode("utf-8")
+            handler.send_response(200)
+            # Compress like NCBI does for clients that accept it
+            if "gzip" in handler.headers.get("Accept-Encoding", ""):
+                data = gzip.compress(data)
+                handler.send_header("Content-Encoding", "gzip")
+            handler.send_header("Content-Type", "text/xml; charset=UTF-8")
+            handler.send_header("Content-Length", str(len(data)))
+            handler.end_headers()
+            handler.wfile.write(data)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def _esearch(self, params: Dict[str, str]) -> str:
+        pmids = self.searches.get(params.get("term", ""), self.pmids)
+        retmax = min(int(params.get("retmax", 20)), self.max_ids)
+        ids = "".join(f"<Id>{pmid}</Id>" for pmid in pmids[:retmax])
+        return ESEARCH_TEMPLATE.format(
+            count=len(pmids),
+            retmax=min(retmax, len(pmids)),
+            webenv="MCID_fake",
+            ids=ids,
+            term=params.get("term", ""),
+        )
+
+    def _efetch(self, params: Dict[str, str]) -> str:
+        if "WebEnv" in params:
+            start = int(params.get("retstart", 0))
+            pmids = self.pmids[start : start + int(params.get("retmax", 20))]
+        else:
+            pmids = params["id"].split(",")
+        return EFETCH_TEMPLATE.format(articles="".join(map(article_xml, pmids)))
@@ -2,7 +2,12 @@
 
 import unittest
 
-from pharma_papers.affiliations import AffiliationAnalyzer
+from pharma_papers.affiliations import (
+    ACADEMIC_KEYWORDS,
+    COMPANY_KEYWORDS,
+    AffiliationAnalyzer,
+    AffiliationClassifier,
+)
 
 
 class TestAffiliationAnalyzer(unittest.TestCase):
@@ -35,6 +40,82 @@ class TestAffiliationAnalyzer(unittest.TestCase):
         self.assertIn("Pfizer", companies)
         self.assertIn("Novartis", companies)
 
+    def test_identify_company_longest_match(self) -> None:
+        """Test the longest whole-word suffix wins, not set iteration order."""
+        cases = {
+            "Acme Pharmaceuticals, Boston, MA": "Acme pharmaceuticals",
+            "Foo Biologics Ltd., Oxford, UK": "Foo Biologics ltd.",
+            "Bar Holdings Corporation, Tokyo": "Bar Holdings corporation",
+            "GlaxoSmithKline (GSK), Brentford, UK": "GlaxoSmithKline",
+            "Augmentium Pharma Consulting, Paris": "Augmentium pharma",
+            "Acme Therapeutics Company, Boston": "Acme therapeutics",
+            "Department of Biology, University of Example": "",
+        }
+        for affiliation, expected in cases.items():
+            self.assertEqual(
+                self.analyzer._identify_company(affiliation), expected, affiliation
+            )
+
+
+class TestAffiliationClassifier(unittest.TestCase):
+    """Test cases for the AffiliationClassifier class."""
+
+    AFFILIATIONS = [
+        "Pfizer Inc., New York, NY, USA",
+        "Novartis Pharmaceuticals, Basel, Switzerland",
+        "Department of Biology, University of Example, Example City, USA",
+        "Genentech Biotech Institute, South San Francisco, CA",
+        "Mayo Clinic Laboratories, Rochester, MN",
+        "Acme Biosciences GmbH, Berlin, Germany",
+        "Example Hospitaltd, Leeds, UK",
+        "European Pharmacademy, Brussels, Belgium",
+        "Acme LLCollege, Austin, TX",
+        "Therapeuticschool, Lyon, France",
+        "",
+    ]
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.classifier = AffiliationClassifier()
+
+    def test_classify_reports_markers(self) -> None:
+        """Test classify returns the decision and the markers that matched."""
+        result = self.classifier.classify("Novartis Pharmaceuticals Ltd, Basel")
+
+        self.assertTrue(result.is_company)
+        self.assertEqual(result.company, ("pharmaceutical", "ltd"))
+        self.assertEqual(result.academic, ())
+
+        result = self.classifier.classify("Mayo Clinic Laboratories, Rochester")
+        self.assertFalse(result.is_company)
+        self.assertEqual(result.academic, ("clinic",))
+
+        # Keywords of different kinds may overlap; both are still seen
+        result = self.classifier.classify("European Pharmacademy, Brussels")
+        self.assertFalse(result.is_company)
+        self.assertEqual((result.academic, result.company), (("academy",), ("pharma",)))
+
+    def test_matches_substring_checks(self) -> None:
+        """Test the single pass agrees with one substring scan per keyword."""
+        for affiliation in self.AFFILIATIONS:
+            lower = affiliation.lower()
+            expected = any(kw in lower for kw in COMPANY_KEYWORDS) and not any(
+                kw in lower for kw in ACADEMIC_KEYWORDS
+            )
+            self.assertEqual(
+                self.classifier.is_company(affiliation), expected, affiliation
+            )
+            self.assertEqual(
+                self.classifier.classify(affiliation).is_company, expected, affiliation
+            )
+
+    def test_shared_with_analyzer(self) -> None:
+        """Test the analyzer exposes the same classifier."""
+        analyzer = AffiliationAnalyzer(self.classifier)
+
+        self.assertIs(analyzer.classifier, self.classifier)
+        self.assertTrue(analyzer.classify_affiliation("Acme Therapeutics").is_company)
+
 
 if __name__ == "__main__":
     unittest.main()
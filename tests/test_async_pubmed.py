@@ -0,0 +1,176 @@
+"""Tests for the async_pubmed module."""
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from typing import Optional
+
+from pharma_papers.async_pubmed import AsyncPubMedClient
+from pharma_papers.cache import ArticleCache, SearchCache
+from pharma_papers.pubmed import FetchError
+from pharma_papers.ratelimit import RateLimiter, RetryPolicy
+from pharma_papers.sizing import BatchSizer
+from tests.fake_eutils import FakeEUtils
+from tests.test_pubmed import PMIDS, article_pmids
+
+try:
+    import httpx
+except ImportError:  # pragma: no cover - optional dependency
+    httpx = None
+
+
+@unittest.skipIf(httpx is None, "httpx is not installed")
+class TestAsyncPubMedClient(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the AsyncPubMedClient class."""
+
+    def make_client(self, fake: FakeEUtils, **kwargs: object) -> AsyncPubMedClient:
+        """Create a client talking to the fake server without rate limiting.
+
+        Batches are a fixed 200 records unless a test asks otherwise.
+        """
+        kwargs.setdefault("rate_limiter", RateLimiter(rate=1000))
+        kwargs.setdefault("retry", RetryPolicy(base_delay=0.01))
+        kwargs.setdefault("batch_size", 200)
+        return AsyncPubMedClient(
+            email="test@example.com", base_url=fake.base_url, **kwargs
+        )
+
+    async def test_search_and_fetch(self) -> None:
+        """Test search and fetch_details match the sync client."""
+        with FakeEUtils(PMIDS, max_ids=300) as fake:
+            async with self.make_client(fake) as client:
+                result = await client.search("cancer", max_results=420)
+                records = await client.fetch_details(result)
+
+        self.assertEqual((result.count, len(result.pmids)), (450, 300))
+        self.assertEqual(article_pmids(records), PMIDS[:420])
+        efetches = [s for s in client.stats.recent if s.endpoint == "efetch.fcgi"]
+        self.assertEqual([s.records for s in efetches], [200, 200, 20])
+        self.assertGreater(client.stats.compression_ratio, 5)
+
+    async def test_iterators_keep_order_under_concurrency(self) -> None:
+        """Test concurrent batches are yielded in PMID order."""
+        pmids = PMIDS * 2
+
+        # Earlier batches answer more slowly, so they complete out of order
+        def latency(params: dict) -> float:
+            return 0.3 if params.get("id", "").startswith("38000000") else 0.05
+
+        with FakeEUtils(pmids, latency=latency) as fake:
+            async with self.make_client(fake, max_workers=4) as client:
+                ends: list = []
+                raw = [b async for b in client.iter_raw_details(pmids, 200, ends)]
+                batches = [article_pmids(r) async for r in client.iter_details(pmids)]
+
+        self.assertEqual((len(raw), ends), (4, [400, 600, 800, 900]))
+        self.assertEqual(sum(batches, []), pmids)
+        self.assertGreater(fake.max_in_flight, 1)
+
+    async def test_concurrent_queries_share_rate_limit(self) -> None:
+        """Test queries run together on one loop stay within one request budget."""
+        with FakeEUtils(PMIDS) as fake:
+            client = self.make_client(fake, rate_limiter=RateLimiter(rate=10))
+            async with client:
+                started = time.monotonic()
+                results = await asyncio.gather(
+                    *(client.search(f"query {i}", max_results=5) for i in range(6))
+                )
+                elapsed = time.monotonic() - started
+
+        self.assertEqual([r.pmids for r in results], [PMIDS[:5]] * 6)
+        self.assertEqual(len(fake.requests), 6)
+        # The sixth token at 10/s is granted 0.5s after the first; arrivals
+        # at the server jitter with connection setup, so check the client
+        self.assertGreaterEqual(elapsed, 0.49)
+
+    async def test_concurrent_queries_share_connections(self) -> None:
+        """Test queries run together even when one fetch keeps one batch in flight."""
+        with FakeEUtils(PMIDS, latency=lambda params: 0.2) as fake:
+            async with self.make_client(fake) as client:
+                await asyncio.gather(
+                    *(client.search(f"query {i}", max_results=5) for i in range(4))
+                )
+
+        self.assertEqual(client.max_workers, 1)
+        self.assertGreater(fake.max_in_flight, 1)
+
+    async def test_cache_work_runs_off_the_loop(self) -> None:
+        """Test article and search cache lookups and writes run on worker threads."""
+        threads = set()
+
+        class RecordingCache(ArticleCache):
+            def get_many(self, pmids: list) -> dict:
+                threads.add(threading.get_ident())
+                return super().get_many(pmids)
+
+            def put_many(self, articles: dict) -> None:
+                threads.add(threading.get_ident())
+                super().put_many(articles)
+
+        class RecordingSearchCache(SearchCache):
+            def get(self, query: str, max_results: int) -> Optional[dict]:
+                threads.add(threading.get_ident())
+                return super().get(query, max_results)
+
+            def put(self, query: str, max_results: int, result: dict) -> None:
+                threads.add(threading.get_ident())
+                super().put(query, max_results, result)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = RecordingCache(os.path.join(tmpdir, "articles.sqlite3"))
+            search_cache = RecordingSearchCache(
+                os.path.join(tmpdir, "searches.sqlite3")
+            )
+            with FakeEUtils(PMIDS) as fake:
+                client = self.make_client(fake, cache=cache, search_cache=search_cache)
+                async with client:
+                    await client.fetch_details(PMIDS[:50])
+                    records = await client.fetch_details(PMIDS[:100])
+                    await client.search("cancer", max_results=5)
+                    result = await client.search("cancer", max_results=5)
+            cache.close()
+            search_cache.close()
+
+        self.assertEqual(article_pmids(records), PMIDS[:100])
+        self.assertEqual(result.pmids, PMIDS[:5])
+        self.assertEqual((search_cache.hits, search_cache.misses), (1, 1))
+        self.assertTrue(threads)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    async def test_timed_out_batch_is_split(self) -> None:
+        """Test a batch of IDs that times out is retried in smaller pieces."""
+
+        # Batches over 100 IDs take longer than the client waits
+        def latency(params: dict) -> float:
+            return 0.5 if params["id"].count(",") >= 100 else 0.0
+
+        with FakeEUtils(PMIDS, latency=latency) as fake:
+            client = self.make_client(fake, batch_size=None, timeout=0.2)
+            client.sizer = BatchSizer(initial=200, max_size=200)
+            async with client:
+                records = await client.fetch_details(PMIDS[:200])
+
+        self.assertEqual(article_pmids(records), PMIDS[:200])
+        sizes = [r["id"].count(",") + 1 for r in fake.requests]
+        self.assertEqual(sizes, [200, 100, 100])
+
+    async def test_retries_and_partial_results(self) -> None:
+        """Test transient errors are retried and a lasting one keeps partials."""
+        with FakeEUtils(PMIDS) as fake:
+            async with self.make_client(fake, retry=RetryPolicy(3, 0.01)) as client:
+                fake.fail_next(503, count=2)
+                self.assertEqual(
+                    article_pmids(await client.fetch_details(PMIDS[:10])), PMIDS[:10]
+                )
+                fake.fail_next(500, count=3, after=1)
+                with self.assertRaises(FetchError) as raised:
+                    await client.fetch_details(PMIDS)
+
+        self.assertEqual(article_pmids(raised.exception.partial), PMIDS[:200])
+
+
+if __name__ == "__main__":
+    unittest.main()
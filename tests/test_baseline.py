@@ -0,0 +1,85 @@
+"""Tests for the baseline module."""
+
+import gzip
+import os
+import tempfile
+import unittest
+from typing import List, Sequence
+
+from pharma_papers.affiliations import AffiliationAnalyzer
+from pharma_papers.baseline import PMIDSet, find_baseline_files, iter_baseline_articles
+from pharma_papers.parallel import ParsePool
+from pharma_papers.parser import PubMedParser
+from tests.fake_eutils import EFETCH_TEMPLATE, article_xml
+
+
+def academic_xml(pmid: str) -> str:
+    """Render one PubmedArticle with an academic affiliation only."""
+    return article_xml(pmid).replace(
+        "Pfizer Inc., New York, NY, USA.", "Harvard University, Boston, MA, USA."
+    )
+
+
+def write_baseline(path: str, articles: List[str], deleted: Sequence[str] = ()) -> None:
+    """Write a gzip'd PubMed XML file like NCBI's baseline and update files."""
+    deletions = "".join(f'<PMID Version="1">{pmid}</PMID>' for pmid in deleted)
+    if deletions:
+        deletions = f"<DeleteCitation>{deletions}</DeleteCitation>"
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        f.write(EFETCH_TEMPLATE.format(articles="".join(articles) + deletions))
+
+
+class TestBaselineIngestion(unittest.TestCase):
+    """Test cases for ingesting baseline and update files."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.baseline = os.path.join(self.tmpdir.name, "pubmed25n0001.xml.gz")
+        self.update = os.path.join(self.tmpdir.name, "pubmed25n0002.xml.gz")
+        write_baseline(
+            self.baseline,
+            [article_xml("1"), article_xml("2"), article_xml("3"), academic_xml("4")],
+        )
+        # The update revises 2 to an academic affiliation and deletes 3
+        write_baseline(self.update, [academic_xml("2"), article_xml("5")], ["3"])
+        with open(os.path.join(self.tmpdir.name, "README.txt"), "w") as f:
+            f.write("not a baseline file")
+
+    def ingest(self, workers: int) -> List[List[str]]:
+        """Return the PMIDs ingested from the fixture directory, per file."""
+        parse_pool = ParsePool(PubMedParser(), AffiliationAnalyzer(), workers)
+        return [
+            [article.pmid for article in articles]
+            for articles in iter_baseline_articles(parse_pool, [self.tmpdir.name])
+        ]
+
+    def test_find_baseline_files(self) -> None:
+        """Test directories expand to their baseline files, newest first."""
+        self.assertEqual(
+            find_baseline_files([self.tmpdir.name, self.baseline]),
+            [self.update, self.baseline],
+        )
+
+    def test_newest_version_wins_and_deletions_apply(self) -> None:
+        """Test superseded and deleted PMIDs in older files are dropped."""
+        self.assertEqual(self.ingest(workers=1), [["5"], ["1"]])
+
+    def test_files_parsed_in_parallel(self) -> None:
+        """Test parsing files on worker processes gives the same result."""
+        self.assertEqual(self.ingest(workers=2), [["5"], ["1"]])
+
+    def test_pmid_set(self) -> None:
+        """Test the PMID bitmap, including IDs that are not numeric."""
+        pmids = PMIDSet()
+        pmids.update(["7", "40000000", "X1"])
+
+        self.assertIn("40000000", pmids)
+        self.assertIn("X1", pmids)
+        self.assertNotIn("8", pmids)
+        self.assertNotIn("99999999", pmids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+"""Tests for the batch module."""
+
+import csv
+import os
+import tempfile
+import unittest
+
+from pharma_papers.affiliations import AffiliationAnalyzer
+from pharma_papers.batch import BatchRunner, query_filename, read_queries
+from pharma_papers.output import QUERIES_COLUMN, OutputHandler
+from pharma_papers.parallel import ParsePool
+from pharma_papers.parser import PubMedParser
+from pharma_papers.pubmed import PubMedClient
+from pharma_papers.ratelimit import RateLimiter
+from tests.fake_eutils import FakeEUtils
+
+SEARCHES = {"cancer": ["1", "2", "3"], "diabetes": ["3", "4", "2"]}
+
+
+class TestBatchRunner(unittest.TestCase):
+    """Test cases for the BatchRunner class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.fake = FakeEUtils([], searches=SEARCHES)
+        self.fake.__enter__()
+        self.addCleanup(self.fake.__exit__)
+        client = PubMedClient(
+            "test@example.com",
+            base_url=self.fake.base_url,
+            rate_limiter=RateLimiter(rate=1000),
+        )
+        parse_pool = ParsePool(PubMedParser(), AffiliationAnalyzer())
+        self.runner = BatchRunner(client, parse_pool, OutputHandler())
+
+    def read_csv(self, path: str) -> list:
+        """Return the rows of a CSV output file."""
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def test_read_queries(self) -> None:
+        """Test blank lines, comments and repeated queries are skipped."""
+        path = os.path.join(self.tmpdir.name, "queries.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("cancer\n\n# sweep 2\ndiabetes  AND  2024[PDAT]\ncancer \n")
+
+        self.assertEqual(read_queries(path), ["cancer", "diabetes AND 2024[PDAT]"])
+        self.assertEqual(
+            query_filename(3, "cancer[Title] AND pfizer", "csv"),
+            "003_cancer_Title_AND_pfizer.csv",
+        )
+
+    def test_tagged_output_fetches_each_pmid_once(self) -> None:
+        """Test shared PMIDs are fetched once and tagged with every query."""
+        path = os.path.join(self.tmpdir.name, "papers.csv")
+
+        written = self.runner.run(["cancer", "diabetes"], output_file=path)
+
+        fetched = [
+            pmid
+            for request in self.fake.requests
+            if request["endpoint"] == "efetch.fcgi"
+            for pmid in request["id"].split(",")
+        ]
+        rows = self.read_csv(path)
+        self.assertEqual(written, 4)
+        self.assertEqual(sorted(fetched), ["1", "2", "3", "4"])
+        self.assertEqual([row["PubmedID"] for row in rows], ["1", "2", "3", "4"])
+        self.assertEqual(rows[1][QUERIES_COLUMN], "cancer; diabetes")
+        self.assertEqual(rows[3][QUERIES_COLUMN], "diabetes")
+
+    def test_output_dir_writes_per_query_files(self) -> None:
+        """Test each query gets its own output file in relevance order."""
+        output_dir = os.path.join(self.tmpdir.name, "out")
+
+        written = self.runner.run(["cancer", "diabetes"], output_dir=output_dir)
+
+        self.assertEqual(written, 6)
+        self.assertEqual(
+            sorted(os.listdir(output_dir)), ["001_cancer.csv", "002_diabetes.csv"]
+        )
+        rows = self.read_csv(os.path.join(output_dir, "002_diabetes.csv"))
+        self.assertEqual([row["PubmedID"] for row in rows], ["3", "4", "2"])
+        self.assertNotIn(QUERIES_COLUMN, rows[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for the pipeline benchmark."""
+
+import unittest
+
+from benchmarks.bench_pipeline import (
+    STAGES,
+    host_differences,
+    host_info,
+    regressions,
+    run_size,
+)
+
+
+def result(entrez_seconds: float, rss_mb: float) -> dict:
+    """Build a one-size benchmark result."""
+    seconds = dict.fromkeys(STAGES, 0.02)
+    seconds["Entrez.read"] = entrez_seconds
+    return {
+        "seconds": seconds,
+        "articles_per_s": 200 / sum(seconds.values()),
+        "peak_rss_mb": rss_mb,
+    }
+
+
+class TestPipelineBenchmark(unittest.TestCase):
+    """Test cases for the stage timings and baseline comparison."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.baseline = {"200": result(0.1, 60.0)}
+
+    def test_run_size_times_every_stage(self) -> None:
+        """Test every stage is timed and throughput and RSS are reported."""
+        measured = run_size(20, repeat=1)
+
+        self.assertEqual(set(measured["seconds"]), set(STAGES))
+        self.assertTrue(all(s > 0 for s in measured["seconds"].values()))
+        self.assertGreater(measured["articles_per_s"], 0)
+        self.assertGreater(measured["peak_rss_mb"], 0)
+
+    def test_changes_within_tolerance_pass(self) -> None:
+        """Test small slowdowns and sizes missing from the baseline pass."""
+        results = {"200": result(0.12, 70.0), "1000": result(1.0, 500.0)}
+
+        self.assertEqual(regressions(results, self.baseline, 0.25), [])
+
+    def test_regressions_are_reported(self) -> None:
+        """Test slower stages, lower throughput and more memory are flagged."""
+        problems = regressions({"200": result(0.3, 90.0)}, self.baseline, 0.25)
+
+        self.assertEqual(len(problems), 3)
+        self.assertIn("Entrez.read", problems[0])
+        self.assertIn("articles/s", problems[1])
+        self.assertIn("peak RSS", problems[2])
+
+    def test_host_differences(self) -> None:
+        """Test a baseline from another machine is recognised."""
+        host = host_info()
+        other = {**host, "cpus": (host["cpus"] or 1) + 1}
+
+        self.assertEqual(host_differences(host, host), [])
+        self.assertEqual(len(host_differences(other, host)), 1)
+        self.assertIn("cpus", host_differences(other, host)[0])
+        self.assertEqual(len(host_differences({}, host)), len(host))
+
+
+if __name__ == "__main__":
+    unittest.main()
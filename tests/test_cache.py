@@ -0,0 +1,180 @@
+"""Tests for the cache module."""
+
+import os
+import tempfile
+import unittest
+
+from pharma_papers.cache import ArticleCache, LRUCache, SearchCache
+
+
+class FakeClock:
+    """Manually advanced wall clock."""
+
+    def __init__(self) -> None:
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestArticleCache(unittest.TestCase):
+    """Test cases for the ArticleCache class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "articles.sqlite3")
+        self.clock = FakeClock()
+
+    def make_cache(self, **kwargs: object) -> ArticleCache:
+        """Open a cache on the temporary database."""
+        cache = ArticleCache(self.path, clock=self.clock, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_round_trip_and_counters(self) -> None:
+        """Test stored articles come back and hits/misses are counted."""
+        cache = self.make_cache()
+        cache.put_many({"1": b"<PubmedArticle>one</PubmedArticle>"})
+
+        self.assertEqual(
+            cache.get_many(["1", "2"]), {"1": b"<PubmedArticle>one</PubmedArticle>"}
+        )
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_persists_between_instances(self) -> None:
+        """Test a second cache on the same file sees earlier articles."""
+        self.make_cache().put_many({"1": b"one"})
+
+        self.assertEqual(self.make_cache().get_many(["1"]), {"1": b"one"})
+
+    def test_expired_articles_are_misses(self) -> None:
+        """Test articles older than max_age are treated as missing."""
+        cache = self.make_cache(max_age=60)
+        cache.put_many({"1": b"one"})
+        self.clock.now += 61
+
+        self.assertEqual(cache.get_many(["1"]), {})
+
+    def test_size_cap_evicts_least_recently_used(self) -> None:
+        """Test exceeding max_bytes drops the least recently accessed articles."""
+        blob = os.urandom(1000)  # incompressible, so each entry is ~1000 bytes
+        cache = self.make_cache(max_bytes=2500)
+        cache.put_many({"1": blob, "2": blob})
+        self.clock.now += 1
+        cache.get_many(["1"])
+        self.clock.now += 1
+        cache.put_many({"3": blob})
+
+        self.assertEqual(sorted(cache.get_many(["1", "2", "3"])), ["1", "3"])
+
+    def test_purge(self) -> None:
+        """Test purge empties the cache."""
+        cache = self.make_cache()
+        cache.put_many({"1": b"one"})
+        cache.purge()
+
+        self.assertEqual(cache.get_many(["1"]), {})
+
+
+class TestSearchCache(unittest.TestCase):
+    """Test cases for the SearchCache class."""
+
+    RESULT = {"count": 2, "max_results": 10, "webenv": "MCID_1", "pmids": ["1", "2"]}
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.clock = FakeClock()
+
+    def make_cache(self, **kwargs: object) -> SearchCache:
+        """Open a search cache on a temporary database."""
+        path = os.path.join(self.tmpdir.name, "searches.sqlite3")
+        cache = SearchCache(path, clock=self.clock, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def test_normalized_query_hit(self) -> None:
+        """Test whitespace variants share an entry but case does not."""
+        cache = self.make_cache()
+        cache.put("cancer  AND\tpfizer[AFFL] ", 10, self.RESULT)
+
+        self.assertEqual(cache.get("cancer AND pfizer[AFFL]", 10), self.RESULT)
+        self.assertIsNone(cache.get("cancer and pfizer[AFFL]", 10))
+        self.assertIsNone(cache.get("cancer AND pfizer[AFFL]", 20))
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_max_age(self) -> None:
+        """Test stored searches expire after max_age."""
+        cache = self.make_cache(max_age=60)
+        cache.put("cancer", 10, self.RESULT)
+        self.clock.now += 61
+
+        self.assertIsNone(cache.get("cancer", 10))
+
+    def test_lru_bound(self) -> None:
+        """Test only the most recently used max_entries searches are kept."""
+        cache = self.make_cache(max_entries=2)
+        for query in ("a", "b"):
+            cache.put(query, 10, self.RESULT)
+            self.clock.now += 1
+        cache.get("a", 10)
+        self.clock.now += 1
+        cache.put("c", 10, self.RESULT)
+
+        self.assertIsNotNone(cache.get("a", 10))
+        self.assertIsNone(cache.get("b", 10))
+        self.assertIsNotNone(cache.get("c", 10))
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test cases for the LRUCache class."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        """Test the cache stays bounded and keeps recently read entries."""
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+
+    def test_hit_rate(self) -> None:
+        """Test hits and misses are counted."""
+        cache = LRUCache()
+        cache.put("a", False)
+        cache.get("a")
+        cache.get("a")
+        cache.get("b")
+
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+        self.assertAlmostEqual(cache.hit_rate, 2 / 3)
+
+    def test_save_and_load(self) -> None:
+        """Test entries survive a round trip in LRU order, under the same rules."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "affiliations.json")
+            cache = LRUCache()
+            cache.put("a", {"company": True})
+            cache.put("b", {"company": False})
+            cache.get("a")
+            cache.save(path, "rules-1")
+
+            restored = LRUCache(maxsize=1)
+            restored.load(path, "rules-1")
+            restored.load(os.path.join(tmpdir, "missing.json"), "rules-1")
+            stale = LRUCache()
+            stale.load(path, "rules-2")
+
+        self.assertEqual(restored.get("a"), {"company": True})
+        self.assertIsNone(restored.get("b"))
+        self.assertEqual(len(stale), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
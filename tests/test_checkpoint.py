@@ -0,0 +1,80 @@
+"""Tests for the checkpoint module."""
+
+import os
+import tempfile
+import unittest
+
+from pharma_papers.checkpoint import Checkpoint, checkpoint_path
+from pharma_papers.pubmed import SearchResult
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test cases for the Checkpoint class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.output = os.path.join(self.tmpdir.name, "papers.jsonl")
+        self.journal = checkpoint_path(self.output)
+        self.search = SearchResult(450, 1000, "MCID_1", "1", ["1", "2"])
+
+    def write_two_batches(self) -> None:
+        """Journal a run whose first two batches were written."""
+        checkpoint = Checkpoint(
+            self.journal, "cancer", self.output, "jsonl", self.search
+        )
+        checkpoint.begin()
+        checkpoint.ends.extend([200, 400])
+        with open(self.output, "w", encoding="utf-8") as f:
+            f.write("{}\n" * 3)
+        checkpoint.batch_written(3, 9)
+        checkpoint.batch_written(3, 9)
+        checkpoint.close()
+
+    def test_load_ignores_torn_line(self) -> None:
+        """Test a journal line cut short by a crash is not trusted."""
+        self.write_two_batches()
+        with open(self.journal, "a", encoding="utf-8") as f:
+            f.write('{"done": 45')
+
+        checkpoint = Checkpoint.load(self.journal)
+
+        assert checkpoint is not None
+        progress = (checkpoint.done, checkpoint.rows, checkpoint.size)
+        self.assertEqual(progress, (400, 3, 9))
+        self.assertEqual(checkpoint.search_result, self.search)
+        self.assertTrue(checkpoint.matches("cancer", self.output, "jsonl"))
+        self.assertFalse(checkpoint.matches("cancer", self.output, "csv"))
+        self.assertIsNone(Checkpoint.load(self.journal + ".missing"))
+
+    def test_resume_truncates_unjournaled_rows(self) -> None:
+        """Test resuming drops rows past the last batch the journal records."""
+        self.write_two_batches()
+        with open(self.output, "a", encoding="utf-8") as f:
+            f.write("{}\n")
+
+        checkpoint = Checkpoint.load(self.journal)
+        assert checkpoint is not None
+        checkpoint.begin()
+        checkpoint.ends.append(450)
+        checkpoint.batch_written(2, 15)
+        checkpoint.finish()
+
+        self.assertEqual(os.path.getsize(self.output), 9)
+        self.assertEqual(checkpoint.rows, 5)
+        self.assertFalse(os.path.exists(self.journal))
+
+    def test_resume_refuses_shortened_output(self) -> None:
+        """Test an output file missing journaled rows is an error."""
+        self.write_two_batches()
+        os.truncate(self.output, 3)
+
+        checkpoint = Checkpoint.load(self.journal)
+        assert checkpoint is not None
+        with self.assertRaises(ValueError):
+            checkpoint.begin()
+
+
+if __name__ == "__main__":
+    unittest.main()
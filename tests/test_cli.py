@@ -0,0 +1,190 @@
+"""Tests for the cli module."""
+
+import csv
+import functools
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from benchmarks.bench_startup import (
+    DEFAULT_BUDGET_MS,
+    cold_start_ms,
+    heavy_imports,
+    import_profile,
+)
+from pharma_papers import cli
+from pharma_papers.pubmed import PubMedClient
+from pharma_papers.ratelimit import RateLimiter
+from tests.fake_eutils import FakeEUtils, article_xml
+from tests.test_baseline import academic_xml, write_baseline
+
+
+class TestMain(unittest.TestCase):
+    """Test cases for the command-line entry point."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.output = os.path.join(self.tmpdir.name, "papers.csv")
+        self.state = os.path.join(self.tmpdir.name, "state.json")
+
+    def run_cli(self, fake: FakeEUtils, *extra: str) -> int:
+        """Run main() against the fake server with caches disabled."""
+        client = functools.partial(
+            PubMedClient, base_url=fake.base_url, rate_limiter=RateLimiter(rate=1000)
+        )
+        with mock.patch("pharma_papers.pubmed.PubMedClient", client):
+            return cli.main(
+                [
+                    "cancer",
+                    "-e",
+                    "test@example.com",
+                    "-f",
+                    self.output,
+                    "--no-cache",
+                    *extra,
+                ]
+            )
+
+    def read_pmids(self) -> list:
+        """Return the PubmedID column of the output file."""
+        with open(self.output, newline="", encoding="utf-8") as f:
+            return [row["PubmedID"] for row in csv.DictReader(f)]
+
+    def test_writes_csv(self) -> None:
+        """Test a plain run writes every company-affiliated article."""
+        with FakeEUtils(["1", "2", "3"]) as fake:
+            self.assertEqual(self.run_cli(fake), 0)
+
+        self.assertEqual(self.read_pmids(), ["1", "2", "3"])
+
+    def test_checkpointed_run_pages_history_server(self) -> None:
+        """Test a fresh run writing a journal still fetches by retstart."""
+        pmids = [str(38000000 + i) for i in range(450)]
+        with FakeEUtils(pmids) as fake:
+            self.assertEqual(self.run_cli(fake), 0)
+        fetches = [r for r in fake.requests if r["endpoint"] == "efetch.fcgi"]
+
+        self.assertEqual(self.read_pmids(), pmids)
+        self.assertTrue(fetches)
+        for request in fetches:
+            self.assertIn("retstart", request)
+            self.assertNotIn("id", request)
+            self.assertEqual(request["WebEnv"], "MCID_fake")
+
+    def test_incremental_appends_only_new_articles(self) -> None:
+        """Test a second incremental run searches by date and appends new PMIDs."""
+        incremental = ["--incremental", "--state-file", self.state]
+        with FakeEUtils(["1", "2"]) as fake:
+            self.run_cli(fake, *incremental)
+        self.assertNotIn("mindate", fake.requests[0])
+
+        with FakeEUtils(["3", "1", "2"]) as fake:
+            self.run_cli(fake, *incremental, "--date-type", "mdat")
+        search = fake.requests[0]
+
+        self.assertEqual(self.read_pmids(), ["1", "2", "3"])
+        self.assertEqual(search["datetype"], "mdat")
+        self.assertEqual(search["mindate"], search["maxdate"])
+
+    def test_resume_after_interruption(self) -> None:
+        """Test --resume skips written batches and never duplicates rows."""
+        pmids = [str(38000000 + i) for i in range(450)]
+        journal = self.output + ".checkpoint"
+        with FakeEUtils(pmids) as fake:
+            fake.fail_next(400, after=1)
+            self.assertEqual(self.run_cli(fake), 1)
+        self.assertEqual(self.read_pmids(), pmids[:200])
+        self.assertTrue(os.path.exists(journal))
+        # Rows of a batch cut short after the last checkpoint
+        with open(self.output, "a", encoding="utf-8") as f:
+            f.write("38000200,Article 38000200\n")
+
+        with FakeEUtils(pmids) as fake:
+            self.assertEqual(self.run_cli(fake, "--resume"), 0)
+
+        self.assertEqual(self.read_pmids(), pmids)
+        # No new search, and only the unfinished batches are fetched, by ID
+        self.assertEqual([len(r["id"].split(",")) for r in fake.requests], [200, 50])
+        self.assertFalse(os.path.exists(journal))
+
+    def test_queries_file(self) -> None:
+        """Test --queries-file runs every query and rejects stray options."""
+        queries = os.path.join(self.tmpdir.name, "queries.txt")
+        with open(queries, "w", encoding="utf-8") as f:
+            f.write("cancer\ndiabetes\n")
+        searches = {"cancer": ["1", "2"], "diabetes": ["2", "3"]}
+
+        with FakeEUtils([], searches=searches) as fake:
+            client = functools.partial(
+                PubMedClient,
+                base_url=fake.base_url,
+                rate_limiter=RateLimiter(rate=1000),
+            )
+            with mock.patch("pharma_papers.pubmed.PubMedClient", client):
+                status = cli.main(
+                    [
+                        "-e",
+                        "test@example.com",
+                        "-f",
+                        self.output,
+                        "--no-cache",
+                        "--queries-file",
+                        queries,
+                    ]
+                )
+
+        self.assertEqual(status, 0)
+        self.assertEqual(self.read_pmids(), ["1", "2", "3"])
+        self.assertEqual(
+            cli.main(["cancer", "-e", "test@example.com", "--queries-file", queries]), 1
+        )
+        both = ["-f", self.output, "--output-dir", self.tmpdir.name]
+        self.assertEqual(
+            cli.main(["-e", "test@example.com", "--queries-file", queries, *both]), 1
+        )
+
+    def test_ingest_baseline(self) -> None:
+        """Test the offline ingestion command writes the usual CSV."""
+        baseline = os.path.join(self.tmpdir.name, "pubmed25n0001.xml.gz")
+        write_baseline(baseline, [article_xml("7"), academic_xml("8")])
+
+        self.assertEqual(cli.ingest_main([baseline, "-f", self.output]), 0)
+        self.assertEqual(self.read_pmids(), ["7"])
+
+    def test_store_then_search_locally(self) -> None:
+        """Test --store keeps results that search-papers-store finds later."""
+        store = os.path.join(self.tmpdir.name, "papers.sqlite3")
+        with FakeEUtils(["1", "2"]) as fake:
+            self.run_cli(fake, "--store", store)
+        os.remove(self.output)
+
+        status = cli.store_main(
+            ["--store", store, "--company", "PFIZER", "--since", "2023"]
+            + ["-f", self.output]
+        )
+
+        self.assertEqual(status, 0)
+        self.assertEqual(self.read_pmids(), ["1", "2"])
+
+
+class TestStartup(unittest.TestCase):
+    """Test cases for the command's cold-start cost."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.profile = import_profile()
+
+    def test_heavy_modules_are_deferred(self) -> None:
+        """Test importing the CLI loads neither requests, Biopython nor pandas."""
+        self.assertEqual(heavy_imports(self.profile), [])
+
+    def test_cold_start_within_budget(self) -> None:
+        """Test the CLI module imports within the startup budget."""
+        self.assertLessEqual(cold_start_ms(), DEFAULT_BUDGET_MS)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+"""Tests for the models module."""
+
+import unittest
+
+from pharma_papers.models import Article
+
+
+class TestArticle(unittest.TestCase):
+    """Test cases for the Article record."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.article = Article(
+            pmid="38000001",
+            title="Tumour response to a novel kinase inhibitor.",
+            publication_date="2023-03-07",
+            authors=("Smith John", "Doe Anna"),
+            non_academic_authors=("Smith John",),
+            company_affiliations=("Pfizer",),
+        )
+
+    def test_mapping_access(self) -> None:
+        """Test dictionary-style access used by older callers still works."""
+        self.assertEqual(self.article["pmid"], "38000001")
+        self.assertEqual(self.article.get("company_affiliations"), ("Pfizer",))
+        self.assertIsNone(self.article.get("corresponding_email"))
+        self.assertEqual(self.article.get("journal", "n/a"), "n/a")
+        with self.assertRaises(KeyError):
+            self.article["journal"]
+
+    def test_compact_and_immutable(self) -> None:
+        """Test records are slotted and frozen."""
+        self.assertFalse(hasattr(self.article, "__dict__"))
+        with self.assertRaises(AttributeError):
+            self.article.pmid = "1"  # type: ignore[misc]
+
+    def test_to_dict(self) -> None:
+        """Test to_dict returns every field."""
+        self.assertEqual(
+            self.article.to_dict()["non_academic_authors"], ("Smith John",)
+        )
+        self.assertEqual(len(self.article.to_dict()), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+"""Tests for the output module."""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from pharma_papers.models import Article
+from pharma_papers.output import CSV_COLUMNS, OutputHandler
+
+try:
+    import pyarrow
+except ImportError:  # pragma: no cover - optional dependency
+    pyarrow = None
+
+ARTICLE = {
+    "pmid": "38000001",
+    "title": "Tumour response to a novel kinase inhibitor. ",
+    "publication_date": "2023-03-07",
+    "authors": ["Smith John", "Doe Anna"],
+    "non_academic_authors": ["Smith John"],
+    "company_affiliations": ["Pfizer", "Acme"],
+    "corresponding_email": "john.smith@pfizer.com",
+}
+
+
+class TestOutputHandler(unittest.TestCase):
+    """Test cases for the OutputHandler class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.handler = OutputHandler()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_stream_results_matches_output_results(self) -> None:
+        """Test the streaming writer produces the same CSV as output_results."""
+        streamed = os.path.join(self.tmpdir.name, "streamed.csv")
+        batch = os.path.join(self.tmpdir.name, "batch.csv")
+
+        record = Article(**ARTICLE)  # type: ignore[arg-type]
+        written = self.handler.stream_results([[ARTICLE], [], [record]], streamed)
+        self.handler.output_results([ARTICLE, ARTICLE], batch)
+
+        self.assertEqual(written, 2)
+        with open(streamed, encoding="utf-8") as a, open(batch, encoding="utf-8") as b:
+            self.assertEqual(a.read(), b.read())
+        with open(streamed, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), CSV_COLUMNS)
+        self.assertEqual(rows[0]["Company Affiliation(s)"], "Pfizer; Acme")
+
+    def test_stream_results_empty(self) -> None:
+        """Test an empty stream does not create the output file."""
+        path = os.path.join(self.tmpdir.name, "empty.csv")
+
+        self.assertEqual(self.handler.stream_results(iter([[], []]), path), 0)
+        self.assertFalse(os.path.exists(path))
+
+    def test_output_results_csv_format(self) -> None:
+        """Test output_results writes the same CSV pandas' to_csv used to."""
+        path = os.path.join(self.tmpdir.name, "out.csv")
+        quoted = dict(ARTICLE, title='A "quoted", title', corresponding_email=None)
+
+        self.handler.output_results([ARTICLE, quoted], path)
+
+        with open(path, newline="", encoding="utf-8") as f:
+            self.assertEqual(
+                f.read(),
+                ",".join(CSV_COLUMNS) + "\n"
+                "38000001,Tumour response to a novel kinase inhibitor.,2023-03-07,"
+                "Smith John,Pfizer; Acme,john.smith@pfizer.com\n"
+                '38000001,"A ""quoted"", title",2023-03-07,'
+                "Smith John,Pfizer; Acme,None\n",
+            )
+
+    def test_jsonl_flushes_each_batch(self) -> None:
+        """Test JSON Lines output keeps arrays and is on disk after each batch."""
+        path = os.path.join(self.tmpdir.name, "papers.jsonl")
+        seen_lines = []
+
+        def batches():
+            yield [ARTICLE]
+            with open(path, encoding="utf-8") as f:
+                seen_lines.append(len(f.readlines()))
+            yield [Article(pmid="38000002", title="Second", publication_date="2024")]
+
+        self.handler.stream_results(batches(), path, output_format="jsonl")
+        self.handler.stream_results([[ARTICLE]], path, True, "jsonl")
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(seen_lines, [1])
+        self.assertEqual(
+            [r["pmid"] for r in records], ["38000001", "38000002", "38000001"]
+        )
+        self.assertEqual(records[0]["authors"], ["Smith John", "Doe Anna"])
+        self.assertEqual(records[0]["company_affiliations"], ["Pfizer", "Acme"])
+        self.assertEqual(records[1]["non_academic_authors"], [])
+        self.assertIsNone(records[1]["corresponding_email"])
+
+    def test_to_dataframe(self) -> None:
+        """Test DataFrame export, and its error when pandas is missing."""
+        try:
+            import pandas  # noqa: F401
+        except ImportError:
+            self.skipTest("pandas is not installed")
+
+        df = self.handler.to_dataframe([ARTICLE])
+        self.assertEqual(list(df.columns), CSV_COLUMNS)
+        self.assertEqual(df.iloc[0]["PubmedID"], "38000001")
+
+        with mock.patch.dict(sys.modules, {"pandas": None}):
+            with self.assertRaisesRegex(ImportError, "dataframe"):
+                self.handler.to_dataframe([ARTICLE])
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestColumnarOutput(unittest.TestCase):
+    """Test cases for the Parquet and Arrow output formats."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.handler = OutputHandler()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.batches = [
+            [ARTICLE],
+            [],
+            [Article(pmid="38000002", title="Second", publication_date="2024")],
+        ]
+
+    def test_parquet_row_group_per_batch(self) -> None:
+        """Test Parquet output has list columns and one row group per batch."""
+        import pyarrow.parquet as pq
+
+        path = os.path.join(self.tmpdir.name, "papers.parquet")
+        written = self.handler.stream_results(
+            self.batches, path, output_format="parquet"
+        )
+
+        self.assertEqual(written, 2)
+        self.assertEqual(pq.ParquetFile(path).metadata.num_row_groups, 2)
+        rows = pq.read_table(path).to_pylist()
+        self.assertEqual(rows[0]["company_affiliations"], ["Pfizer", "Acme"])
+        self.assertEqual(rows[0]["title"], ARTICLE["title"].strip())
+        self.assertEqual(rows[1]["non_academic_authors"], [])
+        self.assertIsNone(rows[1]["corresponding_email"])
+
+    def test_arrow_and_feather(self) -> None:
+        """Test the Arrow IPC formats read back with the same columns."""
+        import pyarrow.feather as feather
+
+        for output_format in ("arrow", "feather"):
+            path = os.path.join(self.tmpdir.name, f"papers.{output_format}")
+            self.handler.stream_results(self.batches, path, output_format=output_format)
+
+            table = feather.read_table(path)
+            self.assertEqual(table.column("pmid").to_pylist(), ["38000001", "38000002"])
+            self.assertEqual(
+                table.column("non_academic_authors").to_pylist(), [["Smith John"], []]
+            )
+
+    def test_columnar_rejects_append_and_stdout(self) -> None:
+        """Test the columnar formats need a fresh output file."""
+        path = os.path.join(self.tmpdir.name, "papers.parquet")
+        with self.assertRaises(ValueError):
+            self.handler.stream_results(self.batches, path, True, "parquet")
+        with self.assertRaises(ValueError):
+            self.handler.stream_results(self.batches, None, output_format="arrow")
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+"""Tests for the parallel module."""
+
+import unittest
+
+from pharma_papers.affiliations import AffiliationAnalyzer, AffiliationClassifier
+from pharma_papers.parallel import ParsePool
+from pharma_papers.parser import PubMedParser
+from tests.fake_eutils import EFETCH_TEMPLATE, article_xml
+from tests.test_parser import load_raw
+
+
+class TestParsePool(unittest.TestCase):
+    """Test cases for the ParsePool class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.parser = PubMedParser()
+        self.analyzer = AffiliationAnalyzer()
+        self.batches = [load_raw()] + [
+            EFETCH_TEMPLATE.format(
+                articles="".join(map(article_xml, map(str, range(start, start + 5))))
+            ).encode("utf-8")
+            for start in range(0, 40, 5)
+        ]
+
+    def test_workers_match_in_process_parsing(self) -> None:
+        """Test worker processes return the in-process results, in order."""
+        in_process = list(ParsePool(self.parser, self.analyzer).imap(self.batches))
+        pooled = list(
+            ParsePool(self.parser, self.analyzer, workers=3).imap(iter(self.batches))
+        )
+
+        self.assertEqual(pooled, in_process)
+        self.assertEqual([a.pmid for a in pooled[0]], ["38000001", "38000003"])
+        self.assertEqual([a.pmid for a in pooled[-1]], ["35", "36", "37", "38", "39"])
+
+    def test_workers_use_given_parser(self) -> None:
+        """Test workers classify with the caller's classifier, not the default."""
+        classifier = AffiliationClassifier(company_keywords=("therapeutics",))
+        parser = PubMedParser(classifier)
+        analyzer = AffiliationAnalyzer(classifier)
+        in_process = list(ParsePool(parser, analyzer).imap(self.batches))
+        pooled = list(ParsePool(parser, analyzer, workers=2).imap(self.batches))
+
+        self.assertEqual(pooled, in_process)
+        self.assertEqual([a.pmid for a in pooled[0]], ["38000003"])
+
+    def test_worker_memos_merge_into_given_cache(self) -> None:
+        """Test what the workers' affiliation memos learn reaches the caller."""
+        in_process = PubMedParser()
+        list(ParsePool(in_process, self.analyzer).imap(self.batches))
+        pool = ParsePool(self.parser, self.analyzer, workers=2)
+        list(pool.imap(self.batches))
+        cache, expected = self.parser.affiliation_cache, in_process.affiliation_cache
+
+        self.assertEqual(cache.hits + cache.misses, expected.hits + expected.misses)
+        self.assertGreater(cache.hits, 0)
+        self.assertEqual(dict(cache.items()).keys(), dict(expected.items()).keys())
+
+    def test_single_worker_uses_given_parser(self) -> None:
+        """Test workers=1 parses in-process with the caller's parser and cache."""
+        list(ParsePool(self.parser, self.analyzer, workers=1).imap(self.batches))
+
+        self.assertGreater(self.parser.affiliation_cache.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
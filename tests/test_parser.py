@@ -0,0 +1,125 @@
+"""Tests for the parser module."""
+
+import io
+import os
+import unittest
+
+from Bio import Entrez
+
+from pharma_papers.affiliations import (
+    ACADEMIC_KEYWORDS,
+    COMPANY_KEYWORDS,
+    AffiliationClassifier,
+)
+from pharma_papers.parser import PubMedParser, iter_pubmed_xml
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_raw(name: str = "efetch_sample.xml") -> bytes:
+    """Read a stored efetch response as bytes."""
+    with open(os.path.join(FIXTURES, name), "rb") as handle:
+        return handle.read()
+
+
+def load_records(name: str = "efetch_sample.xml") -> dict:
+    """Read a stored efetch response with Entrez.read."""
+    return Entrez.read(io.BytesIO(load_raw(name)))
+
+
+class TestPubMedParser(unittest.TestCase):
+    """Test cases for the PubMedParser class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.parser = PubMedParser()
+        self.records = load_records()
+
+    def test_parse_articles(self) -> None:
+        """Test parse_articles keeps only company-affiliated articles."""
+        articles = self.parser.parse_articles(self.records)
+
+        self.assertEqual([a["pmid"] for a in articles], ["38000001", "38000003"])
+        self.assertEqual(articles[0]["publication_date"], "2023-03-07")
+        self.assertEqual(articles[0].non_academic_authors, ("Smith John",))
+        self.assertEqual(articles[0]["corresponding_email"], "john.smith@pfizer.com")
+        self.assertEqual(articles[1].company_affiliations, ("Novartis", "Acme"))
+
+    def test_iter_articles(self) -> None:
+        """Test iter_articles lazily flattens a stream of batches."""
+        batches = iter([self.records, {"PubmedArticle": []}, self.records])
+        articles = self.parser.iter_articles(batches)
+
+        self.assertEqual(next(articles)["pmid"], "38000001")
+        self.assertEqual(len(list(articles)), 3)
+
+    def test_parse_xml_matches_entrez(self) -> None:
+        """Test the streaming parser yields the same articles as Entrez.read."""
+        raw = load_raw().replace(
+            b"novel kinase", b"novel <i>BRAF</i> &amp; T<sub>2</sub> &lt;5 kinase"
+        )
+
+        self.assertEqual(
+            self.parser.parse_xml(raw),
+            self.parser.parse_articles(Entrez.read(io.BytesIO(raw))),
+        )
+        self.assertIn(
+            "<i>BRAF</i> & T<sub>2</sub> <5", self.parser.parse_xml(raw)[0]["title"]
+        )
+
+    def test_iter_pubmed_xml_is_compact(self) -> None:
+        """Test iter_pubmed_xml keeps only the fields the parser reads."""
+        record = next(iter_pubmed_xml(io.BytesIO(load_raw())))
+        article = record["MedlineCitation"]["Article"]
+
+        self.assertEqual(record["MedlineCitation"]["PMID"], "38000001")
+        self.assertEqual(
+            article["Journal"]["JournalIssue"]["PubDate"],
+            {"Year": "2023", "Month": "Mar", "Day": "7"},
+        )
+        self.assertEqual(article["AuthorList"][1]["AffiliationInfo"], [
+            {"Affiliation": "Department of Biology, University of Example, "
+             "Example City, USA."}
+        ])
+        self.assertNotIn("Identifier", article["AuthorList"][0])
+
+    def test_affiliation_memo(self) -> None:
+        """Test repeated affiliation strings are answered from the memo."""
+        self.parser.parse_articles(self.records)
+        misses = self.parser.affiliation_cache.misses
+        self.parser.parse_articles(self.records)
+
+        self.assertEqual(self.parser.affiliation_cache.misses, misses)
+        self.assertGreater(self.parser.affiliation_cache.hits, 0)
+        self.assertEqual(
+            self.parser._extract_company_name("Pfizer Inc., New York, NY, USA."),
+            "Pfizer",
+        )
+
+    def test_affiliation_memo_counts_one_lookup_each(self) -> None:
+        """Test every affiliation is looked up once, company or not."""
+        affiliations = [
+            str(info["Affiliation"])
+            for record in self.records["PubmedArticle"]
+            for author in record["MedlineCitation"]["Article"]["AuthorList"]
+            for info in author.get("AffiliationInfo", [])
+        ]
+        self.parser.parse_articles(self.records)
+        cache = self.parser.affiliation_cache
+
+        self.assertEqual(cache.hits + cache.misses, len(affiliations))
+        self.assertEqual(cache.misses, len(set(affiliations)))
+
+    def test_rules_version_follows_keywords(self) -> None:
+        """Test the memo's version changes with the classifier's keywords."""
+        same = PubMedParser(AffiliationClassifier())
+        other = PubMedParser(
+            AffiliationClassifier(ACADEMIC_KEYWORDS, COMPANY_KEYWORDS + ("corp",))
+        )
+
+        self.assertEqual(same.rules_version, self.parser.rules_version)
+        self.assertNotEqual(other.rules_version, self.parser.rules_version)
+
+
+if __name__ == "__main__":
+    unittest.main()
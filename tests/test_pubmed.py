@@ -0,0 +1,243 @@
+"""Tests for the pubmed module."""
+
+import io
+import os
+import tempfile
+import time
+import unittest
+
+import requests
+from Bio import Entrez
+
+from pharma_papers.cache import ArticleCache, SearchCache
+from pharma_papers.pubmed import FetchError, PubMedClient
+from pharma_papers.ratelimit import RateLimiter, RetryPolicy
+from pharma_papers.sizing import BatchSizer
+from tests.fake_eutils import FakeEUtils
+
+PMIDS = [str(38000000 + i) for i in range(450)]
+
+
+def article_pmids(records: dict) -> list:
+    """Return the PMIDs of the articles in an efetch record set."""
+    return [str(a["MedlineCitation"]["PMID"]) for a in records["PubmedArticle"]]
+
+
+class TestPubMedClient(unittest.TestCase):
+    """Test cases for the PubMedClient class."""
+
+    def make_client(self, fake: FakeEUtils, **kwargs: object) -> PubMedClient:
+        """Create a client talking to the fake server without rate limiting.
+
+        Batches are a fixed 200 records unless a test asks otherwise.
+        """
+        kwargs.setdefault("rate_limiter", RateLimiter(rate=1000))
+        kwargs.setdefault("retry", RetryPolicy(base_delay=0.01))
+        kwargs.setdefault("batch_size", 200)
+        return PubMedClient(
+            email="test@example.com", base_url=fake.base_url, **kwargs
+        )
+
+    def test_search(self) -> None:
+        """Test search returns a history handle with the esearch ID list."""
+        with FakeEUtils(PMIDS) as fake:
+            result = self.make_client(fake).search("cancer", max_results=5)
+
+        self.assertEqual(result.pmids, PMIDS[:5])
+        self.assertEqual((result.count, len(result)), (450, 5))
+        self.assertEqual((result.webenv, result.query_key), ("MCID_fake", "1"))
+        self.assertEqual(fake.requests[0]["email"], "test@example.com")
+
+    def test_fetch_pages_history_server(self) -> None:
+        """Test a search handle is paged by retstart, past esearch's ID cap."""
+        with FakeEUtils(PMIDS, max_ids=300) as fake:
+            client = self.make_client(fake)
+            result = client.search("cancer", max_results=420)
+            records = client.fetch_details(result)
+
+        self.assertEqual(len(result.pmids), 300)
+        self.assertEqual(article_pmids(records), PMIDS[:420])
+        fetches = [r for r in fake.requests if r["endpoint"] == "efetch.fcgi"]
+        self.assertEqual(
+            [(r["retstart"], r["retmax"]) for r in fetches],
+            [("0", "200"), ("200", "200"), ("400", "20")],
+        )
+        self.assertFalse(any("id" in r for r in fetches))
+
+    def test_iter_details_batches(self) -> None:
+        """Test iter_details issues one efetch per batch and yields lazily."""
+        with FakeEUtils(PMIDS) as fake:
+            batches = self.make_client(fake).iter_details(PMIDS)
+            first = next(batches)
+            self.assertEqual(len(fake.requests), 1)
+            rest = list(batches)
+
+        self.assertEqual(
+            [len(article_pmids(r)) for r in [first, *rest]], [200, 200, 50]
+        )
+
+    def test_fetch_details_merges_batches(self) -> None:
+        """Test fetch_details still returns a single merged record set."""
+        with FakeEUtils(PMIDS) as fake:
+            records = self.make_client(fake).fetch_details(PMIDS)
+
+        self.assertEqual(article_pmids(records), PMIDS)
+
+    def test_concurrent_fetch_keeps_order(self) -> None:
+        """Test concurrent batches overlap but are yielded in PMID order."""
+        pmids = PMIDS * 2
+        # Earlier batches answer more slowly, so they complete out of order
+        latency = lambda params: 0.3 if params.get("id", "").startswith("38000000") else 0.05
+        with FakeEUtils(pmids, latency=latency) as fake:
+            client = self.make_client(fake, max_workers=4)
+            records = client.fetch_details(pmids)
+
+        self.assertEqual(article_pmids(records), pmids)
+        self.assertGreater(fake.max_in_flight, 1)
+
+    def test_concurrent_fetch_respects_rate_limit(self) -> None:
+        """Test concurrent workers never exceed the shared request rate."""
+        with FakeEUtils(PMIDS * 2) as fake:
+            client = self.make_client(
+                fake, max_workers=5, rate_limiter=RateLimiter(rate=10)
+            )
+            started = time.monotonic()
+            client.fetch_details(PMIDS * 2)
+            elapsed = time.monotonic() - started
+
+        self.assertEqual(len(fake.requests), 5)
+        # The fifth token of a one-token bucket at 10/s is granted 0.4s after
+        # the first. Arrivals at the server jitter with connection setup, so
+        # the bound is checked on the client's side.
+        self.assertGreaterEqual(elapsed, 0.39)
+
+    def test_cache_only_fetches_missing_pmids(self) -> None:
+        """Test cached articles are served locally and only misses hit efetch."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = ArticleCache(os.path.join(tmpdir, "articles.sqlite3"))
+            with FakeEUtils(PMIDS) as fake:
+                client = self.make_client(fake, cache=cache)
+                client.fetch_details(PMIDS[:150])
+                records = client.fetch_details(PMIDS[100:300])
+            cache.close()
+
+        self.assertEqual(article_pmids(records), PMIDS[100:300])
+        self.assertEqual([len(r["id"].split(",")) for r in fake.requests], [150, 150])
+        self.assertEqual((cache.hits, cache.misses), (50, 300))
+
+    def test_search_cache_skips_esearch(self) -> None:
+        """Test a repeated search is answered from the search cache."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            cache = SearchCache(os.path.join(tmpdir, "searches.sqlite3"))
+            with FakeEUtils(PMIDS) as fake:
+                client = self.make_client(fake, search_cache=cache)
+                first = client.search("cancer", max_results=5)
+                second = client.search(" cancer ", max_results=5)
+            cache.close()
+
+        self.assertEqual(second, first)
+        self.assertEqual(len(fake.requests), 1)
+
+    def test_compressed_transfer_is_counted(self) -> None:
+        """Test responses arrive gzip'd and each batch's traffic is counted."""
+        with FakeEUtils(PMIDS) as fake:
+            client = self.make_client(fake)
+            raw = list(client.iter_raw_details(PMIDS))
+
+        efetches = [s for s in client.stats.recent if s.endpoint == "efetch.fcgi"]
+        self.assertEqual([s.records for s in efetches], [200, 200, 50])
+        self.assertEqual([s.body_bytes for s in efetches], [len(r) for r in raw])
+        for stats in efetches:
+            self.assertLess(stats.wire_bytes * 5, stats.body_bytes)
+            self.assertGreater(stats.seconds, 0)
+        self.assertEqual(client.stats.records, 450)
+        self.assertGreater(client.stats.compression_ratio, 5)
+
+    def test_adaptive_batch_size(self) -> None:
+        """Test batches grow from 200 while responses are fast, up to the target."""
+        pmids = [str(38000000 + i) for i in range(1000)]
+        # Each record costs 1ms, so 0.3s responses fit just under 300 records
+        with FakeEUtils(pmids, latency=lambda p: 0.001 * int(p["retmax"])) as fake:
+            client = self.make_client(fake, batch_size=None)
+            client.sizer = BatchSizer(target_seconds=0.3)
+            result = client.search("cancer", max_results=1000)
+            records = client.fetch_details(result)
+
+        self.assertEqual(article_pmids(records), pmids)
+        sizes = [int(r["retmax"]) for r in fake.requests if "retstart" in r]
+        self.assertEqual(sizes[0], 200)
+        self.assertTrue(all(200 < size <= 300 for size in sizes[1:-1]), sizes)
+
+    def test_timed_out_batch_is_split(self) -> None:
+        """Test a batch that times out is retried in pieces of the shrunken size."""
+        # efetch batches over 100 records take longer than the client waits
+        def latency(params: dict) -> float:
+            if "retstart" in params and int(params["retmax"]) > 100:
+                return 0.5
+            return 0.0
+
+        with FakeEUtils(PMIDS, latency=latency) as fake:
+            client = self.make_client(fake, batch_size=None, timeout=0.2)
+            client.sizer = BatchSizer(initial=200, max_size=200)
+            result = client.search("cancer", max_results=200)
+            ends: list = []
+            raw = list(client.iter_raw_details(result, ends=ends))
+
+        self.assertEqual((len(raw), ends), (1, [200]))
+        self.assertEqual(article_pmids(Entrez.read(io.BytesIO(raw[0]))), PMIDS[:200])
+        fetches = [r for r in fake.requests if r["endpoint"] == "efetch.fcgi"]
+        self.assertEqual(
+            [(r["retstart"], r["retmax"]) for r in fetches],
+            [("0", "200"), ("0", "100"), ("100", "100")],
+        )
+
+    def test_retries_transient_errors(self) -> None:
+        """Test 5xx answers are retried and the fetch completes."""
+        with FakeEUtils(PMIDS) as fake:
+            fake.fail_next(503, count=2)
+            fake.fail_next(500, endpoint="esearch.fcgi")
+            client = self.make_client(fake)
+            result = client.search("cancer", max_results=450)
+            records = client.fetch_details(result)
+
+        self.assertEqual(article_pmids(records), PMIDS)
+        self.assertEqual(
+            [r["endpoint"] for r in fake.requests].count("efetch.fcgi"), 3 + 2
+        )
+        self.assertEqual(client.stats.retries, 3)
+
+    def test_429_honours_retry_after(self) -> None:
+        """Test a 429 pauses the client for as long as Retry-After asks."""
+        with FakeEUtils(PMIDS) as fake:
+            fake.fail_next(429, retry_after="0.5")
+            self.make_client(fake).fetch_details(PMIDS[:10])
+
+        first, retry = fake.requests
+        self.assertGreaterEqual(retry["time"] - first["time"], 0.45)
+
+    def test_client_errors_are_not_retried(self) -> None:
+        """Test a 400 fails at once rather than being retried."""
+        with FakeEUtils(PMIDS) as fake:
+            fake.fail_next(400)
+            with self.assertRaises(FetchError):
+                self.make_client(fake).fetch_details(PMIDS[:10])
+
+        self.assertEqual(len(fake.requests), 1)
+
+    def test_persistent_failure_keeps_partial_results(self) -> None:
+        """Test a batch that keeps failing raises with the batches before it."""
+        with FakeEUtils(PMIDS) as fake:
+            client = self.make_client(fake, retry=RetryPolicy(3, base_delay=0.01))
+            fake.fail_next(500, count=3, after=1)
+            # Streamed batches were already handed out, so the error propagates
+            with self.assertRaises(requests.HTTPError):
+                list(client.iter_details(PMIDS))
+            fake.fail_next(500, count=3, after=1)
+            with self.assertRaises(FetchError) as raised:
+                client.fetch_details(PMIDS)
+
+        self.assertEqual(article_pmids(raised.exception.partial), PMIDS[:200])
+
+
+if __name__ == "__main__":
+    unittest.main()
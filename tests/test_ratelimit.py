@@ -0,0 +1,100 @@
+"""Tests for the ratelimit module."""
+
+import unittest
+
+from pharma_papers.ratelimit import RateLimiter, RetryPolicy
+
+
+class FakeClock:
+    """Manually advanced clock whose sleep just moves time forward."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class TestRateLimiter(unittest.TestCase):
+    """Test cases for the RateLimiter class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.clock = FakeClock()
+
+    def test_spaces_requests_at_rate(self) -> None:
+        """Test back-to-back acquisitions are spaced 1/rate apart."""
+        limiter = RateLimiter(rate=3, clock=self.clock, sleep=self.clock.sleep)
+        starts = []
+        for _ in range(7):
+            limiter.acquire()
+            starts.append(self.clock.now)
+
+        self.assertAlmostEqual(starts[0], 0.0)
+        self.assertAlmostEqual(starts[-1], 2.0)
+        # No one-second window ever sees more than three requests
+        for i in range(len(starts) - 3):
+            self.assertGreaterEqual(starts[i + 3] - starts[i], 1.0 - 1e-9)
+
+    def test_idle_time_refills_up_to_capacity(self) -> None:
+        """Test idle time refills the bucket but never beyond its capacity."""
+        limiter = RateLimiter(
+            rate=10, capacity=2, clock=self.clock, sleep=self.clock.sleep
+        )
+        self.clock.now = 5.0
+
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertEqual(limiter.acquire(), 0.0)
+        self.assertAlmostEqual(limiter.acquire(), 0.1)
+
+    def test_rejects_non_positive_rate(self) -> None:
+        """Test the limiter refuses a zero rate."""
+        with self.assertRaises(ValueError):
+            RateLimiter(rate=0)
+
+    def test_reserve_does_not_sleep(self) -> None:
+        """Test reserve hands out queued slots without sleeping itself."""
+        limiter = RateLimiter(rate=4, clock=self.clock, sleep=self.clock.sleep)
+
+        self.assertEqual([limiter.reserve() for _ in range(3)], [0.0, 0.25, 0.5])
+        self.assertEqual(self.clock.now, 0.0)
+
+    def test_pause_holds_back_next_acquire(self) -> None:
+        """Test a pause delays the next token even with a full bucket."""
+        limiter = RateLimiter(rate=3, clock=self.clock, sleep=self.clock.sleep)
+        limiter.pause(2.0)
+
+        self.assertAlmostEqual(limiter.acquire(), 2.0)
+        self.assertAlmostEqual(limiter.acquire(), 1 / 3)
+
+
+class TestRetryPolicy(unittest.TestCase):
+    """Test cases for the RetryPolicy class."""
+
+    def test_backoff_doubles_up_to_cap(self) -> None:
+        """Test delays double per attempt and stop growing at the cap."""
+        policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=lambda: 1.0)
+
+        self.assertEqual([policy.delay(n) for n in range(1, 6)], [1, 2, 4, 5, 5])
+
+    def test_jitter_spans_half_to_full_backoff(self) -> None:
+        """Test jitter scales the backoff between half and all of it."""
+        low = RetryPolicy(base_delay=4.0, jitter=lambda: 0.0)
+        high = RetryPolicy(base_delay=4.0, jitter=lambda: 0.999)
+
+        self.assertEqual(low.delay(1), 2.0)
+        self.assertAlmostEqual(high.delay(1), 4.0, places=2)
+
+    def test_retry_after_is_a_floor(self) -> None:
+        """Test Retry-After raises the delay but never shortens it."""
+        policy = RetryPolicy(base_delay=1.0, jitter=lambda: 1.0)
+
+        self.assertEqual(policy.delay(1, retry_after=30.0), 30.0)
+        self.assertEqual(policy.delay(3, retry_after=0.5), 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+"""Tests for the sizing module."""
+
+import unittest
+
+from pharma_papers.sizing import BatchSizer
+
+
+class TestBatchSizer(unittest.TestCase):
+    """Test cases for the BatchSizer class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.sizer = BatchSizer(
+            initial=200, max_size=5000, target_seconds=5.0, max_bytes=10_000_000
+        )
+
+    def test_grows_at_most_twofold(self) -> None:
+        """Test fast responses double the size per batch, up to max_size."""
+        sizes = []
+        for _ in range(6):
+            size = self.sizer.next_size()
+            self.sizer.observe(size, size * 1000, 0.1)
+            sizes.append(self.sizer.next_size())
+
+        self.assertEqual(sizes, [400, 800, 1600, 3200, 5000, 5000])
+
+    def test_fits_target_time_and_bytes(self) -> None:
+        """Test the size settles where responses meet the time and byte targets."""
+        self.sizer.observe(200, 200 * 1000, 4.0)  # 20ms per record
+        self.assertEqual(self.sizer.next_size(), 250)
+
+        sizer = BatchSizer(initial=200, max_bytes=10_000_000, smoothing=1.0)
+        sizer.observe(200, 200 * 100_000, 0.1)  # 100 kB per record
+        self.assertEqual(sizer.next_size(), 100)
+
+    def test_failure_halves_down_to_min_size(self) -> None:
+        """Test each failed batch halves the size, never below min_size."""
+        for _ in range(5):
+            self.sizer.failed()
+
+        self.assertEqual(self.sizer.next_size(), 20)
+
+    def test_fixed_size(self) -> None:
+        """Test equal bounds pin the size whatever is observed."""
+        sizer = BatchSizer(200, 200, 200)
+        sizer.observe(200, 10**9, 60.0)
+        sizer.failed()
+
+        self.assertEqual(sizer.next_size(), 200)
+        with self.assertRaises(ValueError):
+            BatchSizer(min_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Tests for the state module."""
+
+import os
+import tempfile
+import unittest
+
+from pharma_papers.state import IncrementalState
+
+
+class TestIncrementalState(unittest.TestCase):
+    """Test cases for the IncrementalState class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = os.path.join(self.tmpdir.name, "state.json")
+
+    def test_unknown_query(self) -> None:
+        """Test a query that never ran has no date and no PMIDs."""
+        state = IncrementalState(self.path)
+
+        self.assertIsNone(state.last_run("cancer"))
+        self.assertEqual(state.emitted("cancer"), set())
+
+    def test_record_accumulates_and_persists(self) -> None:
+        """Test runs accumulate PMIDs and survive a reload."""
+        state = IncrementalState(self.path)
+        state.record("cancer AND pfizer[AFFL]", "2026/10/01", ["1", "2"])
+        state.record("cancer  AND pfizer[AFFL]", "2026/10/02", ["3"])
+        state.save()
+
+        reloaded = IncrementalState(self.path)
+        self.assertEqual(reloaded.last_run("cancer AND pfizer[AFFL]"), "2026/10/02")
+        self.assertEqual(reloaded.emitted("cancer AND pfizer[AFFL]"), {"1", "2", "3"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+"""Tests for the store module."""
+
+import os
+import tempfile
+import unittest
+
+from pharma_papers.models import Article
+from pharma_papers.store import ArticleStore
+
+PFIZER_2022 = Article(
+    pmid="1",
+    title="Kinase inhibitor trial",
+    publication_date="2022-05-01",
+    authors=("Smith John", "Doe Anna"),
+    non_academic_authors=("Smith John",),
+    company_affiliations=("Pfizer",),
+    corresponding_email="john.smith@pfizer.com",
+)
+NOVARTIS_2023 = Article(
+    pmid="2",
+    title="Antibody study",
+    publication_date="2023-01-15",
+    authors=("Chen L",),
+    non_academic_authors=("Chen L",),
+    company_affiliations=("Novartis", "Pfizer"),
+)
+
+
+class TestArticleStore(unittest.TestCase):
+    """Test cases for the ArticleStore class."""
+
+    def setUp(self) -> None:
+        """Set up test fixtures."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.store = ArticleStore(os.path.join(self.tmpdir.name, "papers.sqlite3"))
+        self.addCleanup(self.store.close)
+
+    def test_search_by_company_and_date(self) -> None:
+        """Test articles come back whole, filtered by company and year."""
+        self.store.upsert_many([PFIZER_2022, NOVARTIS_2023], query="cancer")
+
+        self.assertEqual(
+            self.store.search(company="pfizer"), [NOVARTIS_2023, PFIZER_2022]
+        )
+        self.assertEqual(
+            self.store.search(company="Pfizer", since="2022", before="2023"),
+            [PFIZER_2022],
+        )
+        self.assertEqual(self.store.search(company="Acme"), [])
+        (mode,) = self.store._conn.execute("PRAGMA journal_mode").fetchone()
+        self.assertEqual(mode, "wal")
+
+    def test_company_matches_variant_names(self) -> None:
+        """Test a known company also finds its subsidiaries' names."""
+        pfizer_japan = Article(
+            pmid="3",
+            title="Vaccine cohort",
+            publication_date="2022-09-01",
+            company_affiliations=("Pfizer Japan",),
+        )
+        self.store.upsert_many([PFIZER_2022, NOVARTIS_2023, pfizer_japan])
+
+        self.assertEqual(
+            self.store.search(company="Pfizer", since="2022", before="2023"),
+            [pfizer_japan, PFIZER_2022],
+        )
+        self.assertEqual(self.store.search(company="pfizer japan"), [pfizer_japan])
+        plan = " ".join(
+            row[-1]
+            for row in self.store._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT pmid FROM companies"
+                " WHERE canonical = ? OR company = ?",
+                ("pfizer", "pfizer"),
+            )
+        )
+        self.assertIn("companies_canonical", plan)
+
+    def test_upsert_replaces_and_tags_queries(self) -> None:
+        """Test a re-stored article replaces its authors and keeps every query."""
+        self.store.upsert_many([PFIZER_2022], query="cancer")
+        revised = Article(
+            pmid="1",
+            title="Kinase inhibitor trial, revised",
+            publication_date="2022-05-01",
+            authors=("Smith John",),
+            non_academic_authors=("Smith John",),
+            company_affiliations=("Pfizer",),
+        )
+        self.store.upsert_many([revised], tags={"1": ["kinase  inhibitor"]})
+
+        self.assertEqual(self.store.search(), [revised])
+        self.assertEqual(self.store.search(query="cancer"), [revised])
+        self.assertEqual(self.store.search(query="kinase inhibitor"), [revised])
+        self.assertEqual(self.store.search(query="diabetes"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()